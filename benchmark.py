@@ -0,0 +1,357 @@
+"""
+Benchmark ความเร็วของ bot กับ Mock DSL Portal (ไม่ใช้เว็บไซต์จริง)
+
+วิธีใช้:
+    python benchmark.py --feature disbursement --files 30 --latency-ms 150
+    python benchmark.py --feature sign-contract --files 30 --wait-mode legacy
+    python benchmark.py --files 20 --latency-ms 100 --compare-lean
+    python benchmark.py --files 30 --trace-commands --command-budget 80   # ไม่ผ่าน (exit 1) ถ้า command ต่อไฟล์เกินงบ
+"""
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+import config
+from main import DSLAutoFillBot
+from mock_portal import MockPortal
+from step_tracer import percentile
+from command_tracer import Profiler
+from job_journal import JobJournal
+
+try:
+    # วัดหน่วยความจำของ Chrome ทุก process (pip install psutil) - ถ้าไม่มีจะรายงานเฉพาะ JS heap
+    import psutil
+except ImportError:
+    psutil = None
+
+# เวลาโหลดและจำนวน/ขนาดไฟล์ที่โหลดของหน้าปัจจุบัน (Navigation + Resource Timing)
+PAGE_LOAD_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+return {
+    load_ms: nav ? nav.loadEventEnd : 0,
+    resources: resources.length,
+    bytes: resources.reduce(function(total, r) { return total + (r.transferSize || r.encodedBodySize || 0); }, 0)
+};
+"""
+
+# สัดส่วนประเภทไฟล์ใน batch จำลอง (suffix ของชื่อไฟล์, น้ำหนัก)
+BATCH_MIX = {
+    "disbursement": [("", 6), ("-3cb", 2), ("-imported", 1), ("-done", 1), ("-missing", 1)],
+    "sign-contract": [("", 7), ("-3cb", 2), ("-missing", 1)],
+}
+
+MINIMAL_PDF = (
+    b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[]/Count 0>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n%%EOF\n"
+)
+
+
+class BenchmarkBot(DSLAutoFillBot):
+    """Bot สำหรับ benchmark - ใช้บัญชีจำลองและไม่เขียน log ผลลัพธ์ของการทำงานจริง"""
+
+    def __init__(self, work_dir):
+        self.work_dir = work_dir
+        super().__init__()
+
+    def setup_result_logs(self):
+        self.success_log_file = self.work_dir / "success.log"
+        self.failed_log_file = self.work_dir / "failed.log"
+
+    def setup_journal(self):
+        self.journal = JobJournal(self.work_dir / "journal.db")
+
+    def setup_directories(self):
+        # ไฟล์จำลองที่ทำเสร็จ (โหมดหลายแท็บ) ไม่ถูกย้ายไปโฟลเดอร์ completed/failed จริง
+        self.completed_dir = self.work_dir / "completed"
+        self.failed_dir = self.work_dir / "failed"
+        self.completed_disbursement_dir = self.completed_dir / "disbursement"
+        self.completed_sign_contract_dir = self.completed_dir / "sign-contract"
+        self.failed_disbursement_dir = self.failed_dir / "disbursement"
+        self.failed_sign_contract_dir = self.failed_dir / "sign-contract"
+        for directory in (self.completed_disbursement_dir, self.completed_sign_contract_dir,
+                          self.failed_disbursement_dir, self.failed_sign_contract_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def get_active_account(self):
+        return "benchmark", {"name": "Benchmark", "username": "benchmark", "password": "benchmark"}
+
+
+def create_batch(feature, count, directory):
+    """สร้างไฟล์จำลองตามสัดส่วนใน BATCH_MIX"""
+    pattern = []
+    for suffix, weight in BATCH_MIX[feature]:
+        pattern.extend([suffix] * weight)
+
+    files = []
+    for i in range(count):
+        filename = f"bench{i:05d}{pattern[i % len(pattern)]}.pdf"
+        (directory / filename).write_bytes(MINIMAL_PDF)
+        files.append(filename)
+    return files
+
+
+def measure_page_loads(driver, url, count=5):
+    """โหลดหน้ารายการซ้ำหลายครั้ง - คืนค่าเวลาโหลดเฉลี่ยและขนาดไฟล์ที่โหลดต่อหน้า"""
+    loads = []
+    for _ in range(count):
+        driver.get(url)
+        loads.append(driver.execute_script(PAGE_LOAD_SCRIPT))
+    return {
+        "page_load_ms": round(sum(load["load_ms"] for load in loads) / count, 1),
+        "page_resources": round(sum(load["resources"] for load in loads) / count, 1),
+        "page_kb": round(sum(load["bytes"] for load in loads) / count / 1024, 1),
+    }
+
+
+def measure_memory(driver):
+    """หน่วยความจำของเบราว์เซอร์หนึ่งตัว (= หนึ่ง worker): JS heap ของหน้า และ RSS ของ Chrome ทุก process"""
+    memory = {"js_heap_mb": None, "browser_rss_mb": None}
+    try:
+        driver.execute_cdp_cmd("Performance.enable", {})
+        metrics = {m["name"]: m["value"] for m in driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]}
+        memory["js_heap_mb"] = round(metrics.get("JSHeapUsedSize", 0) / 1024 / 1024, 1)
+    except Exception:
+        pass
+
+    if psutil is not None:
+        try:
+            # process ของ chromedriver -> Chrome (browser, renderer, GPU, ...)
+            chrome = psutil.Process(driver.service.process.pid).children(recursive=True)
+            memory["browser_rss_mb"] = round(sum(p.memory_info().rss for p in chrome) / 1024 / 1024, 1)
+        except Exception:
+            pass
+    return memory
+
+
+def point_config_to_portal(base_url):
+    """เปลี่ยน URL ใน config ให้ชี้ไปที่ Mock Portal"""
+    config.LOGIN_PAGE_URL = f"{base_url}/los/login"
+    config.WEBSITE_URL = f"{base_url}/main/disbursement-list"
+    config.SIGN_CONTRACT_URL = f"{base_url}/main/sign-contract-list"
+
+
+def run_benchmark(feature, file_count, latency_ms=0, jitter_ms=0, verbose=False):
+    """รัน benchmark หนึ่งรอบ และคืนค่าผลลัพธ์เป็น dict"""
+    work_dir = Path(tempfile.mkdtemp(prefix="dsl-bench-"))
+    input_dir = work_dir / feature
+    input_dir.mkdir()
+
+    portal = MockPortal(latency=latency_ms / 1000, jitter=jitter_ms / 1000)
+    base_url = portal.start()
+    point_config_to_portal(base_url)
+    config.SESSION_CACHE_ENABLED = False
+    config.LOG_FILE = "benchmark.log"
+
+    bot = None
+    try:
+        files = create_batch(feature, file_count, input_dir)
+        portal.seed(feature, [Path(f).stem for f in files])
+
+        # แสดงเฉพาะ warning/error และความคืบหน้าบนหน้าจอ
+        config.LOG_COMPACT = not verbose
+        bot = BenchmarkBot(work_dir)
+
+        startup_start = time.perf_counter()
+        bot.setup_driver()
+        startup_time = time.perf_counter() - startup_start
+
+        # Login แยกออกจากเวลาต่อไฟล์
+        login_start = time.perf_counter()
+        if feature == "sign-contract":
+            logged_in = bot.auto_sign_contract_login()
+            bot._sign_contract_login_completed = True
+        else:
+            logged_in = bot.auto_login()
+            bot._login_completed = True
+        login_time = time.perf_counter() - login_start
+        if not logged_in:
+            raise RuntimeError("Login กับ Mock Portal ไม่สำเร็จ")
+
+        bot.tracer.reset()
+        bot.selector_stats.reset()
+        if bot.command_tracer:
+            bot.command_tracer.reset()
+        durations = []
+        succeeded = 0
+
+        batch_start = time.perf_counter()
+        if config.TAB_PIPELINE_TABS > 1:
+            # หลายแท็บทำงานสลับกัน - วัดเวลาต่อไฟล์จาก trace
+            summary = bot.new_batch_summary(0)
+            bot.process_files(files, input_dir, feature, summary)
+            succeeded = summary["success"]
+            durations = list(bot.tracer.durations.get("file_total", []))
+        else:
+            for filename in files:
+                file_start = time.perf_counter()
+                if bot.process_file_with_trace(feature, filename, input_dir):
+                    succeeded += 1
+                durations.append(time.perf_counter() - file_start)
+        batch_time = time.perf_counter() - batch_start
+        # command ต่อไฟล์จาก CommandTracer (เฉพาะ --trace-commands)
+        commands = bot.command_tracer.file_command_counts() if bot.command_tracer else None
+
+        # วัดหลัง batch เพื่อไม่ให้กระทบเวลาต่อไฟล์
+        list_url = config.SIGN_CONTRACT_URL if feature == "sign-contract" else config.WEBSITE_URL
+        page_loads = measure_page_loads(bot.driver, list_url)
+        memory = measure_memory(bot.driver)
+
+        return {
+            "feature": feature,
+            "wait_mode": config.WAIT_MODE,
+            "lean_browser": config.LEAN_BROWSER_ENABLED,
+            "tabs": config.TAB_PIPELINE_TABS,
+            "result_index": config.RESULT_INDEX_ENABLED,
+            "files": file_count,
+            "succeeded": succeeded,
+            "latency_ms": latency_ms,
+            "browser_startup_s": round(startup_time, 3),
+            "login_s": round(login_time, 3),
+            "batch_s": round(batch_time, 3),
+            "files_per_min": round(file_count / batch_time * 60, 2) if batch_time else 0.0,
+            "per_file_p50_s": round(percentile(durations, 50), 3),
+            "per_file_p95_s": round(percentile(durations, 95), 3),
+            "per_file_max_s": round(max(durations), 3) if durations else 0.0,
+            "commands_per_file": round(sum(commands) / len(commands), 1) if commands else None,
+            "commands_per_file_max": max(commands) if commands else None,
+            "portal_requests": portal.request_count,
+            **page_loads,
+            **memory,
+            "steps": bot.tracer.summary(),
+            "selectors": bot.selector_stats.format_report(),
+            "command_report": bot.command_tracer.format_report() if bot.command_tracer else [],
+        }
+    finally:
+        if bot:
+            bot.tracer.close()
+            if bot.command_tracer:
+                bot.command_tracer.close()
+            bot.journal.close()
+        if bot and bot.driver:
+            bot.driver.quit()
+        portal.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def format_mb(value):
+    return f"{value:.1f} MB" if value is not None else "-"
+
+
+def print_lean_comparison(full, lean):
+    """เปรียบเทียบเบราว์เซอร์ปกติกับแบบ lean"""
+    print("\n" + "=" * 60)
+    print("🪶 เปรียบเทียบเบราว์เซอร์ปกติ / แบบ lean (ต่อ worker)")
+    print("=" * 60)
+    print(f"{'':<22}{'ปกติ':>12}{'lean':>12}{'ลดลง':>12}")
+    for key, label in [("page_load_ms", "โหลดหน้า (ms)"), ("page_kb", "ข้อมูลต่อหน้า (KB)"),
+                       ("per_file_p50_s", "เวลาต่อไฟล์ p50 (s)"), ("js_heap_mb", "JS heap (MB)"),
+                       ("browser_rss_mb", "Chrome RSS (MB)")]:
+        before, after = full.get(key), lean.get(key)
+        if before is None or after is None:
+            continue
+        saved = f"{(before - after) / before * 100:.0f}%" if before else "-"
+        print(f"{label:<22}{before:>12.1f}{after:>12.1f}{saved:>12}")
+    print("=" * 60)
+
+
+def print_report(result):
+    print("\n" + "=" * 60)
+    print(f"📊 Benchmark: {result['feature']} (wait mode: {result['wait_mode']}, latency {result['latency_ms']} ms, {result['tabs']} แท็บ)")
+    print("=" * 60)
+    print(f"📂 ไฟล์: {result['files']} (สำเร็จ {result['succeeded']})")
+    print(f"🚀 เปิดเบราว์เซอร์: {result['browser_startup_s']:.2f} s | Login: {result['login_s']:.2f} s")
+    print(f"⏱️  เวลารวม: {result['batch_s']:.2f} s")
+    print(f"⚡ ความเร็ว: {result['files_per_min']:.2f} ไฟล์/นาที")
+    print(f"📈 เวลาต่อไฟล์: p50 {result['per_file_p50_s']:.2f} s | p95 {result['per_file_p95_s']:.2f} s | max {result['per_file_max_s']:.2f} s")
+    if result["commands_per_file"] is not None:
+        print(f"🔁 WebDriver commands ต่อไฟล์: เฉลี่ย {result['commands_per_file']} | สูงสุด {result['commands_per_file_max']}")
+    else:
+        print("🔁 WebDriver commands ต่อไฟล์: n/a (รันด้วย --trace-commands)")
+    print(f"🪶 เบราว์เซอร์แบบ lean: {'เปิด' if result['lean_browser'] else 'ปิด'} | โหลดหน้า {result['page_load_ms']:.0f} ms "
+          f"({result['page_resources']:.0f} ไฟล์, {result['page_kb']:.0f} KB)")
+    print(f"🧠 หน่วยความจำต่อ worker: JS heap {format_mb(result['js_heap_mb'])} | Chrome RSS {format_mb(result['browser_rss_mb'])}")
+    print("-" * 60)
+    print(f"{'ขั้นตอน':<18}{'n':>6}{'p50':>9}{'p95':>9}{'max':>9}")
+    for step, stats in result["steps"].items():
+        print(f"{step:<18}{stats['count']:>6}{stats['p50']:>8.2f}s{stats['p95']:>8.2f}s{stats['max']:>8.2f}s")
+    print("-" * 60)
+    for line in result["selectors"]:
+        print(line)
+    if result["command_report"]:
+        print("-" * 60)
+        for line in result["command_report"]:
+            print(line)
+    print("=" * 60)
+
+
+def check_command_budget(results, budget):
+    """regression check: ทุกไฟล์ต้องใช้ WebDriver command ไม่เกินงบ - คืนค่า False ถ้าไม่ผ่าน"""
+    passed = True
+    for result in results:
+        if result["commands_per_file_max"] is not None and result["commands_per_file_max"] > budget:
+            print(f"❌ {result['feature']}: WebDriver commands ต่อไฟล์สูงสุด {result['commands_per_file_max']} เกินงบ {budget}")
+            passed = False
+    if passed:
+        print(f"✅ WebDriver commands ต่อไฟล์ไม่เกินงบ {budget}")
+    return passed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark DSL Auto Fill Bot กับ Mock Portal")
+    parser.add_argument("--feature", choices=["disbursement", "sign-contract"], default="disbursement")
+    parser.add_argument("--files", type=int, default=20, help="จำนวนไฟล์จำลอง")
+    parser.add_argument("--latency-ms", type=float, default=0, help="หน่วงเวลาตอบกลับของ Mock Portal")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="หน่วงเวลาสุ่มเพิ่มของ Mock Portal")
+    parser.add_argument("--wait-mode", choices=["event", "legacy"], default=config.WAIT_MODE)
+    parser.add_argument("--result-index", action="store_true", help="อ่านตารางผลลัพธ์ครั้งเดียวแทนการตรวจปุ่มทีละไฟล์")
+    parser.add_argument("--lean", choices=["on", "off"], help="เปิด/ปิดเบราว์เซอร์แบบ lean (ค่าเริ่มต้นตาม config)")
+    parser.add_argument("--tabs", type=int, default=1, help="จำนวนแท็บที่ทำงานสลับกันในเบราว์เซอร์เดียว (Tab Pipeline)")
+    parser.add_argument("--compare-lean", action="store_true", help="รันทั้งแบบปกติและแบบ lean แล้วเปรียบเทียบ")
+    parser.add_argument("--headed", action="store_true", help="แสดงหน้าต่างเบราว์เซอร์")
+    parser.add_argument("--verbose", action="store_true", help="แสดง log ทุกขั้นตอน")
+    parser.add_argument("--json", dest="json_path", help="บันทึกผลลัพธ์เป็นไฟล์ JSON")
+    parser.add_argument("--trace-commands", action="store_true", help="นับ WebDriver command ต่อไฟล์ แยกตามขั้นตอนและ method ที่เรียก")
+    parser.add_argument("--command-budget", type=float, default=config.COMMAND_BUDGET_PER_FILE,
+                        help="ไม่ผ่าน (exit 1) ถ้าไฟล์ใดใช้ WebDriver command เกินจำนวนนี้ (ใช้กับ --trace-commands)")
+    parser.add_argument("--profile", action="store_true", help="บันทึก cProfile ลง traces/profile_<session>.prof")
+    args = parser.parse_args()
+
+    config.WAIT_MODE = args.wait_mode
+    config.RESULT_INDEX_ENABLED = args.result_index
+    config.HEADLESS_MODE = not args.headed
+    config.USE_EXISTING_BROWSER = False
+    config.WORKER_COUNT = 1
+    config.TAB_PIPELINE_TABS = max(1, args.tabs)
+    config.COMMAND_TRACE_ENABLED = args.trace_commands
+    profiler = Profiler(f"benchmark_{time.strftime('%Y%m%d_%H%M%S')}") if args.profile else None
+
+    if args.lean:
+        config.LEAN_BROWSER_ENABLED = args.lean == "on"
+
+    if args.compare_lean:
+        runs = []
+        for lean in (False, True):
+            config.LEAN_BROWSER_ENABLED = lean
+            runs.append(run_benchmark(args.feature, args.files, args.latency_ms, args.jitter_ms, args.verbose))
+            print_report(runs[-1])
+        print_lean_comparison(*runs)
+        result = {"full": runs[0], "lean": runs[1]}
+    else:
+        runs = [run_benchmark(args.feature, args.files, args.latency_ms, args.jitter_ms, args.verbose)]
+        result = runs[0]
+        print_report(result)
+
+    if profiler:
+        print(f"🧪 cProfile: {profiler.dump()}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    if args.trace_commands and not check_command_budget(runs, args.command_budget):
+        sys.exit(1)
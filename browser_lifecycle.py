@@ -0,0 +1,64 @@
+import config
+
+
+class BrowserLifecycle:
+    """
+    ดูแลเบราว์เซอร์ของ bot ข้ามการเลือกเมนูแต่ละครั้ง
+    ฟีเจอร์แรกเปิดเบราว์เซอร์และ login ฟีเจอร์ถัดไปรับเบราว์เซอร์ที่ login แล้วไปใช้ต่อ
+    (เปิดใหม่เมื่อเบราว์เซอร์ถูกปิด/ไม่ตอบสนอง หรือเปลี่ยนบัญชี)
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.account_id = None  # บัญชีที่ login ค้างอยู่ในเบราว์เซอร์
+
+    def is_alive(self):
+        """เบราว์เซอร์ยังเปิดอยู่และตอบสนองหรือไม่"""
+        if self.bot.driver is None:
+            return False
+        try:
+            self.bot.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def acquire(self):
+        """เบราว์เซอร์สำหรับ batch ใหม่ - ใช้ตัวเดิมถ้ายังเปิดอยู่และเป็นบัญชีเดิม"""
+        user_id, _ = self.bot.get_active_account()
+        if self.is_alive():
+            if self.account_id in (None, user_id):
+                self.bot.log("♻️  ใช้เบราว์เซอร์ที่เปิดค้างไว้ (ไม่ต้องเปิดใหม่)")
+                return True
+            self.bot.log(f"🔁 เปลี่ยนบัญชีเป็น {user_id} - เปิดเบราว์เซอร์ใหม่")
+        elif self.bot.driver is not None:
+            self.bot.log_warning("⚠️  เบราว์เซอร์เดิมไม่ตอบสนอง - เปิดใหม่")
+
+        self.close()
+        return self.bot.setup_driver()
+
+    def mark_logged_in(self):
+        """บันทึกว่าเบราว์เซอร์ login บัญชีปัจจุบันแล้ว"""
+        self.account_id, _ = self.bot.get_active_account()
+
+    def is_logged_in(self):
+        """เบราว์เซอร์ login บัญชีปัจจุบันค้างไว้จากฟีเจอร์ก่อนหน้าหรือไม่"""
+        user_id, _ = self.bot.get_active_account()
+        return self.account_id is not None and self.account_id == user_id and self.is_alive()
+
+    def release(self):
+        """จบฟีเจอร์ - เก็บเบราว์เซอร์ไว้ให้ฟีเจอร์ถัดไป (หรือปิดถ้า KEEP_BROWSER_ALIVE = False)"""
+        if config.KEEP_BROWSER_ALIVE and self.is_alive():
+            self.bot.log("🔥 เก็บเบราว์เซอร์ที่ login แล้วไว้สำหรับฟีเจอร์ถัดไป")
+            return
+        self.close()
+
+    def close(self):
+        """ปิดเบราว์เซอร์จริง"""
+        if self.bot.driver is not None:
+            try:
+                self.bot.driver.quit()
+            except Exception:
+                pass
+            self.bot.driver = None
+            self.bot.log("🔚 ปิดเบราว์เซอร์แล้ว")
+        self.account_id = None
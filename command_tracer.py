@@ -0,0 +1,161 @@
+import sys
+import json
+import time
+import inspect
+import cProfile
+import threading
+import config
+from path_utils import get_traces_directory
+
+
+class CommandTracer:
+    """
+    นับและจับเวลา WebDriver command ทุกครั้ง (แต่ละ command = HTTP round trip ไปยัง chromedriver)
+    ระบุ method ของ bot ที่เรียก (เช่น wait_and_click) และขั้นตอนที่กำลังทำ (search, upload, ...)
+    เขียนรายงานต่อไฟล์ลง traces/commands_<session>.jsonl - เปิดด้วย COMMAND_TRACE_ENABLED หรือ --trace-commands
+    """
+
+    def __init__(self, session_id):
+        self.lock = threading.Lock()
+        self.callers = {}     # code object ของ method ใน bot -> ชื่อ method
+        self.totals = {}      # (step, caller, command) -> [จำนวน, วินาที]
+        self.file_counts = []  # จำนวน command ของแต่ละไฟล์ใน batch
+        self.report_path = get_traces_directory() / f"commands_{session_id}.jsonl"
+        self.report_file = None
+
+    def install(self, bot):
+        """ครอบ driver.execute ของ bot ให้นับทุก command (ติดตั้งครั้งเดียวต่อ driver)"""
+        driver = bot.driver
+        if getattr(driver, "command_tracer_installed", False):
+            return
+        for name, function in inspect.getmembers(type(bot), inspect.isfunction):
+            self.callers.setdefault(function.__code__, name)
+
+        original_execute = driver.execute
+
+        def traced_execute(driver_command, params=None):
+            started = time.perf_counter()
+            try:
+                return original_execute(driver_command, params)
+            finally:
+                self.record(driver_command, time.perf_counter() - started)
+
+        driver.execute = traced_execute
+        driver.command_tracer_installed = True
+
+    def find_caller(self):
+        """method ของ bot ที่ใกล้ที่สุดใน call stack และ bot ตัวนั้น (worker/แท็บที่เรียก)"""
+        frame = sys._getframe(3)
+        while frame is not None:
+            name = self.callers.get(frame.f_code)
+            if name is not None:
+                return name, frame.f_locals.get("self")
+            frame = frame.f_back
+        return "-", None
+
+    def record(self, command, duration):
+        caller, bot = self.find_caller()
+        if bot is None or getattr(bot, "command_stats", None) is None:
+            return  # command นอกการทำไฟล์ (เปิดเบราว์เซอร์, login ก่อนเริ่ม batch)
+        step = bot.step_stack[-1] if bot.step_stack else "-"
+        key = (step, caller, command)
+        stats = bot.command_stats.setdefault(key, [0, 0.0])
+        stats[0] += 1
+        stats[1] += duration
+
+    def start_file(self, bot):
+        bot.command_stats = {}
+
+    def finish_file(self, bot, feature_type, filename):
+        """สรุป command ของไฟล์ที่เพิ่งทำเสร็จ - คืนค่า (จำนวน command, วินาที, method ที่เรียกมากที่สุด)"""
+        stats, bot.command_stats = bot.command_stats, None
+        if stats is None:
+            return 0, 0.0, []
+        count = sum(value[0] for value in stats.values())
+        seconds = sum(value[1] for value in stats.values())
+
+        by_caller = {}
+        for (step, caller, command), (calls, elapsed) in stats.items():
+            by_caller[caller] = by_caller.get(caller, 0) + calls
+        top_callers = sorted(by_caller.items(), key=lambda item: -item[1])[:3]
+
+        entry = {
+            "file": filename,
+            "feature": feature_type,
+            "worker": bot.worker_id,
+            "commands": count,
+            "seconds": round(seconds, 3),
+            "by_caller": by_caller,
+            "by_step": self.group(stats, 0),
+            "by_command": self.group(stats, 2),
+        }
+        with self.lock:
+            self.file_counts.append(count)
+            for key, (calls, elapsed) in stats.items():
+                total = self.totals.setdefault(key, [0, 0.0])
+                total[0] += calls
+                total[1] += elapsed
+            if self.report_file is None:
+                self.report_file = open(self.report_path, 'a', encoding='utf-8', buffering=1)
+            self.report_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return count, seconds, top_callers
+
+    def group(self, stats, index):
+        grouped = {}
+        for key, (calls, elapsed) in stats.items():
+            grouped[key[index]] = grouped.get(key[index], 0) + calls
+        return grouped
+
+    def reset(self):
+        """ล้างสถิติของ batch (ไฟล์รายงานยังเขียนต่อ)"""
+        with self.lock:
+            self.totals = {}
+            self.file_counts = []
+
+    def file_command_counts(self):
+        """จำนวน command ของแต่ละไฟล์ใน batch ตามลำดับที่ทำเสร็จ"""
+        with self.lock:
+            return list(self.file_counts)
+
+    def over_budget(self):
+        """จำนวนไฟล์ใน batch ที่ใช้ command เกิน COMMAND_BUDGET_PER_FILE"""
+        with self.lock:
+            return sum(count > config.COMMAND_BUDGET_PER_FILE for count in self.file_counts)
+
+    def format_report(self, limit=10):
+        """สรุป command ต่อไฟล์ และ (ขั้นตอน, method, command) ที่เรียกบ่อยที่สุด"""
+        with self.lock:
+            counts = list(self.file_counts)
+            totals = sorted(self.totals.items(), key=lambda item: -item[1][0])[:limit]
+        if not counts:
+            return []
+        lines = [
+            f"ต่อไฟล์: เฉลี่ย {sum(counts) / len(counts):.1f} | สูงสุด {max(counts)} | "
+            f"งบ {config.COMMAND_BUDGET_PER_FILE} (เกิน {sum(c > config.COMMAND_BUDGET_PER_FILE for c in counts)} ไฟล์)",
+            f"{'ขั้นตอน':<14}{'method':<28}{'command':<22}{'n/ไฟล์':>8}{'ms':>8}",
+        ]
+        for (step, caller, command), (calls, elapsed) in totals:
+            lines.append(
+                f"{step[:13]:<14}{caller[:27]:<28}{command[:21]:<22}{calls / len(counts):>8.1f}{elapsed / calls * 1000:>8.1f}"
+            )
+        return lines
+
+    def close(self):
+        with self.lock:
+            if self.report_file:
+                self.report_file.close()
+                self.report_file = None
+
+
+class Profiler:
+    """cProfile ของ thread หลักตลอดการรัน - บันทึกเป็น traces/profile_<session>.prof (เปิดด้วย snakeviz/pstats)"""
+
+    def __init__(self, session_id):
+        self.path = get_traces_directory() / f"profile_{session_id}.prof"
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def dump(self):
+        self.profile.disable()
+        self.profile.dump_stats(str(self.path))
+        return self.path
@@ -0,0 +1,95 @@
+import threading
+import config
+from file_outcome import FileOutcome, OUTCOME_SUCCESS, OUTCOME_TRANSIENT
+
+
+def median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+
+class ConcurrencyController:
+    """
+    ปรับจำนวน worker ที่ทำงานพร้อมกันตามความเร็วของเว็บไซต์ (AIMD)
+    ทุก ADAPTIVE_WINDOW ไฟล์: ถ้าเว็บไซต์ช้าลงหรือล้มเหลวชั่วคราวบ่อย ลดจำนวนลงครึ่งหนึ่ง
+    ถ้าปกติดี เพิ่มทีละ 1 จนถึง MAX_WORKERS
+    worker ที่เกินจำนวนที่อนุญาตรอจนมีช่องว่าง (ยังไม่เปิดเบราว์เซอร์จนกว่าจะได้ทำงาน)
+    """
+
+    def __init__(self, ceiling, initial, log):
+        self.ceiling = ceiling
+        self.floor = max(1, min(config.ADAPTIVE_MIN_WORKERS, ceiling))
+        self.limit = max(self.floor, min(initial, ceiling))
+        self.log = log
+        self.condition = threading.Condition()
+        self.active = 0
+        self.durations = []   # เวลาของไฟล์ที่สำเร็จใน window ปัจจุบัน
+        self.results = 0      # จำนวนไฟล์ใน window ปัจจุบัน
+        self.troubles = 0     # จำนวนไฟล์ที่ล้มเหลวชั่วคราว (timeout) ใน window ปัจจุบัน
+        self.baseline = None  # median เวลาต่อไฟล์ที่ดีที่สุดที่เคยเห็น (เว็บไซต์ปกติ)
+        self.changes = 0
+        self.peak = self.limit
+        self.generation = 0   # เพิ่มทุกครั้งที่ปรับจำนวน - ไฟล์ที่เริ่มก่อนปรับไม่นับใน window ใหม่
+
+    def acquire(self, should_stop):
+        """
+        รอจนมีช่องว่าง - คืนค่า generation ของช่องที่ได้ (ส่งกลับมาตอน release)
+        หรือ None ถ้า should_stop() เป็นจริงระหว่างรอ (เช่น คิวว่างแล้ว)
+        """
+        with self.condition:
+            while self.active >= self.limit:
+                if should_stop():
+                    return None
+                self.condition.wait(timeout=1)
+            self.active += 1
+            return self.generation
+
+    def release(self, generation, result=None, duration=0.0):
+        """คืนช่องว่าง พร้อมผลของไฟล์ (None = ไม่ได้ทำไฟล์)"""
+        with self.condition:
+            self.active -= 1
+            if result is not None and generation == self.generation:
+                self.observe(FileOutcome.from_result(result), duration)
+            self.condition.notify_all()
+
+    def observe(self, outcome, duration):
+        self.results += 1
+        if outcome.kind == OUTCOME_TRANSIENT:
+            self.troubles += 1
+        elif outcome.kind == OUTCOME_SUCCESS:
+            # ไฟล์ที่ไม่เจอรายการ/ทำแล้วจบเร็ว ไม่ใช้วัดความเร็วเว็บไซต์
+            self.durations.append(duration)
+        if self.results >= config.ADAPTIVE_WINDOW:
+            self.adjust()
+
+    def adjust(self):
+        trouble_rate = self.troubles / self.results
+        latency = median(self.durations) if self.durations else None
+        if latency is not None and (self.baseline is None or latency < self.baseline):
+            self.baseline = latency
+        slow = latency is not None and latency > self.baseline * config.ADAPTIVE_SLOWDOWN_FACTOR
+
+        previous = self.limit
+        if trouble_rate > config.ADAPTIVE_MAX_TROUBLE_RATE or slow:
+            self.limit = max(self.floor, self.limit // 2)
+            reason = f"ล้มเหลวชั่วคราว {trouble_rate:.0%}" if not slow else f"เว็บไซต์ช้าลง ({latency:.1f}s/ไฟล์, ปกติ {self.baseline:.1f}s)"
+        else:
+            self.limit = min(self.ceiling, self.limit + 1)
+            reason = "เว็บไซต์ตอบสนองปกติ"
+
+        if self.limit != previous:
+            self.changes += 1
+            self.generation += 1
+            self.peak = max(self.peak, self.limit)
+            icon = "📉" if self.limit < previous else "📈"
+            self.log(f"{icon} ปรับจำนวน worker พร้อมกัน {previous} -> {self.limit} ({reason})")
+
+        self.durations = []
+        self.results = 0
+        self.troubles = 0
+
+    def format_report(self):
+        return f"🎚️  จำนวน worker พร้อมกัน: สุดท้าย {self.limit}, สูงสุด {self.peak}/{self.ceiling}, ปรับ {self.changes} ครั้ง"
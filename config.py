@@ -90,22 +90,188 @@ SIGN_CONTRACT_FILE_UPLOAD_CONFIRM_BUTTON_SELECTOR = "body > dsl-workspace-root >
 # 12. ปุ่มกลับหน้าแรกเพื่อทำซ้ำ
 SIGN_CONTRACT_BACK_TO_START_BUTTON_SELECTOR = "body > dsl-workspace-root > app-content-layout > div > div > main > article > dsl-workspace-sign-contract-import-file-success > main > section > div.flex.gap-9.justify-center.my-6 > dsl-workspace-button:nth-child(1) > button"
 
+# =================== Selector สั้นที่ลองก่อน selector แบบเต็มด้านบน ===================
+# เรียงตามลำดับที่ลอง - selector แบบเต็มจะถูกใช้เป็นตัวสุดท้ายเสมอ (ถ้าเว็บเปลี่ยน layout ก็ยังหาเจอ)
+# ทุก selector เริ่มจาก component ของหน้านั้นๆ แทน path ตั้งแต่ body (ไม่ผูกกับโครงสร้าง layout)
+# ระหว่างทำงาน selector ที่เจอ element จริงจะถูกเลื่อนขึ้นมาลองก่อน (SelectorRegistry)
+SELECTOR_FALLBACKS = {
+    SEARCH_INPUT_SELECTOR: ["dsl-workspace-disbursement dsl-workspace-form-search-v2 form div:nth-child(5) > input"],
+    SEARCH_BUTTON_SELECTOR: ["dsl-workspace-disbursement dsl-workspace-form-search-v2 footer dsl-workspace-button:nth-child(2) > button"],
+    DISBURSEMENT_CONFIRM_BUTTON_SELECTOR: ["dsl-workspace-disbursement dsl-workspace-table-v2 tbody > tr > td:nth-child(8) div:nth-child(1) > dsl-workspace-button > button"],
+    ADDRESS_CHECKBOX_SELECTOR: ["dsl-workspace-disbursement-consent-doc section:nth-child(2) > app-address-panel input"],
+    CONTRACT_CHECKBOX_SELECTOR: ["dsl-workspace-disbursement-consent-doc section:nth-child(4) > dsl-workspace-confirm-contract-panel input"],
+    CONTRACT_CHECKBOX_3_CASE_SELECTOR: ["dsl-workspace-disbursement-consent-doc section:nth-child(5) > dsl-workspace-confirm-contract-panel input"],
+    OPTIONAL_CHECKBOX_SELECTOR: ["dsl-workspace-disbursement-consent-doc section.ng-star-inserted > app-address-panel input"],
+    CONSENT_CONFIRM_BUTTON_SELECTOR: ["dsl-workspace-disbursement-consent-doc > footer dsl-workspace-button.ng-star-inserted > button"],
+    GO_TO_FILE_SELECTION_BUTTON_SELECTOR: ["dsl-workspace-disbursement-consent-success div.justify-center > dsl-workspace-button > button"],
+    FILE_UPLOAD_CONFIRM_BUTTON_SELECTOR: ["dsl-workspace-disbursement-import-file > footer dsl-workspace-button.ng-star-inserted > button"],
+    BACK_TO_START_BUTTON_SELECTOR: ["dsl-workspace-disbursement-import-file-success div.justify-center > dsl-workspace-button > button"],
+
+    SIGN_CONTRACT_SEARCH_INPUT_SELECTOR: ["dsl-workspace-sign-contract dsl-workspace-form-search-v2 form div:nth-child(5) > input"],
+    SIGN_CONTRACT_SEARCH_BUTTON_SELECTOR: ["dsl-workspace-sign-contract dsl-workspace-form-search-v2 footer dsl-workspace-button:nth-child(2) > button"],
+    SIGN_CONTRACT_BUTTON_SELECTOR: ["dsl-workspace-sign-contract dsl-workspace-table-v2 tbody > tr > td:nth-child(8) div:nth-child(1) > dsl-workspace-button > button"],
+    SIGN_CONTRACT_ADDRESS_CHECKBOX_SELECTOR: ["dsl-workspace-sign-contract-consent-doc section:nth-child(2) > app-address-panel input"],
+    SIGN_CONTRACT_CONTRACT_CHECKBOX_SELECTOR: ["dsl-workspace-sign-contract-consent-doc section:nth-child(4) > dsl-workspace-confirm-contract-panel input"],
+    SIGN_CONTRACT_CONTRACT_CHECKBOX_2_CASE_SELECTOR: ["dsl-workspace-sign-contract-consent-doc section:nth-child(3) > dsl-workspace-confirm-contract-panel input"],
+    SIGN_CONTRACT_OPTIONAL_CHECKBOX_SELECTOR: ["dsl-workspace-sign-contract-consent-doc section.ng-star-inserted > app-address-panel input"],
+    SIGN_CONTRACT_CONSENT_CONFIRM_BUTTON_SELECTOR: ["dsl-workspace-sign-contract-consent-doc > footer dsl-workspace-button.ng-star-inserted > button"],
+    SIGN_CONTRACT_GO_TO_FILE_SELECTION_BUTTON_SELECTOR: ["dsl-workspace-sign-contract-consent-success div.justify-center > dsl-workspace-button:nth-child(2) > button"],
+    SIGN_CONTRACT_FILE_UPLOAD_CONFIRM_BUTTON_SELECTOR: ["dsl-workspace-sign-contract-import-file > footer dsl-workspace-button.ng-star-inserted > button"],
+    SIGN_CONTRACT_BACK_TO_START_BUTTON_SELECTOR: ["dsl-workspace-sign-contract-import-file-success div.justify-center > dsl-workspace-button:nth-child(1) > button"],
+}
+
 # การตั้งค่าไฟล์
 # หมายเหตุ: ไดเรกทอรีจะถูกจัดการโดย path_utils.py เพื่อรองรับ executable
 ALLOWED_EXTENSIONS = ['.pdf', '.doc', '.docx', '.txt', '.jpg', '.png']  # นามสกุลไฟล์ที่อนุญาต
+PREFLIGHT_ENABLED = True      # ตรวจไฟล์ (ขนาด, ชนิดไฟล์, PDF สมบูรณ์, ชื่อซ้ำ) ก่อนเปิดเบราว์เซอร์
+PREFLIGHT_WORKERS = 8         # จำนวน thread ที่ใช้ตรวจไฟล์
+PREFLIGHT_STEM_PATTERN = r"\S(.*\S)?"  # รูปแบบชื่อไฟล์ (ไม่รวมนามสกุล) ที่ค้นหาในเว็บไซต์ได้ - ค่าเริ่มต้น: ไม่ว่างและไม่มีช่องว่างหัวท้าย
+SCAN_SHARD_DEPTH = 1          # อ่านโฟลเดอร์ย่อยใน files/<feature>/ ลึกกี่ชั้น (เช่น แบ่งตามวันที่/prefix) - 0 = เฉพาะไฟล์ชั้นบนสุด
+SCAN_CHUNK_SIZE = 50          # อ่านและตรวจไฟล์ทีละกี่ไฟล์ (เริ่มทำงานได้ทันทีไม่ต้องรอสแกนทั้งโฟลเดอร์)
+SCAN_ESTIMATE_SAMPLES = 5     # จำนวนโฟลเดอร์ย่อยที่นับจริงเพื่อประมาณจำนวนไฟล์ทั้งหมด
+PROGRESS_LOG_EVERY = 10       # แสดงความคืบหน้าและเวลาที่เหลือทุกๆ กี่ไฟล์
+
+# ลำดับการทำไฟล์ - เรียงตามคีย์จากซ้ายไปขวา ใส่ "-" หน้าคีย์เพื่อกลับลำดับ (เช่น "-size" = ไฟล์ใหญ่ก่อน)
+# priority = ไฟล์ด่วนใน PRIORITY_FOLDER ก่อน, retry = ไฟล์ที่เคยลองทำแล้วก่อน, age = ไฟล์เก่าก่อน, size = ไฟล์เล็กก่อน
+SCHEDULE_ORDER = ["priority", "retry", "age"]
+SCHEDULE_WINDOW = 500         # อ่านไฟล์ล่วงหน้ากี่ไฟล์เพื่อเรียงลำดับ (เริ่มจากชุดแรกแล้วเพิ่มระหว่างทำงาน) - 0 = อ่านทั้งโฟลเดอร์ก่อนเริ่ม (เรียงได้ทั้งหมด)
+PRIORITY_FOLDER = "urgent"    # files/<feature>/urgent/ - ไฟล์ด่วน ทำก่อนไฟล์อื่น (วางเพิ่มระหว่างทำงานได้)
+SCHEDULE_POLL_SECONDS = 5     # ตรวจหาไฟล์ด่วนที่เพิ่งวางทุกกี่วินาที
 
 # การตั้งค่าการรอคอย (วินาที)
 WAIT_TIME = 2  # รอคอยระหว่างการทำงานแต่ละขั้นตอน
 PAGE_LOAD_TIMEOUT = 10  # รอหน้าเว็บโหลด
 ELEMENT_WAIT_TIMEOUT = 10  # รอ element ปรากฏ
 
+# การตั้งค่า Wait Engine
+WAIT_MODE = "event"         # "event" = รอจนหน้าเว็บถึงสถานะที่คาดไว้, "legacy" = sleep WAIT_TIME ทุกขั้นตอนแบบเดิม
+STATE_POLL_INTERVAL = 0.1   # ความถี่ในการตรวจสถานะหน้าเว็บ (วินาที)
+STATE_STALE_GRACE = 1.0     # เวลาผ่อนผัน (วินาที) กรณีเว็บไม่ re-render element เดิมหลังการกระทำ
+RESULT_ROW_SELECTOR = "dsl-workspace-table-v2 table > tbody > tr"  # แถวในตารางผลการค้นหา
+IDLE_QUIET_MS = 100         # หน้าเว็บถือว่าว่างเมื่อไม่มี request ค้างนานเท่านี้ (มิลลิวินาที)
+IDLE_LONG_REQUEST_MS = 3000  # request ที่ค้างนานกว่านี้ (มิลลิวินาที) ถือเป็น long-poll/polling เบื้องหลัง ไม่ต้องรอ
+IDLE_ANGULAR_MAX_WAIT = 2.0  # รอ Angular stable นานสุด (วินาที) - หน้าที่มี interval ไม่มีวัน stable
+LOADING_OVERLAY_SELECTORS = [".ngx-spinner-overlay", "[class*='spinner-overlay']", "[class*='loading-overlay']"]
+
+# สถานะหน้าเว็บที่แต่ละขั้นตอนรอ (ถึงสถานะเมื่อพบ selector ใด selector หนึ่ง)
+# - "stale": element ก่อนการกระทำที่ต้องถูกแทนที่ก่อน
+# - "{selector}": แทนด้วย selector ของ element ที่ถูกคลิก
+# - "idle": ต้องไม่มี request ค้างและไม่มี loading overlay ด้วย (ผลค้นหาที่มาจาก API)
+PAGE_STATES = {
+    # Radio/Checkbox ถูกเลือกแล้ว
+    "checked": {"selectors": ["{selector}:checked"]},
+    # หน้าค้นหาพร้อมใช้งาน
+    "search_page": {"selectors": [RADIO_SELECTOR], "stale": "{selector}"},
+    # ผลการค้นหาแสดงแล้ว (เจอรายการ / ไม่เจอ / ทำสำเร็จแล้ว)
+    "search_results": {
+        "selectors": [DISBURSEMENT_CONFIRM_BUTTON_SELECTOR, ".no-data, .empty-result", "p.text-green-chartreuse"],
+        "stale": RESULT_ROW_SELECTOR,
+        "idle": True
+    },
+    "sign_contract_search_results": {
+        "selectors": [SIGN_CONTRACT_BUTTON_SELECTOR, ".no-data, .empty-result"],
+        "stale": RESULT_ROW_SELECTOR,
+        "idle": True
+    },
+    # หน้า consent แสดงแล้ว
+    "consent_page": {"selectors": [CONSENT_CONFIRM_BUTTON_SELECTOR]},
+    "sign_contract_consent_page": {"selectors": [SIGN_CONTRACT_CONSENT_CONFIRM_BUTTON_SELECTOR]},
+    # หน้าบันทึก consent สำเร็จ
+    "consent_success": {"selectors": [GO_TO_FILE_SELECTION_BUTTON_SELECTOR]},
+    "sign_contract_consent_success": {"selectors": [SIGN_CONTRACT_GO_TO_FILE_SELECTION_BUTTON_SELECTOR]},
+    # หน้าเลือกไฟล์แสดงแล้ว
+    "import_page": {"selectors": [FILE_INPUT_SELECTOR]},
+    "sign_contract_import_page": {"selectors": [SIGN_CONTRACT_FILE_INPUT_SELECTOR]},
+    # แนบไฟล์แล้ว ปุ่มยืนยันการอัปโหลดพร้อมกด
+    "file_attached": {"selectors": [FILE_UPLOAD_CONFIRM_BUTTON_SELECTOR + ":not([disabled])"]},
+    "sign_contract_file_attached": {"selectors": [SIGN_CONTRACT_FILE_UPLOAD_CONFIRM_BUTTON_SELECTOR + ":not([disabled])"]},
+    # หน้าอัปโหลดสำเร็จ
+    "import_success": {"selectors": [BACK_TO_START_BUTTON_SELECTOR]},
+    "sign_contract_import_success": {"selectors": [SIGN_CONTRACT_BACK_TO_START_BUTTON_SELECTOR]},
+    # กลับมาหน้าค้นหาแล้ว
+    "sign_contract_search_page": {"selectors": [SIGN_CONTRACT_RADIO_SELECTOR], "stale": "{selector}"},
+}
+
+# ข้อความ error ที่เว็บไซต์แสดงเมื่อไม่รับไฟล์ที่อัปโหลด (ชนิด/ขนาดไฟล์ไม่ถูกต้อง) - พบแล้วถือว่าล้มเหลวถาวร ไม่ลองใหม่
+# ไม่พบข้อความ = หน้าเว็บช้าหรือ element หาย ถือว่าล้มเหลวชั่วคราว (ตรวจกับเว็บไซต์จริงก่อนเพิ่ม)
+UPLOAD_REJECTED_SELECTORS = [
+    "dsl-workspace-disbursement-import-file .text-red-500",
+    "dsl-workspace-sign-contract-import-file .text-red-500",
+    ".swal2-icon-error ~ .swal2-html-container",
+]
+
 # การตั้งค่า WebDriver
 USE_EXISTING_BROWSER = False  # True = ใช้เบราว์เซอร์ที่เปิดอยู่แล้ว, False = เปิดใหม่
 CHROME_DEBUG_PORT = 9222      # พอร์ตสำหรับเชื่อมต่อกับ Chrome ที่เปิดอยู่
 LOGIN_WAIT_TIME = 30          # เวลารอให้ผู้ใช้ login (วินาที)
+SESSION_CACHE_ENABLED = True  # True = บันทึก session ที่ login แล้วไว้ใน accounts/sessions/ เพื่อข้ามการ login ครั้งถัดไป
+SESSION_CACHE_MAX_AGE = 8 * 60 * 60  # อายุสูงสุดของ session ที่บันทึกไว้ (วินาที)
 HEADLESS_MODE = False         # True = รันแบบไม่แสดงหน้าต่าง, False = แสดงหน้าต่าง
 WINDOW_SIZE = (1920, 1080)    # ขนาดหน้าต่างเบราว์เซอร์
+KEEP_BROWSER_ALIVE = True     # True = เก็บเบราว์เซอร์ที่ login แล้วไว้ใช้กับฟีเจอร์ถัดไปที่เลือกจากเมนู, False = ปิดทุกครั้งที่จบฟีเจอร์
+
+# การตั้งค่าเบราว์เซอร์แบบ lean (bot ใช้แค่ DOM ของฟอร์ม ไม่ต้องโหลดรูปภาพ ฟอนต์ และตัวเก็บสถิติ)
+LEAN_BROWSER_ENABLED = True   # True = ปิดการโหลดรูปภาพ/animation และบล็อก URL ด้านล่าง, False = โหลดหน้าเว็บครบแบบเดิม
+LEAN_BLOCKED_URL_PATTERNS = [  # รูปแบบ URL ที่บล็อก (* = อะไรก็ได้) - ลบรายการที่ทำให้เว็บไซต์ทำงานผิดปกติออกได้
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*hotjar.com*", "*clarity.ms*", "*/analytics*",
+]
+
+# การตั้งค่า Worker Pool (ประมวลผลหลายเบราว์เซอร์พร้อมกัน)
+WORKER_COUNT = 1              # จำนวนเบราว์เซอร์ที่ทำงานพร้อมกัน (1 = ทำทีละไฟล์แบบเดิม)
+WORKER_START_DELAY = 3        # หน่วงเวลา (วินาที) ระหว่างการเปิดเบราว์เซอร์แต่ละตัว
+MAX_CONCURRENT_ACCOUNTS = 3   # จำนวนบัญชีที่เปิดเบราว์เซอร์พร้อมกันสูงสุด (python main.py --accounts ...)
+MAX_WORKERS = 4               # เพดานจำนวนเบราว์เซอร์พร้อมกัน (ใช้กับ WORKER_COUNT, --workers และโหมดปรับอัตโนมัติ)
+TAB_PIPELINE_TABS = 1         # จำนวนแท็บที่ทำงานสลับกันในเบราว์เซอร์เดียว (1 = ปิด) - ใช้เมื่อ WORKER_COUNT = 1, ไม่เปิด Chrome และไม่ login เพิ่ม
+
+# การปรับจำนวน worker อัตโนมัติตามความเร็วเว็บไซต์ (เปิด MAX_WORKERS worker, เริ่มทำงานพร้อมกัน WORKER_COUNT ตัว)
+ADAPTIVE_CONCURRENCY = False  # True = ลดครึ่งหนึ่งเมื่อเว็บไซต์ช้า/timeout บ่อย, เพิ่มทีละ 1 เมื่อปกติ
+ADAPTIVE_MIN_WORKERS = 1      # จำนวน worker พร้อมกันต่ำสุด
+ADAPTIVE_WINDOW = 5           # ประเมินใหม่ทุกๆ กี่ไฟล์
+ADAPTIVE_SLOWDOWN_FACTOR = 1.5  # ช้ากว่าเวลาต่อไฟล์ที่ดีที่สุดกี่เท่าถึงถือว่าเว็บไซต์ช้าลง
+ADAPTIVE_MAX_TROUBLE_RATE = 0.2  # สัดส่วนไฟล์ที่ล้มเหลวชั่วคราว (timeout) ที่ยอมรับได้ใน window
+
+# การลองใหม่ (ไฟล์ที่ล้มเหลวชั่วคราว เช่น เว็บช้า/element ยังไม่มา ลองใหม่ท้าย batch แทนการย้ายไป failed ทันที)
+RETRY_MAX_ATTEMPTS = 2        # จำนวนครั้งที่ลองใหม่ต่อไฟล์ (0 = ไม่ลองใหม่)
+RETRY_BACKOFF_SECONDS = 30    # รอก่อนลองใหม่ครั้งแรก (ครั้งถัดไปรอนานขึ้นเป็นสองเท่า)
+
+# การลองไฟล์ใน failed/ ใหม่ข้ามรอบการรัน (python main.py --batch --retry-failed --feature ...)
+RETRY_FAILED_CLASSES = ["transient", "not_found"]  # สาเหตุที่ลองใหม่ได้ (preflight/permanent/rejected ต้องแก้ไฟล์ก่อน)
+RETRY_FAILED_MAX_RUNS = 3     # ลองใหม่กี่รอบก่อนย้ายไป failed/<feature>/parked/
+RETRY_FAILED_BACKOFF_HOURS = 6  # รอหลังล้มเหลวกี่ชั่วโมงก่อนลองใหม่ (รอบถัดไปรอนานขึ้นเป็นสองเท่า)
+
+# การตั้งค่าโหมดเฝ้าโฟลเดอร์ (python main.py --watch)
+WATCH_POLL_INTERVAL = 1.0     # ความถี่ในการตรวจโฟลเดอร์ (วินาที) - กรณีไม่มี inotify
+WATCH_STABLE_SECONDS = 2.0    # ไฟล์ต้องมีขนาดคงที่นานเท่านี้ก่อนอัปโหลด (กันไฟล์ที่ยังคัดลอกไม่เสร็จ)
+WATCH_RESTART_BACKOFF_SECONDS = 5  # worker ผิดพลาด (เปิดเบราว์เซอร์/login ไม่ได้) รอก่อนเริ่มใหม่ (ครั้งถัดไปรอนานขึ้นเป็นสองเท่า)
+WATCH_RESTART_MAX_SECONDS = 300    # รอนานสุดก่อนเริ่มใหม่
+
+# การตั้งค่าดัชนีตารางผลลัพธ์ (อ่านตารางทุกหน้าครั้งเดียวต่อ batch แทนการตรวจปุ่มทีละไฟล์)
+RESULT_INDEX_ENABLED = False  # True = ไฟล์ที่ทำแล้ว/ไม่มีรายการจะถูกแยกจากดัชนีโดยไม่ต้องค้นหา (ถ้าอ่านตารางไม่ครบ ไฟล์ที่ไม่มีในดัชนีค้นหาตามเดิม)
+RESULT_ID_CELL_SELECTOR = "td:nth-child(1)"  # คอลัมน์รหัสรายการ (ตรงกับชื่อไฟล์ที่ตัดนามสกุลออก)
+RESULT_ACTION_CELL_SELECTOR = "td:nth-child(8)"  # คอลัมน์ปุ่มดำเนินการ
+RESULT_NEXT_PAGE_SELECTOR = "dsl-workspace-table-v2 nav.pagination button.next:not([disabled])"  # ปุ่มหน้าถัดไป
+RESULT_INDEX_MAX_PAGES = 200  # จำนวนหน้าสูงสุดที่อ่าน (กันวนไม่รู้จบ)
 
 # การตั้งค่า Log
 LOG_ENABLED = True  # เปิด/ปิด การบันทึก log
-LOG_FILE = "autofill.log"  # ชื่อไฟล์ log
\ No newline at end of file
+LOG_FILE = "autofill.log"  # ชื่อไฟล์ log
+LOG_MAX_BYTES = 10 * 1024 * 1024  # หมุนเวียนไฟล์ log เมื่อใหญ่เกินกี่ byte (เก็บไฟล์เก่าเป็น autofill.log.1, .2, ...)
+LOG_ROTATE_WHEN = None  # หมุนเวียนตามเวลาแทนขนาด เช่น "midnight" = ไฟล์ใหม่ทุกวัน (None = ตามขนาด)
+LOG_BACKUP_COUNT = 5  # จำนวนไฟล์ log เก่าที่เก็บไว้
+LOG_COMPACT = False  # True = หน้าจอแสดงเฉพาะคำเตือน/ข้อผิดพลาดและความคืบหน้า (ไฟล์ log ยังบันทึกครบ) - เหมาะกับงานจำนวนมาก
+LOG_DEBUG = False  # True = บันทึกรายละเอียดทุกขั้นตอน (คลิก, กรอกข้อมูล, อัปโหลด)
+LOG_DEBUG_FLAG_FILE = "debug.on"  # สร้างไฟล์นี้ข้างโปรแกรมเพื่อเปิดรายละเอียดระหว่างทำงาน ลบเพื่อปิด
+LOG_DEBUG_POLL_SECONDS = 5  # ตรวจไฟล์ LOG_DEBUG_FLAG_FILE ทุกกี่วินาที
+TRACE_ENABLED = True  # บันทึกเวลาแต่ละขั้นตอนลง traces/trace_<session>.jsonl
+COMMAND_TRACE_ENABLED = False  # นับ WebDriver command (round trip ไปยัง chromedriver) ต่อไฟล์ลง traces/commands_<session>.jsonl
+COMMAND_BUDGET_PER_FILE = 120  # จำนวน command ต่อไฟล์สูงสุดที่ยอมรับ - เกินแล้วเตือน และ benchmark.py ถือว่าไม่ผ่าน
+
+# การตั้งค่า Metrics (ดูความคืบหน้าระหว่างทำงานด้วย Prometheus/เบราว์เซอร์ที่ http://127.0.0.1:9108/metrics)
+METRICS_ENABLED = False  # True = เปิด endpoint metrics (หรือใช้ python main.py --metrics-port 9108)
+METRICS_HOST = "127.0.0.1"  # เปิดให้เข้าถึงเฉพาะเครื่องนี้
+METRICS_PORT = 9108  # พอร์ตของ endpoint metrics
+METRICS_BUCKETS = [0.25, 0.5, 1, 2, 5, 10, 30, 60, 120]  # ขอบเขต histogram เวลาแต่ละขั้นตอน (วินาที)
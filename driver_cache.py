@@ -0,0 +1,88 @@
+import os
+import json
+import shutil
+import time
+import threading
+from path_utils import get_app_directory
+
+# worker หลายตัวเปิดเบราว์เซอร์พร้อมกัน - ให้ตัวแรกหา/ดาวน์โหลด ChromeDriver ตัวอื่นรอใช้ผลเดียวกัน
+_resolve_lock = threading.Lock()
+
+
+class DriverCache:
+    """
+    จำตำแหน่งไฟล์ ChromeDriver ที่ใช้ได้ไว้ในไฟล์ (driver_cache.json)
+    การเปิดเบราว์เซอร์ครั้งถัดไปใช้ไฟล์เดิมทันที ไม่ต้องถาม WebDriver Manager ผ่านอินเทอร์เน็ต
+    """
+
+    def __init__(self):
+        self.cache_file = get_app_directory() / "driver_cache.json"
+
+    def load(self):
+        """ตำแหน่ง ChromeDriver ที่จำไว้ (None ถ้าไม่มีหรือไฟล์ถูกลบไปแล้ว)"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                path = json.load(f).get("path")
+        except (OSError, ValueError):
+            return None
+        if path and os.path.isfile(path) and os.access(path, os.X_OK):
+            return path
+        return None
+
+    def save(self, path, source):
+        data = {"path": path, "source": source, "saved_at": time.time()}
+        temp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_file, self.cache_file)
+
+    def clear(self):
+        try:
+            self.cache_file.unlink()
+        except FileNotFoundError:
+            pass
+
+    def resolve(self, log=print, failed_path=None):
+        """
+        หาตำแหน่ง ChromeDriver: ไฟล์ที่จำไว้ -> PATH (เช่น Homebrew) -> WebDriver Manager (ดาวน์โหลดครั้งเดียว)
+        คืนค่า None ถ้าหาไม่เจอ (ให้ Selenium Manager จัดการเอง)
+        failed_path: ChromeDriver ที่เพิ่งเปิดเบราว์เซอร์ไม่สำเร็จ - ลบที่จำไว้แล้วคืนค่า None ให้ Selenium Manager
+        หาตัวที่ตรงกับ Chrome (ChromeDriver ใน PATH ที่เก่าจะถูกเลือกซ้ำถ้าหาตามลำดับเดิม)
+        """
+        with _resolve_lock:
+            if failed_path:
+                self.clear()
+                log(f"🔄 ChromeDriver '{failed_path}' ใช้ไม่ได้ - ให้ Selenium Manager หาตัวที่ตรงกับ Chrome")
+                return None
+            return self._resolve(log)
+
+    def remember(self, path, source, log=print):
+        """จำ ChromeDriver ที่ Selenium Manager หาให้ (ครั้งถัดไปไม่ต้องลอง PATH ที่ใช้ไม่ได้อีก)"""
+        if not path or not os.path.isfile(path):
+            return
+        with _resolve_lock:
+            if self.load() == path:
+                return
+            self.save(path, source)
+        log(f"💾 จำตำแหน่ง ChromeDriver จาก {source}: {path}")
+
+    def _resolve(self, log):
+        path = self.load()
+        if path:
+            return path
+
+        path = shutil.which("chromedriver")
+        if path:
+            self.save(path, "path")
+            log(f"💾 จำตำแหน่ง ChromeDriver จาก PATH: {path}")
+            return path
+
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = ChromeDriverManager().install()
+        except Exception as e:
+            log(f"⚠️  WebDriver Manager ล้มเหลว: {str(e)}")
+            return None
+        self.save(path, "webdriver-manager")
+        log(f"💾 จำตำแหน่ง ChromeDriver จาก WebDriver Manager: {path}")
+        return path
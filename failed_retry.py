@@ -0,0 +1,105 @@
+import os
+import re
+import time
+import shutil
+import config
+from file_scanner import FileScanner
+from path_utils import get_files_directory
+
+# move_file_to_failed เติมเวลาท้ายชื่อไฟล์เมื่อชื่อซ้ำกับไฟล์ที่อยู่ใน failed/ แล้ว
+FAILED_SUFFIX_PATTERN = re.compile(r"_\d{8}_\d{6}$")
+PARKED_FOLDER = "parked"  # failed/<feature>/parked/ - ลองใหม่ครบแล้ว ไม่ดึงกลับมาอีก
+
+
+def original_filename(filename):
+    """ชื่อไฟล์ก่อนถูกเติมเวลา (2024-10-18/ABC_20241018_093000.pdf -> 2024-10-18/ABC.pdf)"""
+    prefix, _, name = filename.rpartition("/")
+    stem, ext = os.path.splitext(name)
+    stem = FAILED_SUFFIX_PATTERN.sub("", stem)
+    return f"{prefix}/{stem}{ext}" if prefix else f"{stem}{ext}"
+
+
+class FailedRetry:
+    """
+    ดึงไฟล์ใน failed/<feature>/ กลับมาทำใหม่ข้ามรอบการรัน (python main.py --batch --retry-failed)
+    ลองใหม่เฉพาะไฟล์ที่ล้มเหลวด้วยสาเหตุใน RETRY_FAILED_CLASSES และรอก่อนลองใหม่
+    RETRY_FAILED_BACKOFF_HOURS ชั่วโมงหลังล้มเหลว (นานขึ้นสองเท่าทุกรอบ)
+    ลองครบ RETRY_FAILED_MAX_RUNS รอบแล้วยังล้มเหลว ย้ายไป failed/<feature>/parked/
+    ไฟล์ของโหมด --accounts (failed/<feature>/<user_id>/) ย้ายกลับโฟลเดอร์ของบัญชีนั้น (files/<feature>/<user_id>/)
+    ให้รอบ --accounts ถัดไปทำ - ไม่ทำด้วยบัญชีปัจจุบัน
+    """
+
+    def __init__(self, bot, feature_type, failed_directory):
+        self.bot = bot
+        self.journal = bot.journal
+        self.feature_type = feature_type
+        self.failed_directory = str(failed_directory)
+        self.accounts = list(bot.user_manager.data.get("users", {}))
+
+    def failed_files(self):
+        """(ชื่อไฟล์ใน failed/<feature>/, บัญชีเจ้าของไฟล์ หรือ None) - ชื่อไฟล์ของบัญชีขึ้นต้นด้วย <user_id>/ เหมือนใน journal"""
+        for filename in FileScanner(self.failed_directory, exclude=[PARKED_FOLDER] + self.accounts):
+            yield filename, None
+        for account in self.accounts:
+            directory = os.path.join(self.failed_directory, account)
+            if os.path.isdir(directory):
+                for filename in FileScanner(directory):
+                    yield f"{account}/{filename}", account
+
+    def restore(self, target_directory):
+        """ย้ายไฟล์ที่ถึงเวลาลองใหม่กลับเข้าโฟลเดอร์งาน - คืนค่ารายชื่อไฟล์ (ชื่อเดิม) ที่ทำในรอบนี้"""
+        if not os.path.isdir(self.failed_directory):
+            return []
+
+        now = time.time()
+        restored, waiting, permanent, parked, to_accounts = [], 0, 0, 0, 0
+        for filename, account in list(self.failed_files()):
+            original = original_filename(filename)
+            last = self.journal.last_result(self.feature_type, original)
+            error_class = last["error_class"] if last else None
+            if error_class is not None and error_class not in config.RETRY_FAILED_CLASSES:
+                permanent += 1  # ไฟล์เสีย/ชื่อไม่ถูกต้อง - ต้องแก้ไฟล์ก่อน
+                continue
+
+            runs = self.journal.retry_runs(self.feature_type, original)
+            if runs >= config.RETRY_FAILED_MAX_RUNS:
+                self.park(filename, runs)
+                parked += 1
+                continue
+
+            failed_at = last["finished_at"] if last and last["finished_at"] else 0
+            if now < failed_at + config.RETRY_FAILED_BACKOFF_HOURS * 3600 * (2 ** runs):
+                waiting += 1
+                continue
+
+            if account:
+                # original = <user_id>/<ไฟล์> - กลับไปที่ files/<feature>/<user_id>/<ไฟล์>
+                target_path = os.path.join(str(get_files_directory() / self.feature_type), original)
+            else:
+                target_path = os.path.join(str(target_directory), original)
+            if original in restored or os.path.exists(target_path):
+                self.bot.log_warning(f"⚠️  มีไฟล์ '{original}' ในโฟลเดอร์งานแล้ว - ไม่ดึง '{filename}' กลับมา")
+                continue
+
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            shutil.move(os.path.join(self.failed_directory, filename), target_path)
+            self.journal.mark_retried(self.feature_type, original)
+            if account:
+                to_accounts += 1
+            else:
+                restored.append(original)
+
+        self.bot.log(
+            f"🔁 ดึงไฟล์จาก failed/{self.feature_type}/ กลับมาทำใหม่ {len(restored)} ไฟล์ "
+            f"(รอถึงเวลาลองใหม่ {waiting}, ข้อผิดพลาดถาวร {permanent}, ย้ายไป {PARKED_FOLDER}/ {parked})"
+        )
+        if to_accounts:
+            self.bot.log(f"👥 ย้ายไฟล์ของโหมด --accounts กลับโฟลเดอร์ของบัญชี {to_accounts} ไฟล์ - ทำในรอบ --accounts ถัดไป")
+        return restored
+
+    def park(self, filename, runs):
+        """ลองใหม่ครบแล้ว - ย้ายไป parked/ (ไม่ถูกดึงกลับมาอีก ผู้ใช้ตรวจสอบเอง) ไฟล์ของบัญชีอยู่ใน parked/<user_id>/"""
+        target_path = os.path.join(self.failed_directory, PARKED_FOLDER, filename)
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        shutil.move(os.path.join(self.failed_directory, filename), target_path)
+        self.bot.log_warning(f"🅿️  '{filename}' ลองใหม่ครบ {runs} รอบแล้วยังไม่สำเร็จ - ย้ายไป failed/{self.feature_type}/{PARKED_FOLDER}/")
@@ -0,0 +1,42 @@
+from selenium.common.exceptions import WebDriverException, InvalidArgumentException
+
+# ผลการดำเนินการกับไฟล์หนึ่งไฟล์
+OUTCOME_SUCCESS = "success"
+OUTCOME_DUPLICATE = "duplicate"    # เว็บไซต์แจ้งว่าดำเนินการสำเร็จแล้ว
+OUTCOME_NOT_FOUND = "not_found"    # ไม่เจอรายการ
+OUTCOME_TRANSIENT = "transient"    # ล้มเหลวชั่วคราว (เว็บช้า, element ยังไม่มา, หน้าเว็บไม่เปลี่ยน) - ลองใหม่ได้
+OUTCOME_PERMANENT = "permanent"    # ลองใหม่ก็ไม่สำเร็จ (ไฟล์หาย, ไฟล์เสีย, ข้อผิดพลาดในโปรแกรม)
+OUTCOME_REJECTED = "rejected"      # เว็บไซต์แจ้งว่าไม่รับไฟล์ (อัปโหลด/ยืนยันการอัปโหลด) - ลองใหม่ก็ไม่สำเร็จ
+OUTCOME_LOGIN_FAILED = "login_failed"  # login ไม่สำเร็จ (รหัสผ่านผิด/หมดอายุ) - หยุด batch ไฟล์อยู่ที่เดิม
+
+
+class FileOutcome:
+    """
+    ผลลัพธ์ของ process_single_file / process_sign_contract_file
+    ใช้เป็น bool ได้เหมือนเดิม (True = สำเร็จหรือเคยทำสำเร็จแล้ว)
+    """
+
+    def __init__(self, kind, step=None, reason=None):
+        self.kind = kind
+        self.step = step      # ขั้นตอนที่ล้มเหลว (ชื่อเดียวกับใน trace)
+        self.reason = reason  # ข้อความ error ล่าสุด
+
+    def __bool__(self):
+        return self.kind in (OUTCOME_SUCCESS, OUTCOME_DUPLICATE)
+
+    def __repr__(self):
+        return f"FileOutcome({self.kind!r}, step={self.step!r})"
+
+    @classmethod
+    def from_result(cls, result):
+        """แปลงผลลัพธ์แบบเดิม (True/False) เป็น FileOutcome"""
+        if isinstance(result, cls):
+            return result
+        return cls(OUTCOME_SUCCESS) if result else cls(OUTCOME_PERMANENT)
+
+    @classmethod
+    def from_exception(cls, error, step=None):
+        """error ของ Selenium (timeout, element หาย, หน้าเว็บเปลี่ยน) ถือเป็นชั่วคราว ยกเว้นไฟล์ที่ส่งให้เบราว์เซอร์ไม่ถูกต้อง"""
+        if isinstance(error, WebDriverException) and not isinstance(error, InvalidArgumentException):
+            return cls(OUTCOME_TRANSIENT, step, str(error).splitlines()[0] if str(error) else type(error).__name__)
+        return cls(OUTCOME_PERMANENT, step, str(error))
@@ -0,0 +1,112 @@
+import os
+import time
+import threading
+from datetime import timedelta
+import config
+
+
+class FileScanner:
+    """
+    อ่านรายชื่อไฟล์ในโฟลเดอร์ทีละไฟล์ด้วย os.scandir (ไม่ต้องรอสแกนครบก่อนเริ่มทำงาน)
+    รองรับโฟลเดอร์ย่อยที่แบ่งตามวันที่/prefix (files/<feature>/<shard>/...) ลึกสุด SCAN_SHARD_DEPTH ชั้น
+    ชื่อไฟล์ที่คืนเป็น path สัมพัทธ์จากโฟลเดอร์ (เช่น "2024-10-18/ABC123.pdf")
+    """
+
+    def __init__(self, directory, limit=None, exclude=()):
+        self.directory = str(directory)
+        self.limit = limit  # จำนวนไฟล์สูงสุด (โหมด --batch --max-files)
+        self.exclude = set(exclude)  # ชื่อโฟลเดอร์ย่อยที่ไม่ใช่ shard (เช่น โฟลเดอร์ของแต่ละบัญชีในโหมด --accounts)
+
+    def __iter__(self):
+        count = 0
+        for filename in self.walk(self.directory, "", 0):
+            if self.limit is not None and count >= self.limit:
+                return
+            count += 1
+            yield filename
+
+    def walk(self, path, prefix, level):
+        """ไฟล์ในโฟลเดอร์นี้ก่อน แล้วจึงไล่โฟลเดอร์ย่อยตามลำดับชื่อ (วันที่เก่าก่อน)"""
+        shards = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_file():
+                    if os.path.splitext(entry.name)[1].lower() in config.ALLOWED_EXTENSIONS:
+                        yield prefix + entry.name
+                elif entry.is_dir() and level < config.SCAN_SHARD_DEPTH and entry.name not in self.exclude:
+                    shards.append(entry.name)
+
+        for name in sorted(shards):
+            yield from self.walk(os.path.join(path, name), f"{prefix}{name}/", level + 1)
+
+    def estimate_total(self):
+        """จำนวนไฟล์โดยประมาณ (นับไฟล์บางโฟลเดอร์ย่อยแล้วคูณจำนวนโฟลเดอร์ย่อย) - ใช้แสดงความคืบหน้า"""
+        try:
+            total = self.estimate(self.directory, 0)
+        except OSError:
+            return 0
+        return min(total, self.limit) if self.limit is not None else total
+
+    def estimate(self, path, level):
+        files = 0
+        shards = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_file():
+                    files += os.path.splitext(entry.name)[1].lower() in config.ALLOWED_EXTENSIONS
+                elif entry.is_dir() and level < config.SCAN_SHARD_DEPTH and entry.name not in self.exclude:
+                    shards.append(entry.path)
+        if not shards:
+            return files
+
+        # สุ่มนับแบบเว้นระยะเท่าๆ กัน (ไม่ต้องเปิดทุกโฟลเดอร์ย่อย)
+        samples = min(len(shards), config.SCAN_ESTIMATE_SAMPLES)
+        step = len(shards) / samples
+        counted = [self.estimate(shards[int(i * step)], level + 1) for i in range(samples)]
+        return files + round(sum(counted) / samples * len(shards))
+
+
+class BatchProgress:
+    """ความคืบหน้าและเวลาที่เหลือโดยประมาณของ batch (จำนวนทั้งหมดเป็นค่าประมาณจนกว่าจะสแกนโฟลเดอร์ครบ)"""
+
+    def __init__(self, estimated_total):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.estimated = estimated_total
+        self.discovered = 0
+        self.scan_complete = False
+        self.done = 0
+
+    def discover(self, count):
+        """อัปเดตจำนวนไฟล์ที่สแกนเจอแล้ว"""
+        with self.lock:
+            self.discovered = count
+            self.estimated = max(self.estimated, count)
+
+    def finish_scan(self):
+        with self.lock:
+            self.scan_complete = True
+            self.estimated = self.discovered
+
+    def total_label(self):
+        if self.scan_complete:
+            return f"{self.discovered:,}"
+        return f"~{self.estimated:,}"
+
+    def file_done(self, count=1):
+        """นับไฟล์ที่จบแล้ว - คืนข้อความความคืบหน้าทุก PROGRESS_LOG_EVERY ไฟล์ (ไม่เช่นนั้นคืน None)"""
+        with self.lock:
+            before = self.done
+            self.done += count
+            done = self.done
+            total = max(self.estimated, done)
+        if done // config.PROGRESS_LOG_EVERY == before // config.PROGRESS_LOG_EVERY:
+            return None
+
+        elapsed = time.time() - self.started
+        eta = timedelta(seconds=int(elapsed / done * (total - done)))
+        return f"📈 ความคืบหน้า {done:,}/{self.total_label()} ({done / total:.1%}) - เหลือประมาณ {eta}"
@@ -0,0 +1,111 @@
+import os
+import time
+import heapq
+import itertools
+import config
+from file_scanner import FileScanner
+
+
+class FileScheduler:
+    """
+    เรียงลำดับไฟล์ตาม SCHEDULE_ORDER (ไฟล์ด่วน, ไฟล์ที่เคยลองแล้ว, อายุไฟล์, ขนาดไฟล์)
+    อ่านล่วงหน้าไม่เกิน SCHEDULE_WINDOW ไฟล์ (0 = ทั้งโฟลเดอร์) แล้วส่งไฟล์ที่สำคัญที่สุดก่อน
+    เริ่มส่งไฟล์หลังอ่านชุดแรก (SCAN_CHUNK_SIZE ไฟล์) แล้วค่อยๆ อ่านเพิ่มจนเต็ม SCHEDULE_WINDOW ระหว่างทำงาน
+    ไฟล์ที่วางใน <โฟลเดอร์งาน>/<PRIORITY_FOLDER>/ ระหว่างทำงานแทรกคิวเป็นไฟล์ถัดไป
+    """
+
+    def __init__(self, source_directory, feature_type, journal, admit, log):
+        self.source_directory = str(source_directory)
+        self.feature_type = feature_type
+        self.journal = journal
+        self.admit = admit  # รับไฟล์ด่วนเข้า batch (นับ, journal, preflight) แล้วคืนไฟล์ที่ผ่าน
+        self.log = log
+        self.seen = set()
+        self.sequence = itertools.count()
+        self.last_poll = None
+        self.heap = []
+        self.keys = {
+            "priority": lambda filename, stat: 0 if self.is_urgent(filename) else 1,
+            "retry": lambda filename, stat: 0 if self.journal.attempt_count(self.feature_type, filename) else 1,
+            "age": lambda filename, stat: stat.st_mtime if stat else 0,
+            "size": lambda filename, stat: stat.st_size if stat else 0,
+        }
+
+    def is_urgent(self, filename):
+        return filename.startswith(config.PRIORITY_FOLDER + "/")
+
+    def skip_urgent(self, files):
+        """ตัดไฟล์ด่วนออกจากรายชื่อไฟล์ปกติ (ไฟล์ด่วนรับเข้าผ่าน poll_urgent)"""
+        return (filename for filename in files if not self.is_urgent(filename))
+
+    def sort_key(self, filename):
+        """คีย์สำหรับเรียง (น้อยก่อน) - คีย์ที่ขึ้นต้นด้วย "-" เรียงกลับด้าน"""
+        stat = None
+        if any(name.lstrip("-") in ("age", "size") for name in config.SCHEDULE_ORDER):
+            try:
+                stat = os.stat(os.path.join(self.source_directory, filename))
+            except OSError:
+                pass
+        key = []
+        for name in config.SCHEDULE_ORDER:
+            value = self.keys[name.lstrip("-")](filename, stat)
+            key.append(-value if name.startswith("-") else value)
+        return tuple(key)
+
+    def push(self, filename):
+        self.seen.add(filename)
+        heapq.heappush(self.heap, (self.sort_key(filename), next(self.sequence), filename))
+
+    def poll_urgent(self):
+        """หาไฟล์ด่วนที่เพิ่งวาง (ตรวจไม่ถี่กว่าทุก SCHEDULE_POLL_SECONDS วินาที) - คืนค่าจำนวนไฟล์ที่รับเข้าคิว"""
+        now = time.monotonic()
+        if self.last_poll is not None and now - self.last_poll < config.SCHEDULE_POLL_SECONDS:
+            return 0
+        first_poll = self.last_poll is None
+        self.last_poll = now
+
+        urgent_directory = os.path.join(self.source_directory, config.PRIORITY_FOLDER)
+        if not os.path.isdir(urgent_directory):
+            return 0
+        new_files = [
+            f"{config.PRIORITY_FOLDER}/{filename}" for filename in FileScanner(urgent_directory)
+            if f"{config.PRIORITY_FOLDER}/{filename}" not in self.seen
+        ]
+        if not new_files:
+            return 0
+        self.seen.update(new_files)
+        accepted = self.admit(new_files)
+        for filename in accepted:
+            self.push(filename)
+        if accepted:
+            when = "" if first_poll else " (แทรกคิวระหว่างทำงาน)"
+            self.log(f"⚡ ไฟล์ด่วนใน {config.PRIORITY_FOLDER}/ {len(accepted)} ไฟล์{when}")
+        return len(accepted)
+
+    def order(self, files):
+        """
+        ส่งไฟล์ตามลำดับความสำคัญ (files อ่านทีละไฟล์ได้ เช่น FileScanner)
+        อ่านเพิ่มไม่เกินสองไฟล์ต่อไฟล์ที่ส่งออก - หน้าต่างเต็มหลังส่งไปประมาณ SCHEDULE_WINDOW ไฟล์
+        (ไม่ต้องสแกน/ตรวจ/ค้น journal ล่วงหน้าทั้งหน้าต่างก่อนเริ่มไฟล์แรก)
+        """
+        upstream = iter(files)
+        exhausted = False
+        budget = config.SCAN_CHUNK_SIZE  # จำนวนไฟล์ที่อ่านได้ก่อนส่งไฟล์ถัดไป
+        while True:
+            self.poll_urgent()
+            while not exhausted and (
+                not config.SCHEDULE_WINDOW or
+                (len(self.heap) < config.SCHEDULE_WINDOW and (budget > 0 or not self.heap))
+            ):
+                try:
+                    filename = next(upstream)
+                except StopIteration:
+                    exhausted = True
+                    break
+                budget -= 1
+                if filename not in self.seen:
+                    self.push(filename)
+            if not self.heap:
+                return
+            yield heapq.heappop(self.heap)[2]
+            budget += 2
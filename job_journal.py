@@ -0,0 +1,213 @@
+import time
+import sqlite3
+import threading
+from path_utils import get_log_file_path
+
+# สถานะของงาน (หนึ่งแถวต่อไฟล์ต่อฟีเจอร์)
+JOB_PENDING = "pending"          # อยู่ในคิว ยังไม่เริ่ม
+JOB_IN_PROGRESS = "in_progress"  # กำลังดำเนินการ (ถ้าโปรแกรมหยุดกลางคัน จะค้างสถานะนี้)
+JOB_SUCCESS = "success"
+JOB_DUPLICATE = "duplicate"      # เว็บไซต์แจ้งว่าดำเนินการสำเร็จแล้ว
+JOB_SKIPPED = "skipped"          # ไม่เจอรายการ
+JOB_FAILED = "failed"
+
+UNFINISHED_STATES = (JOB_PENDING, JOB_IN_PROGRESS)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    feature TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    source_dir TEXT NOT NULL,
+    batch_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    queued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    duration REAL,
+    error_class TEXT,
+    error TEXT,
+    destination TEXT,
+    PRIMARY KEY (feature, filename)
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (feature, state);
+CREATE TABLE IF NOT EXISTS failed_retries (
+    feature TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    runs INTEGER NOT NULL DEFAULT 0,
+    last_retry_at REAL,
+    PRIMARY KEY (feature, filename)
+);
+"""
+
+
+class JobJournal:
+    """
+    บันทึกสถานะงานของทุกไฟล์ลง SQLite (logs แบบข้อความยังเขียนอยู่สำหรับให้ผู้ใช้อ่าน)
+    ทุกการเปลี่ยนสถานะเป็น transaction เดียว ถ้าโปรแกรมหยุดกลางคันจึงรู้ได้ทันทีว่าไฟล์ไหนยังไม่เสร็จ
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or get_log_file_path("journal.db")
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def execute(self, sql, params=()):
+        """รันคำสั่งใน transaction เดียว (ใช้ร่วมกันระหว่าง worker) แล้วคืนค่าทุกแถว"""
+        with self.lock:
+            with self.conn:
+                return self.conn.execute(sql, params).fetchall()
+
+    def enqueue(self, feature, files, source_directory, batch_id):
+        """ลงทะเบียนไฟล์ของ batch - ไฟล์ที่เคยอยู่ใน journal จะกลับเป็น pending (จำนวนครั้งที่ลองยังนับต่อ)"""
+        now = time.time()
+        with self.lock:
+            with self.conn:
+                self.conn.executemany(
+                    """
+                    INSERT INTO jobs (feature, filename, source_dir, batch_id, state, queued_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (feature, filename) DO UPDATE SET
+                        source_dir = excluded.source_dir,
+                        batch_id = excluded.batch_id,
+                        state = excluded.state,
+                        queued_at = excluded.queued_at,
+                        started_at = NULL, finished_at = NULL, duration = NULL,
+                        error_class = NULL, error = NULL, destination = NULL
+                    """,
+                    [(feature, filename, str(source_directory), batch_id, JOB_PENDING, now) for filename in files]
+                )
+
+    def mark_started(self, feature, filename):
+        self.execute(
+            "UPDATE jobs SET state = ?, attempts = attempts + 1, started_at = ? WHERE feature = ? AND filename = ?",
+            (JOB_IN_PROGRESS, time.time(), feature, filename)
+        )
+
+    def mark_finished(self, feature, filename, state, error_class=None, error=None, destination=None):
+        now = time.time()
+        self.execute(
+            """
+            UPDATE jobs SET state = ?, finished_at = ?, duration = ? - COALESCE(started_at, ?),
+                error_class = ?, error = ?, destination = ?
+            WHERE feature = ? AND filename = ?
+            """,
+            (state, now, now, now, error_class, error, destination, feature, filename)
+        )
+
+    def unfinished_files(self, feature):
+        """ไฟล์ที่ยังไม่เสร็จ (pending/in_progress) ของฟีเจอร์ เรียงตามลำดับที่เข้าคิว"""
+        placeholders = ",".join("?" * len(UNFINISHED_STATES))
+        rows = self.execute(
+            f"SELECT filename FROM jobs WHERE feature = ? AND state IN ({placeholders}) ORDER BY queued_at, rowid",
+            (feature, *UNFINISHED_STATES)
+        )
+        return [row["filename"] for row in rows]
+
+    def last_result(self, feature, filename):
+        """ผลล่าสุดของไฟล์ (state, error_class, finished_at) หรือ None ถ้าไม่เคยอยู่ใน journal"""
+        rows = self.execute(
+            "SELECT state, error_class, finished_at FROM jobs WHERE feature = ? AND filename = ?",
+            (feature, filename)
+        )
+        return rows[0] if rows else None
+
+    def attempt_count(self, feature, filename):
+        """จำนวนครั้งที่ไฟล์เคยถูกเริ่มทำ (รวมรอบการรันก่อนหน้า)"""
+        rows = self.execute(
+            "SELECT attempts FROM jobs WHERE feature = ? AND filename = ?",
+            (feature, filename)
+        )
+        return rows[0]["attempts"] if rows else 0
+
+    def retry_runs(self, feature, filename):
+        """จำนวนรอบที่ไฟล์ถูกดึงกลับจาก failed/ มาทำใหม่แล้ว"""
+        rows = self.execute(
+            "SELECT runs FROM failed_retries WHERE feature = ? AND filename = ?",
+            (feature, filename)
+        )
+        return rows[0]["runs"] if rows else 0
+
+    def mark_retried(self, feature, filename):
+        self.execute(
+            """
+            INSERT INTO failed_retries (feature, filename, runs, last_retry_at) VALUES (?, ?, 1, ?)
+            ON CONFLICT (feature, filename) DO UPDATE SET runs = runs + 1, last_retry_at = excluded.last_retry_at
+            """,
+            (feature, filename, time.time())
+        )
+
+    def report(self, feature=None, batch_id=None):
+        """สรุปจำนวนและเวลาเฉลี่ยตามสถานะ -> {state: {"count": n, "avg_duration": s}}"""
+        conditions, params = [], []
+        if feature:
+            conditions.append("feature = ?")
+            params.append(feature)
+        if batch_id:
+            conditions.append("batch_id = ?")
+            params.append(batch_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        rows = self.execute(
+            f"SELECT state, COUNT(*) AS count, AVG(duration) AS avg_duration FROM jobs {where} GROUP BY state",
+            params
+        )
+        return {row["state"]: {"count": row["count"], "avg_duration": row["avg_duration"] or 0.0} for row in rows}
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class AccountJournal:
+    """
+    journal ของบัญชีหนึ่งในโหมด --accounts - บันทึกไฟล์เป็น <user_id>/<ชื่อไฟล์> (ตรงกับโฟลเดอร์ files/<feature>/<user_id>/)
+    ไฟล์ชื่อเดียวกันของต่างบัญชีจึงไม่ทับกัน
+    """
+
+    def __init__(self, journal, account_id):
+        self.journal = journal
+        self.prefix = f"{account_id}/"
+
+    def __getattr__(self, name):
+        return getattr(self.journal, name)  # report, close, ...
+
+    def enqueue(self, feature, files, source_directory, batch_id):
+        self.journal.enqueue(feature, [self.prefix + filename for filename in files], source_directory, batch_id)
+
+    def mark_started(self, feature, filename):
+        self.journal.mark_started(feature, self.prefix + filename)
+
+    def mark_finished(self, feature, filename, *args, **kwargs):
+        self.journal.mark_finished(feature, self.prefix + filename, *args, **kwargs)
+
+    def unfinished_files(self, feature):
+        return [
+            filename[len(self.prefix):] for filename in self.journal.unfinished_files(feature)
+            if filename.startswith(self.prefix)
+        ]
+
+    def last_result(self, feature, filename):
+        return self.journal.last_result(feature, self.prefix + filename)
+
+    def attempt_count(self, feature, filename):
+        return self.journal.attempt_count(feature, self.prefix + filename)
+
+    def retry_runs(self, feature, filename):
+        return self.journal.retry_runs(feature, self.prefix + filename)
+
+    def mark_retried(self, feature, filename):
+        self.journal.mark_retried(feature, self.prefix + filename)
+
+
+if __name__ == "__main__":
+    journal = JobJournal()
+    for feature in ("disbursement", "sign-contract"):
+        print(f"📒 {feature}")
+        for state, stats in sorted(journal.report(feature).items()):
+            print(f"   {state:<12} {stats['count']:>6} ไฟล์  (เฉลี่ย {stats['avg_duration']:.1f} s)")
+    journal.close()
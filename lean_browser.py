@@ -0,0 +1,45 @@
+import config
+
+# ปิดงานของเบราว์เซอร์ที่ bot ไม่ได้ใช้ (bot อ่านแค่ DOM ของฟอร์มและตาราง)
+LEAN_CHROME_ARGUMENTS = [
+    "--blink-settings=imagesEnabled=false",
+    "--force-prefers-reduced-motion",   # เว็บที่รองรับจะข้าม animation
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-notifications",
+    "--mute-audio",
+    "--no-first-run",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication",
+]
+
+LEAN_CHROME_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.default_content_setting_values.geolocation": 2,
+}
+
+
+def add_lean_options(chrome_options):
+    """ตั้งค่า Chrome แบบ lean ก่อนเปิดเบราว์เซอร์ (ไม่ทำอะไรถ้าปิด LEAN_BROWSER_ENABLED)"""
+    if not config.LEAN_BROWSER_ENABLED:
+        return
+    for argument in LEAN_CHROME_ARGUMENTS:
+        chrome_options.add_argument(argument)
+    chrome_options.add_experimental_option("prefs", LEAN_CHROME_PREFS)
+
+
+def enable_request_blocking(driver):
+    """
+    บล็อก request ที่ตรงกับ config.LEAN_BLOCKED_URL_PATTERNS ผ่าน DevTools protocol
+    คืนค่า False ถ้าเบราว์เซอร์ไม่รองรับ CDP (ยังใช้งานได้ตามปกติ แค่ไม่บล็อก)
+    """
+    if not config.LEAN_BROWSER_ENABLED or not config.LEAN_BLOCKED_URL_PATTERNS:
+        return False
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(config.LEAN_BLOCKED_URL_PATTERNS)})
+        return True
+    except Exception:
+        return False
@@ -0,0 +1,123 @@
+import os
+import time
+import queue
+import atexit
+import signal
+import logging
+import logging.handlers
+import config
+from path_utils import get_log_file_path
+
+APP_LOGGER = "dsl_autofill"  # logger ของโปรแกรม - เปิด DEBUG เฉพาะตัวนี้
+# DEBUG ของ Selenium/urllib3 เขียน body ของทุก WebDriver request (รวมรหัสผ่านที่ send_keys ตอน login) - ไม่เปิดเด็ดขาด
+QUIET_LOGGERS = ["selenium", "urllib3"]
+
+_active = None  # pipeline ที่ทำงานอยู่ (สร้างใหม่เมื่อไรให้ปิดตัวเก่าก่อน)
+
+
+class SummaryFilter(logging.Filter):
+    """โหมด compact: แสดงบนหน้าจอเฉพาะคำเตือน/ข้อผิดพลาด และข้อความสรุป (ความคืบหน้า, สรุปผล batch)"""
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or getattr(record, "summary", False)
+
+
+class LogPipeline:
+    """
+    ส่ง log ผ่านคิวไปให้ thread เบื้องหลังเขียนลงไฟล์และหน้าจอ (worker ไม่ต้องรอเขียนไฟล์)
+    ไฟล์ log หมุนเวียนตามขนาด (LOG_MAX_BYTES) หรือตามเวลา (LOG_ROTATE_WHEN) แทนการเขียนทับทุกครั้ง
+    รายละเอียดแต่ละขั้นตอน (DEBUG) ปิดไว้โดยค่าเริ่มต้น - เปิด/ปิดระหว่างทำงานได้ด้วยไฟล์ LOG_DEBUG_FLAG_FILE
+    หรือส่งสัญญาณ SIGUSR1 (Linux/macOS)
+    """
+
+    def __init__(self):
+        global _active
+        if _active is not None:
+            _active.stop()  # เช่น benchmark สร้าง bot หลายรอบ - ไม่ให้ listener และไฟล์ log ค้าง
+        _active = self
+
+        self.log_queue = queue.SimpleQueue()
+        self.root = logging.getLogger("")
+        self.logger = logging.getLogger(APP_LOGGER)
+        self.flag_path = get_log_file_path(config.LOG_DEBUG_FLAG_FILE)
+        self.flag_checked = float("-inf")
+        self.flag_debug = False
+        self.signal_debug = False
+        self.debug = None
+
+        file_handler = self.create_file_handler(get_log_file_path(config.LOG_FILE))
+        file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        console = logging.StreamHandler()
+        console.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
+        if config.LOG_COMPACT:
+            console.addFilter(SummaryFilter())
+
+        # logger หลักใส่ข้อความลงคิวอย่างเดียว - การจัดรูปแบบและเขียนไฟล์ทำใน listener
+        for handler in list(self.root.handlers):
+            self.root.removeHandler(handler)
+        self.queue_handler = logging.handlers.QueueHandler(self.log_queue)
+        self.root.addHandler(self.queue_handler)
+        self.root.setLevel(logging.INFO)
+        for name in QUIET_LOGGERS:
+            logger = logging.getLogger(name)
+            logger.setLevel(max(logger.getEffectiveLevel(), logging.INFO))
+        self.listener = logging.handlers.QueueListener(
+            self.log_queue, file_handler, console, respect_handler_level=True
+        )
+        self.listener.start()
+        atexit.register(self.stop)
+
+        self.apply_level()
+        if hasattr(signal, "SIGUSR1"):
+            try:
+                signal.signal(signal.SIGUSR1, self.toggle_debug)
+            except ValueError:
+                pass  # ลงทะเบียนสัญญาณได้เฉพาะใน main thread
+
+    def create_file_handler(self, path):
+        if config.LOG_ROTATE_WHEN:
+            return logging.handlers.TimedRotatingFileHandler(
+                str(path), when=config.LOG_ROTATE_WHEN, backupCount=config.LOG_BACKUP_COUNT, encoding='utf-8'
+            )
+        return logging.handlers.RotatingFileHandler(
+            str(path), maxBytes=config.LOG_MAX_BYTES, backupCount=config.LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+
+    def debug_enabled(self):
+        """เปิดรายละเอียดแต่ละขั้นตอนอยู่หรือไม่ (ตรวจไฟล์ flag ไม่ถี่กว่าทุก LOG_DEBUG_POLL_SECONDS วินาที)"""
+        now = time.monotonic()
+        if now - self.flag_checked >= config.LOG_DEBUG_POLL_SECONDS:
+            self.flag_checked = now
+            self.flag_debug = os.path.exists(self.flag_path)
+            self.apply_level()
+        return self.debug
+
+    def toggle_debug(self, signum=None, frame=None):
+        # ไม่เขียน log ใน signal handler - ค่าใหม่มีผลเมื่อตรวจ debug_enabled ครั้งถัดไป
+        self.signal_debug = not self.signal_debug
+        self.flag_checked = float("-inf")
+
+    def apply_level(self):
+        debug = config.LOG_DEBUG or self.flag_debug or self.signal_debug
+        if debug == self.debug:
+            return
+        changed = self.debug is not None
+        self.debug = debug
+        self.logger.setLevel(logging.DEBUG if debug else logging.INFO)
+        if changed:
+            state = "เปิด" if debug else "ปิด"
+            self.logger.info(f"🔬 {state}รายละเอียดแต่ละขั้นตอน (DEBUG log)")
+
+    def stop(self):
+        """เขียน log ที่ค้างในคิวให้หมด แล้วปิดไฟล์ log (ก่อนปิดโปรแกรม หรือก่อนสร้าง pipeline ใหม่)"""
+        global _active
+        if self.listener is None:
+            return
+        self.root.removeHandler(self.queue_handler)
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+        self.listener = None
+        atexit.unregister(self.stop)
+        if _active is self:
+            _active = None
@@ -1,8 +1,14 @@
 import os
+import sys
+import json
 import time
-import logging
 import shutil
+import argparse
+import threading
+import itertools
+import weakref
 from pathlib import Path
+from contextlib import contextmanager
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -10,10 +16,34 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException, WebDriverException
 import config
 from user_manager import UserManager
+from worker_pool import BrowserWorkerPool
+from tab_pipeline import TabPipeline
+from watch_daemon import WatchDaemon
+from multi_account import MultiAccountRunner
+from wait_engine import WaitEngine
+from selector_registry import SelectorStats
+from session_cache import SessionCache
+from driver_cache import DriverCache
+from browser_lifecycle import BrowserLifecycle
+from lean_browser import add_lean_options, enable_request_blocking
+from step_tracer import StepTracer
+from command_tracer import CommandTracer, Profiler
+from log_pipeline import LogPipeline
+from metrics_server import Metrics, MetricsServer, browser_memory, psutil
+from job_journal import JobJournal, AccountJournal, JOB_PENDING, JOB_SUCCESS, JOB_DUPLICATE, JOB_SKIPPED, JOB_FAILED
+from file_outcome import (
+    FileOutcome, OUTCOME_SUCCESS, OUTCOME_DUPLICATE, OUTCOME_NOT_FOUND, OUTCOME_TRANSIENT, OUTCOME_PERMANENT,
+    OUTCOME_REJECTED, OUTCOME_LOGIN_FAILED
+)
+from retry_queue import RetryQueue
+from preflight import run_preflight
+from file_scanner import FileScanner, BatchProgress
+from file_scheduler import FileScheduler
+from failed_retry import FailedRetry
+from result_index import ResultIndex, ROW_NEEDS_CONSENT, ROW_NEEDS_IMPORT, ROW_DONE, ROW_MISSING
 from path_utils import (
     get_app_directory, 
     get_files_directory, 
@@ -23,19 +53,93 @@ from path_utils import (
     ensure_directories_exist
 )
 
+# ติ๊ก checkbox ทุกตัวของหน้า consent ในครั้งเดียว แล้วคืนสถานะ checked (null = หน้ายังโหลดไม่ครบ)
+# arguments[0] = [selectors กรณี 2 checkbox, selectors กรณี 3 checkbox] - แต่ละตัวเป็นลำดับ selector จาก SelectorRegistry.candidates
+CONSENT_CHECKBOX_SCRIPT = """
+function find(candidates) {
+    for (var i = 0; i < candidates.length; i++) {
+        var element = document.querySelector(candidates[i]);
+        if (element) { return element; }
+    }
+    return null;
+}
+var layouts = arguments[0];
+var layout = find(layouts[1].address2) ? layouts[1] : layouts[0];
+var keys = layout.address2 ? ['address1', 'address2', 'contract'] : ['address1', 'contract'];
+var boxes = keys.map(function(key) { return find(layout[key]); });
+if (boxes.some(function(box) { return !box; })) { return null; }
+boxes.forEach(function(box) { if (!box.checked) { box.click(); } });
+return {checked: boxes.map(function(box) { return box.checked; })};
+"""
+
 def clear_screen():
     """ล้างหน้าจอแบบ Cross-Platform"""
     os.system('cls' if os.name == 'nt' else 'clear')
 
 class DSLAutoFillBot:
-    def __init__(self):
+    def __init__(self, parent=None, worker_id=None, resume=False, account_id=None):
         self.driver = None
-        self.user_manager = UserManager()
-        self.setup_logging()
-        self.setup_result_logs()
-        self.setup_directories()
+        self.worker_id = worker_id
+        # บัญชีที่ใช้ login (None = ผู้ใช้ปัจจุบันใน UserManager) - worker ที่แตกออกมาใช้บัญชีเดียวกัน
+        self.account_id = account_id or (parent.account_id if parent else None)
+        # โหมด --accounts: ไฟล์ของบัญชีอยู่ใน <feature>/<user_id>/ - completed/, failed/ และ journal แยกโฟลเดอร์ตามบัญชีเหมือนกัน
+        self.account_folder = account_id if parent and account_id else (parent.account_folder if parent else None)
+        self.resume = resume  # True = ทำต่อจากไฟล์ที่ค้างใน journal (ครั้งแรกที่เลือกฟีเจอร์)
+        self.deadline = None  # เวลาที่ต้องหยุดเริ่มไฟล์ใหม่ (โหมด --batch --max-minutes)
+        # login ไม่สำเร็จ - หยุด batch (ใช้ร่วมกับ worker ของบัญชีเดียวกัน แต่ละบัญชีในโหมด --accounts แยกกัน)
+        self.login_failed = parent.login_failed if parent and not account_id else threading.Event()
+        self.progress = parent.progress if parent else None  # ความคืบหน้าของ batch (ใช้ร่วมกับ worker)
+        self.root = parent.root if parent else self
+        self.step_stack = []  # ขั้นตอนที่กำลังทำ (ซ้อนกันได้ เช่น file_total > search)
+        self.command_stats = None  # WebDriver command ของไฟล์ที่กำลังทำ (โหมด COMMAND_TRACE_ENABLED)
+        if parent is None:
+            self.bots = weakref.WeakSet()  # bot ทุกตัว (รวม worker) - นับเบราว์เซอร์ที่เปิดอยู่สำหรับ metrics
+            self.pools = weakref.WeakSet()  # worker pool ที่กำลังทำงาน - อ่านจำนวนไฟล์ในคิว
+        self.root.bots.add(self)
+        self.session_cache = SessionCache()
+        self.driver_cache = DriverCache()
+        self.browser = BrowserLifecycle(self)
+        
+        if parent is None:
+            self.user_manager = UserManager()
+            self.result_lock = threading.Lock()
+            self.tracer = StepTracer()
+            self.command_tracer = CommandTracer(self.tracer.session_id) if config.COMMAND_TRACE_ENABLED else None
+            self.selector_stats = SelectorStats()
+            self.retry_queue = RetryQueue()
+            self.result_indexes = {}
+            self.result_index_lock = threading.Lock()
+            self.setup_logging()
+            self.setup_result_logs()
+            self.setup_journal()
+            self.setup_directories()
+            self.setup_metrics()
+        else:
+            # Worker ใช้ logger, ไฟล์ log และโฟลเดอร์ร่วมกับ bot หลัก
+            self.user_manager = parent.user_manager
+            self.result_lock = parent.result_lock
+            self.tracer = parent.tracer
+            self.command_tracer = parent.command_tracer
+            self.selector_stats = parent.selector_stats
+            self.retry_queue = parent.retry_queue
+            self.journal = AccountJournal(parent.journal, account_id) if account_id else parent.journal
+            self.logger = parent.logger
+            self.log_pipeline = parent.log_pipeline
+            self.metrics = parent.metrics
+            self.success_log_file = parent.success_log_file
+            self.failed_log_file = parent.failed_log_file
+            self.completed_dir = parent.completed_dir
+            self.failed_dir = parent.failed_dir
+            self.completed_disbursement_dir = parent.completed_disbursement_dir
+            self.completed_sign_contract_dir = parent.completed_sign_contract_dir
+            self.failed_disbursement_dir = parent.failed_disbursement_dir
+            self.failed_sign_contract_dir = parent.failed_sign_contract_dir
         # ไม่เปิดเบราว์เซอร์ในขั้นตอนนี้ รอให้เลือกฟีเจอร์ก่อน
     
+    def spawn_worker(self, worker_id, account_id=None):
+        """สร้าง bot สำหรับ worker ที่มีเบราว์เซอร์ของตัวเอง"""
+        return DSLAutoFillBot(parent=self, worker_id=worker_id, account_id=account_id)
+    
     def setup_result_logs(self):
         """ตั้งค่าไฟล์ log สำหรับผลลัพธ์"""
         self.success_log_file = get_log_file_path("success.log")
@@ -49,6 +153,51 @@ class DSLAutoFillBot:
         with open(str(self.failed_log_file), 'a', encoding='utf-8') as f:
             f.write(session_start)
     
+    def setup_journal(self):
+        """เปิด journal สถานะงานของทุกไฟล์ (journal.db)"""
+        self.journal = JobJournal()
+    
+    def setup_metrics(self):
+        """เปิด endpoint metrics (รูปแบบ Prometheus) สำหรับดูความคืบหน้าระหว่างทำงาน"""
+        self.metrics = None
+        if not config.METRICS_ENABLED:
+            return
+        metrics = Metrics()
+        try:
+            self.metrics_server = MetricsServer(metrics, config.METRICS_HOST, config.METRICS_PORT)
+        except OSError as e:
+            self.log_warning(f"⚠️  เปิด metrics ที่พอร์ต {config.METRICS_PORT} ไม่สำเร็จ: {str(e)} - ทำงานต่อโดยไม่มี metrics")
+            return
+        metrics.add_collector(self.collect_live_metrics)
+        self.metrics = metrics
+        self.tracer.metrics = metrics
+        self.log(f"📊 Metrics: {self.metrics_server.url}")
+    
+    def collect_live_metrics(self):
+        """ค่าที่อ่านสดทุกครั้งที่ถูกเรียกดู: เบราว์เซอร์, หน่วยความจำ, คิว, ไฟล์ที่เหลือ"""
+        drivers = list({id(bot.driver): bot.driver for bot in list(self.bots) if bot.driver is not None}.values())
+        samples = [("dsl_browsers_open", None, len(drivers))]
+        if psutil is not None:
+            samples.append(("dsl_browser_memory_bytes", None, browser_memory(drivers)))
+        samples.append(("dsl_queue_depth", {"queue": "workers"}, sum(pool.file_queue.qsize() for pool in list(self.pools))))
+        samples.append(("dsl_queue_depth", {"queue": "retry"}, self.retry_queue.pending_count()))
+        # โหมด --accounts แต่ละบัญชีมีความคืบหน้าของตัวเอง (bot หลักไม่มี) - รวมทุกบัญชี
+        progresses = {id(bot.progress): bot.progress for bot in list(self.bots) if bot.progress is not None}
+        if progresses:
+            remaining = 0
+            for progress in progresses.values():
+                with progress.lock:
+                    remaining += max(0, max(progress.estimated, progress.discovered) - progress.done)
+            samples.append(("dsl_batch_remaining_files", None, remaining))
+        return samples
+    
+    def count_file(self, result, feature_type=None):
+        """นับไฟล์ที่จบแล้วใน metrics (แยกตามฟีเจอร์, บัญชี และผลลัพธ์)"""
+        if self.metrics:
+            account = self.account_id or self.user_manager.get_current_user_id() or ""
+            feature_type = feature_type or self.current_feature
+            self.metrics.inc("dsl_files_total", {"feature": feature_type, "account": account, "result": result})
+    
     def setup_directories(self):
         """สร้างโฟลเดอร์สำหรับเก็บไฟล์ที่ประมวลผลแล้ว"""
         # ใช้ path_utils เพื่อรองรับ executable
@@ -71,37 +220,41 @@ class DSLAutoFillBot:
         """บันทึกไฟล์ที่สำเร็จ"""
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         log_entry = f"{filename} {current_time}\n"
-        with open(str(self.success_log_file), 'a', encoding='utf-8') as f:
-            f.write(log_entry)
+        with self.result_lock:
+            with open(str(self.success_log_file), 'a', encoding='utf-8') as f:
+                f.write(log_entry)
     
-    def log_failed(self, filename):
+    def log_failed(self, filename, reason=None):
         """บันทึกไฟล์ที่ล้มเหลว"""
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"{filename} {current_time}\n"
-        with open(str(self.failed_log_file), 'a', encoding='utf-8') as f:
-            f.write(log_entry)
+        log_entry = f"{filename} {current_time} - {reason}\n" if reason else f"{filename} {current_time}\n"
+        with self.result_lock:
+            with open(str(self.failed_log_file), 'a', encoding='utf-8') as f:
+                f.write(log_entry)
     
     def log_duplicate_action(self, filename):
         """บันทึกไฟล์ที่เป็น duplicate action (ทำสำเร็จแล้ว)"""
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         log_entry = f"{filename} {current_time} - DUPLICATE_ACTION\n"
+        self.current_duplicate = True
         
         # สร้างไฟล์ duplicate.log ถ้ายังไม่มี
         duplicate_log_file = get_log_file_path("duplicate.log")
         
-        # เพิ่มตัวคั่น session ถ้าเป็นครั้งแรกของ session
-        if not hasattr(self, '_duplicate_session_started'):
-            session_start = f"==================== SESSION START: {current_time} ====================\n"
+        with self.result_lock:
+            # เพิ่มตัวคั่น session ถ้าเป็นครั้งแรกของ session (นับรวมทุก worker)
+            if not hasattr(self.root, '_duplicate_session_started'):
+                session_start = f"==================== SESSION START: {current_time} ====================\n"
+                with open(str(duplicate_log_file), 'a', encoding='utf-8') as f:
+                    f.write(session_start)
+                self.root._duplicate_session_started = True
+            
+            # บันทึก entry
             with open(str(duplicate_log_file), 'a', encoding='utf-8') as f:
-                f.write(session_start)
-            self._duplicate_session_started = True
-        
-        # บันทึก entry
-        with open(str(duplicate_log_file), 'a', encoding='utf-8') as f:
-            f.write(log_entry)
+                f.write(log_entry)
     
     def move_file_to_completed(self, filename, source_directory):
-        """ย้ายไฟล์ที่สำเร็จไปโฟลเดอร์ completed"""
+        """ย้ายไฟล์ที่สำเร็จไปโฟลเดอร์ completed (คืนค่า path ปลายทาง หรือ False)"""
         try:
             source_path = os.path.join(str(source_directory), filename)
             
@@ -116,6 +269,9 @@ class DSLAutoFillBot:
                 # fallback สำหรับ backward compatibility
                 dest_dir = self.completed_dir
                 feature_name = "general"
+            if self.account_folder:
+                dest_dir = dest_dir / self.account_folder
+                feature_name = f"{feature_name}/{self.account_folder}"
             
             dest_path = os.path.join(str(dest_dir), filename)
             
@@ -126,16 +282,17 @@ class DSLAutoFillBot:
                 name, ext = os.path.splitext(filename)
                 dest_path = os.path.join(str(dest_dir), f"{name}{timestamp}{ext}")
             
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)  # ไฟล์จากโฟลเดอร์ย่อย (shard)
             shutil.move(source_path, dest_path)
             self.log(f"📦 ย้ายไฟล์ '{filename}' ไป completed/{feature_name}/ สำเร็จ")
-            return True
+            return dest_path
             
         except Exception as e:
             self.log_error(f"❌ ไม่สามารถย้ายไฟล์ '{filename}' ไป completed/: {str(e)}")
             return False
     
     def move_file_to_failed(self, filename, source_directory):
-        """ย้ายไฟล์ที่ล้มเหลวไปโฟลเดอร์ failed"""
+        """ย้ายไฟล์ที่ล้มเหลวไปโฟลเดอร์ failed (คืนค่า path ปลายทาง หรือ False)"""
         try:
             source_path = os.path.join(str(source_directory), filename)
             
@@ -150,6 +307,9 @@ class DSLAutoFillBot:
                 # fallback สำหรับ backward compatibility
                 dest_dir = self.failed_dir
                 feature_name = "general"
+            if self.account_folder:
+                dest_dir = dest_dir / self.account_folder
+                feature_name = f"{feature_name}/{self.account_folder}"
             
             dest_path = os.path.join(str(dest_dir), filename)
             
@@ -160,9 +320,10 @@ class DSLAutoFillBot:
                 name, ext = os.path.splitext(filename)
                 dest_path = os.path.join(str(dest_dir), f"{name}{timestamp}{ext}")
             
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)  # ไฟล์จากโฟลเดอร์ย่อย (shard)
             shutil.move(source_path, dest_path)
             self.log(f"📦 ย้ายไฟล์ '{filename}' ไป failed/{feature_name}/ สำเร็จ")
-            return True
+            return dest_path
             
         except Exception as e:
             self.log_error(f"❌ ไม่สามารถย้ายไฟล์ '{filename}' ไป failed/: {str(e)}")
@@ -170,37 +331,54 @@ class DSLAutoFillBot:
     
     def setup_logging(self):
         if config.LOG_ENABLED:
-            log_file_path = get_log_file_path(config.LOG_FILE)
-            logging.basicConfig(
-                filename=str(log_file_path),
-                level=logging.INFO,
-                format='%(asctime)s - %(levelname)s - %(message)s',
-                filemode='w'
-            )
-            # เพิ่ม console handler เพื่อแสดงผลใน terminal ด้วย
-            console = logging.StreamHandler()
-            console.setLevel(logging.INFO)
-            formatter = logging.Formatter('[%(levelname)s] %(message)s')
-            console.setFormatter(formatter)
-            logging.getLogger('').addHandler(console)
-            
-            self.logger = logging.getLogger(__name__)
+            # เขียนไฟล์ log และหน้าจอใน thread เบื้องหลัง (ไฟล์ log หมุนเวียนตามขนาด/เวลา)
+            self.log_pipeline = LogPipeline()
+            self.logger = self.log_pipeline.logger
         else:
+            self.log_pipeline = None
             self.logger = None
     
+    def format_message(self, message):
+        """เติมบัญชี/หมายเลข worker หน้าข้อความ (เฉพาะโหมด worker pool และหลายบัญชี)"""
+        if self.account_id is not None:
+            return f"[{self.account_id}] {message}"
+        if self.worker_id is not None:
+            return f"[W{self.worker_id}] {message}"
+        return message
+    
     def log(self, message):
+        message = self.format_message(message)
         if self.logger:
             self.logger.info(message)
         else:
             print(f"[INFO] {message}")
     
+    def log_debug(self, message):
+        """รายละเอียดแต่ละขั้นตอน (คลิก, กรอกข้อมูล, รอหน้าเว็บ) - บันทึกเฉพาะเมื่อเปิด DEBUG log"""
+        if self.log_pipeline:
+            if self.log_pipeline.debug_enabled():
+                self.logger.debug(self.format_message(message))
+        elif config.LOG_DEBUG:
+            print(f"[DEBUG] {self.format_message(message)}")
+    
+    def log_summary(self, message):
+        """ข้อความสรุป (ความคืบหน้า, สรุปผล batch) - แสดงบนหน้าจอแม้ในโหมด LOG_COMPACT"""
+        message = self.format_message(message)
+        if self.logger:
+            self.logger.info(message, extra={"summary": True})
+        else:
+            print(f"[INFO] {message}")
+    
     def log_warning(self, message):
+        message = self.format_message(message)
         if self.logger:
             self.logger.warning(message)
         else:
             print(f"[WARNING] {message}")
     
     def log_error(self, message):
+        self.last_error = message  # เก็บไว้บันทึกใน journal
+        message = self.format_message(message)
         if self.logger:
             self.logger.error(message)
         else:
@@ -208,8 +386,8 @@ class DSLAutoFillBot:
     
     def setup_driver(self):
         try:
-            # ตรวจสอบว่าจะใช้เบราว์เซอร์ที่เปิดอยู่แล้วหรือไม่
-            if config.USE_EXISTING_BROWSER:
+            # ตรวจสอบว่าจะใช้เบราว์เซอร์ที่เปิดอยู่แล้วหรือไม่ (worker ต้องเปิดเบราว์เซอร์ของตัวเองเสมอ)
+            if config.USE_EXISTING_BROWSER and self.worker_id is None:
                 return self.connect_to_existing_browser()
             else:
                 return self.create_new_browser()
@@ -238,6 +416,8 @@ class DSLAutoFillBot:
                 
                 self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
                 self.wait = WebDriverWait(self.driver, config.ELEMENT_WAIT_TIMEOUT)
+                self.wait_engine = WaitEngine(self.driver, self.selector_stats)
+                self.install_command_tracer()
                 
                 return True
                 
@@ -267,61 +447,44 @@ class DSLAutoFillBot:
             chrome_options.add_argument("--disable-gpu")
             chrome_options.add_argument("--disable-web-security")
             chrome_options.add_argument("--allow-running-insecure-content")
-            chrome_options.add_argument("--remote-debugging-port=9222")
+            # ไม่กำหนดพอร์ต debug ตายตัว - ให้ Chrome เลือกพอร์ตว่างเอง (ChromeDriver อ่านพอร์ตจริงให้)
+            # ไม่ชนกันเมื่อเปิดหลายเบราว์เซอร์พร้อมกัน (worker pool, หลายบัญชี) - CHROME_DEBUG_PORT ใช้เฉพาะ USE_EXISTING_BROWSER
+            chrome_options.add_argument("--remote-debugging-port=0")
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
             chrome_options.add_experimental_option('useAutomationExtension', False)
+            add_lean_options(chrome_options)  # ไม่โหลดรูปภาพและ animation (LEAN_BROWSER_ENABLED)
+            if config.TAB_PIPELINE_TABS > 1:
+                # แท็บที่ไม่ได้แสดงอยู่ต้องทำงานเต็มความเร็ว (Chrome หน่วง timer ของแท็บเบื้องหลัง)
+                chrome_options.add_argument("--disable-background-timer-throttling")
+                chrome_options.add_argument("--disable-renderer-backgrounding")
+                chrome_options.add_argument("--disable-backgrounding-occluded-windows")
             
             # รองรับ Cross-Platform (Mac ARM, Mac Intel, Windows, Linux)
             import platform
-            system = platform.system()
-            processor = platform.processor()
-            
-            self.log(f"🖥️  ระบบ: {system} ({processor})")
+            self.log(f"🖥️  ระบบ: {platform.system()} ({platform.processor()})")
             
+            # ตำแหน่ง ChromeDriver ที่จำไว้ในไฟล์ (หาครั้งแรกครั้งเดียว ไม่ต้องต่ออินเทอร์เน็ตทุกครั้ง)
+            driver_path = self.driver_cache.resolve(self.log)
             try:
-                if system == "Darwin" and processor == "arm":
-                    # Mac ARM (M1/M2/M3)
-                    try:
-                        service = Service()  # ใช้ ChromeDriver ที่ติดตั้งผ่าน Homebrew
-                        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                        self.log("✅ ใช้ ChromeDriver จาก Homebrew (Mac ARM)")
-                    except:
-                        service = Service(ChromeDriverManager().install())
-                        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                        self.log("✅ ใช้ ChromeDriver จาก WebDriver Manager (Mac ARM)")
-                
-                elif system == "Darwin":
-                    # Mac Intel
-                    service = Service(ChromeDriverManager().install())
-                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                    self.log("✅ ใช้ ChromeDriver สำหรับ Mac Intel")
-                
-                elif system == "Windows":
-                    # Windows (Intel/AMD)
-                    service = Service(ChromeDriverManager().install())
-                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                    self.log("✅ ใช้ ChromeDriver สำหรับ Windows")
-                
-                else:
-                    # Linux และอื่นๆ
-                    service = Service(ChromeDriverManager().install())
-                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                    self.log(f"✅ ใช้ ChromeDriver สำหรับ {system}")
-                    
-            except Exception as driver_error:
-                # Fallback: ลองใช้ ChromeDriver ที่อยู่ใน PATH
-                self.log_warning(f"⚠️  WebDriver Manager ล้มเหลว: {str(driver_error)}")
-                self.log("🔄 ลองใช้ ChromeDriver จาก PATH...")
-                try:
-                    service = Service()  # ใช้ ChromeDriver ที่อยู่ใน PATH
-                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                    self.log("✅ ใช้ ChromeDriver จาก PATH สำเร็จ")
-                except Exception as fallback_error:
-                    self.log_error(f"❌ ไม่สามารถใช้ ChromeDriver จาก PATH: {str(fallback_error)}")
-                    raise driver_error  # แสดง error เดิม
+                self.driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+            except WebDriverException as driver_error:
+                if driver_path is None:
+                    raise
+                # ChromeDriver ที่จำไว้ (หรือใน PATH) อาจไม่ตรงกับ Chrome ที่อัปเดตแล้ว - ให้ Selenium Manager หาใหม่
+                self.log_warning(f"⚠️  ChromeDriver ที่จำไว้ใช้ไม่ได้: {str(driver_error).splitlines()[0]}")
+                driver_path = self.driver_cache.resolve(self.log, failed_path=driver_path)
+                self.driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+            if driver_path is None:
+                # จำตัวที่ Selenium Manager หาให้ (ครั้งถัดไปไม่ต้องหาใหม่และไม่กลับไปใช้ตัวใน PATH ที่ใช้ไม่ได้)
+                self.driver_cache.remember(getattr(self.driver.service, "path", None), "selenium-manager", self.log)
+            self.log(f"✅ ใช้ ChromeDriver: {driver_path or 'Selenium Manager'}")
+            if enable_request_blocking(self.driver):
+                self.log(f"🪶 เบราว์เซอร์แบบ lean: บล็อก {len(config.LEAN_BLOCKED_URL_PATTERNS)} รูปแบบ URL")
             
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             self.wait = WebDriverWait(self.driver, config.ELEMENT_WAIT_TIMEOUT)
+            self.wait_engine = WaitEngine(self.driver, self.selector_stats)
+            self.install_command_tracer()
             self.log("✅ สร้างเบราว์เซอร์ใหม่สำเร็จ")
             
             return True
@@ -330,21 +493,19 @@ class DSLAutoFillBot:
             self.log_error(f"❌ ไม่สามารถสร้างเบราว์เซอร์ใหม่ได้: {str(e)}")
             raise
     
+    def scan_files(self, directory_path):
+        """ตัวอ่านไฟล์ในโฟลเดอร์แบบทีละไฟล์ (รวมโฟลเดอร์ย่อย) - เริ่มทำงานได้ก่อนสแกนครบ"""
+        directory_path = Path(directory_path)
+        if not directory_path.exists():
+            directory_path.mkdir(parents=True, exist_ok=True)
+            self.log(f"สร้างโฟลเดอร์ {directory_path}")
+        # โฟลเดอร์ย่อยที่ตั้งชื่อตามบัญชีเป็นของโหมด --accounts ไม่ใช่ shard
+        return FileScanner(directory_path, exclude=self.user_manager.data.get("users", {}))
+    
     def get_files_list(self, directory_path):
         try:
-            directory_path = Path(directory_path)
-            if not directory_path.exists():
-                directory_path.mkdir(parents=True, exist_ok=True)
-                self.log(f"สร้างโฟลเดอร์ {directory_path}")
-            
-            files = []
-            for file_path in directory_path.iterdir():
-                if file_path.is_file():
-                    file_ext = file_path.suffix.lower()
-                    if file_ext in config.ALLOWED_EXTENSIONS:
-                        files.append(file_path.name)
-            
-            self.log(f"พบไฟล์ {len(files)} ไฟล์ในโฟลเดอร์ {directory_path.name}")
+            files = list(self.scan_files(directory_path))
+            self.log(f"พบไฟล์ {len(files)} ไฟล์ในโฟลเดอร์ {Path(directory_path).name}")
             return files
             
         except Exception as e:
@@ -357,32 +518,35 @@ class DSLAutoFillBot:
     def wait_for_overlay_disappear(self, timeout=10):
         """รอให้ loading overlay หายไป"""
         try:
-            # รอให้ loading overlay หายไป
-            overlay_selectors = [
-                ".ngx-spinner-overlay",
-                "[class*='spinner-overlay']",
-                "[class*='loading-overlay']"
-            ]
+            if not self.wait_engine.legacy_mode:
+                # ตรวจ request ค้าง, Angular และ overlay ทั้งหมดด้วยการเรียกครั้งเดียวต่อรอบ
+                readiness = self.wait_engine.readiness
+                if not readiness.wait_until_idle(timeout):
+                    self.log_warning(f"⚠️  หน้าเว็บยังไม่ว่างหลังรอ {timeout} วินาที ({readiness.busy_reason}) - ดำเนินการต่อ")
+                return True
             
-            for selector in overlay_selectors:
+            # รอให้ loading overlay หายไป
+            for selector in config.LOADING_OVERLAY_SELECTORS:
                 try:
                     WebDriverWait(self.driver, timeout).until(
                         EC.invisibility_of_element_located((By.CSS_SELECTOR, selector))
                     )
-                    self.log(f"⏳ รอ loading overlay หายไป ({selector})")
+                    self.log_debug(f"⏳ รอ loading overlay หายไป ({selector})")
                     break
                 except TimeoutException:
                     continue
             
             # รอเพิ่มอีกนิด เพื่อให้แน่ใจ
-            time.sleep(0.5)
+            self.wait_engine.pause(0.5)
             return True
             
         except Exception as e:
             self.log_warning(f"⚠️  ไม่สามารถตรวจสอบ overlay: {str(e)}")
             return True  # ดำเนินการต่อไปเพื่อไม่ให้ค้าง
     
-    def wait_and_click(self, selector, description="element", timeout=None):
+    def wait_and_click(self, selector, description="element", timeout=None, expect=None):
+        """คลิก element แล้วรอจนหน้าเว็บถึงสถานะ expect (ชื่อใน config.PAGE_STATES)"""
+        expectation = None
         try:
             wait_time = timeout if timeout else config.ELEMENT_WAIT_TIMEOUT
             wait = WebDriverWait(self.driver, wait_time)
@@ -392,31 +556,30 @@ class DSLAutoFillBot:
             if any(keyword in description for keyword in important_buttons):
                 self.wait_for_overlay_disappear()
             
-            # ลองหา element ก่อน
-            element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+            # รอให้ element clickable (ลอง selector สำรองถ้า selector เดิมไม่เจอ และใช้ element ที่จำไว้ถ้ามี)
+            element = wait.until(lambda driver: self.find_clickable(selector))
             
-            # รอให้ element clickable
-            element = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
+            # เก็บสถานะหน้าเว็บก่อนคลิก
+            expectation = self.wait_engine.prepare(expect, selector)
             
             # ตรวจสอบว่า element พร้อมคลิกหรือไม่
             if element.is_enabled() and element.is_displayed():
                 # สำหรับ radio button หรือ checkbox ใช้ JavaScript click
                 if "radio" in description.lower() or "checkbox" in description.lower():
                     self.driver.execute_script("arguments[0].click();", element)
-                    self.log(f"✅ คลิก {description} สำเร็จ (ใช้ JavaScript)")
+                    self.log_debug(f"✅ คลิก {description} สำเร็จ (ใช้ JavaScript)")
                 # สำหรับปุ่มสำคัญที่อาจถูก overlay บัง ใช้ JavaScript click
                 elif any(keyword in description for keyword in important_buttons):
                     self.driver.execute_script("arguments[0].click();", element)
-                    self.log(f"✅ คลิก {description} สำเร็จ (ใช้ JavaScript)")
+                    self.log_debug(f"✅ คลิก {description} สำเร็จ (ใช้ JavaScript)")
                 else:
                     element.click()
-                    self.log(f"✅ คลิก {description} สำเร็จ")
+                    self.log_debug(f"✅ คลิก {description} สำเร็จ")
             else:
                 self.log_warning(f"⚠️  {description} ไม่สามารถคลิกได้ (element ไม่พร้อม)")
                 return False
                 
-            time.sleep(config.WAIT_TIME)
-            return True
+            return self.settle_after(expectation, description)
             
         except TimeoutException:
             self.log_error(f"❌ ไม่พบ {description} (Selector: {selector})")
@@ -426,22 +589,22 @@ class DSLAutoFillBot:
             # ลองใช้ JavaScript click เป็น fallback สำหรับปุ่มสำคัญ
             if any(keyword in description for keyword in important_buttons):
                 try:
-                    element = self.driver.find_element(By.CSS_SELECTOR, selector)
+                    self.wait_engine.selectors.invalidate()
+                    element = self.wait_engine.selectors.find(selector)
                     self.driver.execute_script("arguments[0].click();", element)
-                    self.log(f"✅ คลิก {description} สำเร็จ (ใช้ JavaScript Fallback)")
-                    time.sleep(config.WAIT_TIME)
-                    return True
+                    self.log_debug(f"✅ คลิก {description} สำเร็จ (ใช้ JavaScript Fallback)")
+                    return self.settle_after(expectation, description)
                 except:
                     pass
             return False
     
     def wait_and_send_keys(self, selector, text, description="input field", clear_first=True):
         try:
-            element = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
+            element = self.wait.until(lambda driver: self.find_clickable(selector))
             if clear_first:
                 element.clear()
             element.send_keys(text)
-            self.log(f"✅ กรอกข้อมูล '{text}' ในช่อง {description} สำเร็จ")
+            self.log_debug(f"✅ กรอกข้อมูล '{text}' ในช่อง {description} สำเร็จ")
             return True
         except TimeoutException:
             self.log_error(f"❌ ไม่พบช่อง {description} (Selector: {selector})")
@@ -450,14 +613,14 @@ class DSLAutoFillBot:
             self.log_error(f"❌ เกิดข้อผิดพลาดขณะกรอกข้อมูลในช่อง {description}: {str(e)}")
             return False
     
-    def wait_and_upload_file(self, selector, file_path, description="file input"):
+    def wait_and_upload_file(self, selector, file_path, description="file input", expect=None):
         try:
-            element = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+            element = self.wait.until(lambda driver: self.wait_engine.selectors.find(selector))
+            expectation = self.wait_engine.prepare(expect, selector)
             element.send_keys(file_path)
-            self.log(f"✅ อัปโหลดไฟล์ {file_path} สำเร็จ")
+            self.log_debug(f"✅ อัปโหลดไฟล์ {file_path} สำเร็จ")
             # รอให้เว็บไซต์ประมวลผลไฟล์และรีเฟรช DOM
-            time.sleep(config.WAIT_TIME)
-            return True
+            return self.settle_after(expectation, description)
         except TimeoutException:
             self.log_error(f"❌ ไม่พบช่องอัปโหลดไฟล์ {description} (Selector: {selector})")
             return False
@@ -465,10 +628,32 @@ class DSLAutoFillBot:
             self.log_error(f"❌ เกิดข้อผิดพลาดขณะอัปโหลดไฟล์: {str(e)}")
             return False
     
+    def find_clickable(self, selector):
+        """element ที่คลิกได้ของ selector หรือ False (ใช้กับ WebDriverWait.until)"""
+        element = self.wait_engine.selectors.find(selector)
+        if element is None:
+            return False
+        try:
+            if element.is_displayed() and element.is_enabled():
+                return element
+        except StaleElementReferenceException:
+            # element ที่จำไว้ถูกแทนที่แล้ว - รอบถัดไปหาใหม่
+            self.wait_engine.selectors.invalidate()
+        return False
+    
+    def settle_after(self, expectation, description):
+        """รอหลังการกระทำตามโหมดของ Wait Engine"""
+        if self.wait_engine.settle(expectation):
+            return True
+        busy_reason = self.wait_engine.readiness.busy_reason
+        busy = f" (หน้าเว็บยังไม่ว่าง: {busy_reason})" if busy_reason else ""
+        self.log_error(f"❌ หน้าเว็บไม่เข้าสู่สถานะ '{expectation.name}' หลัง {description}{busy}")
+        return False
+    
     def check_element_exists(self, selector, description="element", timeout=5):
         try:
             wait = WebDriverWait(self.driver, timeout)
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+            wait.until(lambda driver: self.wait_engine.selectors.find(selector))
             return True
         except TimeoutException:
             return False
@@ -477,32 +662,38 @@ class DSLAutoFillBot:
         """ตรวจสอบปุ่มโดยดูจากข้อความ"""
         try:
             wait = WebDriverWait(self.driver, timeout)
-            elements = wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector)))
+            elements = wait.until(lambda driver: self.wait_engine.selectors.find_all(selector) or False)
             
             for element in elements:
                 if button_text in element.text:
-                    self.log(f"🔍 เจอปุ่ม '{button_text}' - {description}")
+                    self.log_debug(f"🔍 เจอปุ่ม '{button_text}' - {description}")
                     return True
             return False
         except TimeoutException:
             return False
+        except StaleElementReferenceException:
+            # ตารางถูก render ใหม่ระหว่างอ่าน - อ่านใหม่อีกครั้ง
+            self.wait_engine.selectors.invalidate()
+            return self.check_button_by_text(selector, button_text, description, timeout)
     
     def handle_dynamic_checkboxes(self, feature_type="disbursement"):
-        """จัดการ checkbox แบบ dynamic - รองรับ 2 หรือ 3 checkbox"""
+        """จัดการ checkbox แบบ dynamic - รองรับ 2 หรือ 3 checkbox (ตรวจและติ๊กด้วย JavaScript ครั้งเดียว)"""
         try:
+            # แต่ละ checkbox ส่งเป็นลำดับ selector เดียวกับที่ SelectorRegistry ลอง (selector สั้นก่อน)
+            candidates = self.wait_engine.selectors.candidates
             if feature_type == "sign-contract":
                 # Checkbox selectors สำหรับฟีเจอร์ลงนามสัญญา
                 checkbox_selectors = [
                     # กรณี 2 Checkbox
                     {
-                        "address1": config.SIGN_CONTRACT_ADDRESS_CHECKBOX_SELECTOR,
-                        "contract": config.SIGN_CONTRACT_CONTRACT_CHECKBOX_2_CASE_SELECTOR
+                        "address1": candidates(config.SIGN_CONTRACT_ADDRESS_CHECKBOX_SELECTOR),
+                        "contract": candidates(config.SIGN_CONTRACT_CONTRACT_CHECKBOX_2_CASE_SELECTOR)
                     },
                     # กรณี 3 Checkbox
                     {
-                        "address1": config.SIGN_CONTRACT_ADDRESS_CHECKBOX_SELECTOR,
-                        "address2": config.SIGN_CONTRACT_OPTIONAL_CHECKBOX_SELECTOR,
-                        "contract": config.SIGN_CONTRACT_CONTRACT_CHECKBOX_SELECTOR
+                        "address1": candidates(config.SIGN_CONTRACT_ADDRESS_CHECKBOX_SELECTOR),
+                        "address2": candidates(config.SIGN_CONTRACT_OPTIONAL_CHECKBOX_SELECTOR),
+                        "contract": candidates(config.SIGN_CONTRACT_CONTRACT_CHECKBOX_SELECTOR)
                     }
                 ]
             else:
@@ -510,61 +701,127 @@ class DSLAutoFillBot:
                 checkbox_selectors = [
                     # กรณี 2 Checkbox
                     {
-                        "address1": config.ADDRESS_CHECKBOX_SELECTOR,
-                        "contract": config.CONTRACT_CHECKBOX_SELECTOR
+                        "address1": candidates(config.ADDRESS_CHECKBOX_SELECTOR),
+                        "contract": candidates(config.CONTRACT_CHECKBOX_SELECTOR)
                     },
                     # กรณี 3 Checkbox
                     {
-                        "address1": config.ADDRESS_CHECKBOX_SELECTOR,
-                        "address2": config.OPTIONAL_CHECKBOX_SELECTOR,
-                        "contract": config.CONTRACT_CHECKBOX_3_CASE_SELECTOR
+                        "address1": candidates(config.ADDRESS_CHECKBOX_SELECTOR),
+                        "address2": candidates(config.OPTIONAL_CHECKBOX_SELECTOR),
+                        "contract": candidates(config.CONTRACT_CHECKBOX_3_CASE_SELECTOR)
                     }
                 ]
             
-            # ลองตรวจสอบว่าเป็นกรณีไหน
-            has_3_checkboxes = self.check_element_exists(checkbox_selectors[1]["address2"], "Address2 Checkbox", timeout=2)
+            # ตรวจหน้า, ติ๊ก checkbox และตรวจผลในสคริปต์เดียว (วนเรียกจนกว่า checkbox ของหน้าจะโหลดครบ)
+            result = WebDriverWait(self.driver, config.ELEMENT_WAIT_TIMEOUT, poll_frequency=config.STATE_POLL_INTERVAL).until(
+                lambda driver: driver.execute_script(CONSENT_CHECKBOX_SCRIPT, checkbox_selectors)
+            )
             
-            if has_3_checkboxes:
-                self.log("🔍 ตรวจพบ: รายการมี 3 Checkbox")
-                selectors = checkbox_selectors[1]  # ใช้ selectors กรณี 3 checkbox
-                
-                # คลิก Address 1
-                if not self.wait_and_click(selectors["address1"], "Checkbox Address Panel (1/3)"):
-                    return False
-                
-                # คลิก Address 2  
-                if not self.wait_and_click(selectors["address2"], "Checkbox Address Panel (2/3)"):
-                    return False
-                
-                # คลิก Contract
-                if not self.wait_and_click(selectors["contract"], "Checkbox Contract Panel (3/3)"):
-                    return False
-                    
-                self.log("✅ คลิก Checkbox ทั้ง 3 ตัวเสร็จสิ้น")
-                
-            else:
-                self.log("🔍 ตรวจพบ: รายการมี 2 Checkbox")
-                selectors = checkbox_selectors[0]  # ใช้ selectors กรณี 2 checkbox
-                
-                # คลิก Address
-                if not self.wait_and_click(selectors["address1"], "Checkbox Address Panel (1/2)"):
-                    return False
-                
-                # คลิก Contract
-                if not self.wait_and_click(selectors["contract"], "Checkbox Contract Panel (2/2)"):
-                    return False
-                    
-                self.log("✅ คลิก Checkbox ทั้ง 2 ตัวเสร็จสิ้น")
+            total = len(result["checked"])
+            self.log_debug(f"🔍 ตรวจพบ: รายการมี {total} Checkbox")
+            if not all(result["checked"]):
+                unchecked = [i + 1 for i, checked in enumerate(result["checked"]) if not checked]
+                self.log_error(f"❌ ติ๊ก Checkbox ไม่สำเร็จ (ลำดับที่ {unchecked})")
+                return False
             
+            self.log_debug(f"✅ คลิก Checkbox ทั้ง {total} ตัวเสร็จสิ้น")
             return True
             
+        except TimeoutException:
+            self.log_error("❌ ไม่พบ Checkbox ในหน้า Consent")
+            return False
         except Exception as e:
             self.log_error(f"❌ เกิดข้อผิดพลาดขณะจัดการ Checkbox: {str(e)}")
             return False
     
 
+    def get_active_account(self):
+        """ดึง (user_id, ข้อมูลผู้ใช้) ของบัญชีที่ bot นี้ใช้ login"""
+        if self.account_id is not None:
+            return self.account_id, self.user_manager.data["users"].get(self.account_id)
+        return self.user_manager.get_current_user_id(), self.user_manager.get_current_user()
+    
+    def open_page_if_logged_in(self, target_url, ready_selector):
+        """เปิดหน้าทำงาน - คืนค่า True ถ้าเข้าได้, False ถ้าถูกส่งกลับไปหน้า Login"""
+        self.wait_engine.selectors.invalidate()
+        self.driver.get(target_url)
+        
+        # รอจนเจอหน้าทำงาน หรือถูกส่งกลับไปหน้า Login
+        WebDriverWait(self.driver, config.PAGE_LOAD_TIMEOUT).until(
+            lambda driver: driver.find_elements(By.CSS_SELECTOR, ready_selector) or
+                          config.LOGIN_PAGE_URL in driver.current_url or
+                          driver.find_elements(By.CSS_SELECTOR, config.USERNAME_SELECTOR)
+        )
+        return bool(self.driver.find_elements(By.CSS_SELECTOR, ready_selector))
+    
+    def resume_warm_browser(self, target_url, ready_selector):
+        """ใช้เบราว์เซอร์ที่ login ค้างไว้จากฟีเจอร์ก่อนหน้า แทนการ login ใหม่"""
+        if not self.browser.is_logged_in():
+            return False
+        
+        try:
+            self.log("♻️  เบราว์เซอร์ login ไว้แล้วจากฟีเจอร์ก่อนหน้า - ตรวจสอบ session...")
+            if self.open_page_if_logged_in(target_url, ready_selector):
+                self.log("✅ ใช้ login เดิมสำเร็จ - ข้ามการ Login")
+                return True
+            self.log("⌛ login เดิมหมดอายุแล้ว - Login ใหม่")
+        except Exception as e:
+            self.log_warning(f"⚠️  ไม่สามารถใช้ login เดิม: {str(e)}")
+        self.browser.account_id = None
+        return False
+    
+    def restore_cached_session(self, target_url, ready_selector):
+        """ลองใช้ session ที่บันทึกไว้แทนการ login ใหม่ - ตรวจสอบด้วยการเปิดหน้าทำงานครั้งเดียว"""
+        if not config.SESSION_CACHE_ENABLED:
+            return False
+        
+        user_id, current_user = self.get_active_account()
+        if not current_user:
+            return False
+        
+        try:
+            if not self.session_cache.restore(self.driver, user_id):
+                return False
+            
+            self.log(f"🍪 พบ session ที่บันทึกไว้ของ {current_user['name']} - ตรวจสอบความถูกต้อง...")
+            if self.open_page_if_logged_in(target_url, ready_selector):
+                self.log("✅ ใช้ session ที่บันทึกไว้สำเร็จ - ข้ามการ Login")
+                self.browser.mark_logged_in()
+                return True
+            
+            self.log("⌛ session ที่บันทึกไว้หมดอายุแล้ว - Login ใหม่")
+            self.session_cache.clear(user_id)
+            return False
+            
+        except Exception as e:
+            self.log_warning(f"⚠️  ไม่สามารถใช้ session ที่บันทึกไว้: {str(e)}")
+            return False
+        finally:
+            self.session_cache.finish_restore(self.driver)
+    
+    def save_cached_session(self):
+        """บันทึก session หลัง login สำเร็จ เพื่อใช้ในการรันครั้งถัดไป"""
+        if not config.SESSION_CACHE_ENABLED:
+            return
+        
+        user_id, current_user = self.get_active_account()
+        if not current_user:
+            return
+        
+        try:
+            self.session_cache.save(self.driver, user_id)
+            self.log("🍪 บันทึก session สำหรับการรันครั้งถัดไปแล้ว")
+        except Exception as e:
+            self.log_warning(f"⚠️  ไม่สามารถบันทึก session: {str(e)}")
+
     def auto_login(self):
         """Login เข้าเว็บไซต์อัตโนมัติ"""
+        # ใช้เบราว์เซอร์ที่ login ค้างไว้ หรือ session ที่บันทึกไว้ก่อน
+        if self.resume_warm_browser(config.WEBSITE_URL, config.RADIO_SELECTOR):
+            return True
+        if self.restore_cached_session(config.WEBSITE_URL, config.RADIO_SELECTOR):
+            return True
+        
         max_retries = 3
         for attempt in range(max_retries):
             try:
@@ -588,7 +845,7 @@ class DSLAutoFillBot:
                 time.sleep(2)
                 
                 # 2. ดึงข้อมูลผู้ใช้ปัจจุบัน
-                current_user = self.user_manager.get_current_user()
+                _, current_user = self.get_active_account()
                 if not current_user:
                     self.log_error("❌ ไม่พบข้อมูลผู้ใช้ กรุณาจัดการผู้ใช้งานก่อน")
                     return False
@@ -632,6 +889,8 @@ class DSLAutoFillBot:
                 )
                 
                 self.log("✅ Login สำเร็จ! พร้อมเริ่มทำงาน")
+                self.browser.mark_logged_in()
+                self.save_cached_session()
                 return True
                 
             except Exception as e:
@@ -643,58 +902,206 @@ class DSLAutoFillBot:
         
         return False  # ไม่ควรมาถึงจุดนี้
 
+    @contextmanager
+    def trace_step(self, step):
+        """จับเวลาขั้นตอนของไฟล์ที่กำลังทำ (บันทึกลง trace ของ session)"""
+        self.step_stack.append(step)
+        try:
+            with self.tracer.span(
+                step,
+                feature=getattr(self, 'current_feature', None),
+                file=getattr(self, 'current_file', None),
+                worker=self.worker_id
+            ) as span:
+                yield span
+        finally:
+            self.step_stack.pop()
+    
+    def install_command_tracer(self):
+        """นับ WebDriver command ของเบราว์เซอร์นี้ (โหมด COMMAND_TRACE_ENABLED)"""
+        if self.command_tracer:
+            self.command_tracer.install(self)
+    
+    def report_file_commands(self, feature_type, filename):
+        """สรุป WebDriver command ของไฟล์ที่เพิ่งทำ - เตือนเมื่อเกิน COMMAND_BUDGET_PER_FILE"""
+        count, seconds, top_callers = self.command_tracer.finish_file(self, feature_type, filename)
+        callers = ", ".join(f"{caller} {calls}" for caller, calls in top_callers)
+        message = f"🔁 WebDriver commands: {count} ครั้ง ({seconds:.2f}s) - {callers}"
+        if count > config.COMMAND_BUDGET_PER_FILE:
+            self.log_warning(f"{message} - เกินงบ {config.COMMAND_BUDGET_PER_FILE} ครั้งต่อไฟล์")
+        else:
+            self.log(message)
+    
+    def timed_step(self, step, func, *args, **kwargs):
+        """เรียกฟังก์ชันของขั้นตอนพร้อมจับเวลา - ขั้นตอนล้มเหลวเมื่อคืนค่า False"""
+        with self.trace_step(step) as span:
+            result = func(*args, **kwargs)
+            span.ok = bool(result)
+        return result
+    
+    def return_to_work_page(self, url, ready_selector, page_name):
+        """กลับไปหน้าทำงานโดยตรง (ไม่ refresh ถ้าอยู่ในหน้านั้นแล้ว)"""
+        current_url = self.driver.current_url
+        if url not in current_url:
+            self.log(f"🎯 กลับไป{page_name}: {url}")
+            self.wait_engine.selectors.invalidate()
+            self.driver.get(url)
+            # รอให้หน้าโหลดเสร็จ
+            WebDriverWait(self.driver, config.PAGE_LOAD_TIMEOUT).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, ready_selector))
+            )
+        else:
+            self.log(f"✅ อยู่ใน{page_name}แล้ว")
+        return True
+    
+    def get_result_index(self, feature_type):
+        """ดัชนีตารางผลลัพธ์ของ batch นี้ (สร้างเมื่อเรียกครั้งแรก และใช้ร่วมกันทุก worker)"""
+        if not config.RESULT_INDEX_ENABLED:
+            return None
+        
+        root = self.root
+        index_key = (feature_type, self.account_id)  # แต่ละบัญชีเห็นรายการในตารางไม่เหมือนกัน
+        with root.result_index_lock:
+            index = root.result_indexes.get(index_key)
+            if index is None:
+                index = ResultIndex(feature_type)
+                list_url = config.SIGN_CONTRACT_URL if feature_type == "sign-contract" else config.WEBSITE_URL
+                self.log("📇 กำลังอ่านตารางผลลัพธ์ทุกหน้าเพื่อสร้างดัชนี...")
+                try:
+                    with self.trace_step("result_index"):
+                        total_rows = index.build(self.driver, list_url)
+                    counts = index.counts()
+                    self.log(f"📇 ดัชนีตารางผลลัพธ์: {total_rows} รายการ (ต้องทำ consent {counts[ROW_NEEDS_CONSENT]} | "
+                             f"ต้องนำเข้าเอกสาร {counts[ROW_NEEDS_IMPORT]} | สำเร็จแล้ว {counts[ROW_DONE]})")
+                    if not total_rows:
+                        self.log_warning("⚠️  ไม่พบรายการในตารางผลลัพธ์ (ตรวจ RESULT_ROW_SELECTOR) - ใช้การค้นหาทีละไฟล์แทน")
+                    elif not index.complete:
+                        self.log_warning(f"⚠️  อ่านตารางผลลัพธ์ไม่ครบ (เกิน {config.RESULT_INDEX_MAX_PAGES} หน้า) - ไฟล์ที่ไม่มีในดัชนีค้นหาทีละไฟล์")
+                except Exception as e:
+                    index.complete = False
+                    self.log_warning(f"⚠️  สร้างดัชนีตารางผลลัพธ์ไม่สำเร็จ - ใช้การค้นหาทีละไฟล์แทน: {str(e)}")
+                root.result_indexes[index_key] = index
+        return index
+    
+    def lookup_result_index(self, feature_type, filename):
+        """สถานะของไฟล์จากดัชนี (ROW_MISSING = ดัชนีครบแต่ไม่มีรายการ, None = ต้องค้นหาแบบเดิม)"""
+        index = self.get_result_index(feature_type)
+        if index is None:
+            return None
+        return index.lookup(self.extract_filename_without_extension(filename))
+    
+    def mark_result_index(self, feature_type, filename, state):
+        """อัปเดตดัชนีหลังดำเนินการกับไฟล์แล้ว"""
+        index = self.root.result_indexes.get((feature_type, self.account_id))
+        if index is not None:
+            index.mark(self.extract_filename_without_extension(filename), state)
+    
+    def process_file_with_trace(self, feature_type, filename, source_directory):
+        """ประมวลผลไฟล์หนึ่งไฟล์พร้อมจับเวลารวม (ใช้ร่วมกันทุกโหมดการทำงาน)"""
+        self.current_feature = feature_type
+        self.current_file = filename
+        self.current_duplicate = False
+        self.last_error = None
+        self.journal.mark_started(feature_type, filename)
+        if self.command_tracer:
+            self.command_tracer.start_file(self)
+        if self.metrics:
+            self.metrics.add_gauge("dsl_files_in_flight", {"feature": feature_type}, 1)
+        try:
+            return self.timed_step("file_total", self.get_process_function(feature_type), filename, source_directory)
+        finally:
+            self.current_file = None
+            if self.command_tracer:
+                self.report_file_commands(feature_type, filename)
+            if self.metrics:
+                self.metrics.add_gauge("dsl_files_in_flight", {"feature": feature_type}, -1)
+
+    def step_failed(self, step, file_path=None):
+        """
+        ผลของขั้นตอนที่ไม่สำเร็จ - ส่วนใหญ่เป็นปัญหาชั่วคราว (เว็บช้า, element ยังไม่มา, หน้าเว็บไม่เปลี่ยน) จึงลองใหม่ได้
+        ยกเว้น login ไม่สำเร็จ (หยุด batch), ไฟล์ที่จะอัปโหลดหายไปจากโฟลเดอร์แล้ว และเว็บไซต์แจ้งว่าไม่รับไฟล์
+        """
+        if step == "login":
+            return FileOutcome(OUTCOME_LOGIN_FAILED, step, getattr(self, 'last_error', None))
+        if file_path and not os.path.exists(file_path):
+            return FileOutcome(OUTCOME_PERMANENT, step, f"ไม่พบไฟล์ {file_path}")
+        if step in ("upload", "upload_confirm"):
+            message = self.find_rejection_message()
+            if message:
+                return FileOutcome(OUTCOME_REJECTED, step, f"เว็บไซต์ไม่รับไฟล์: {message}")
+        return FileOutcome(OUTCOME_TRANSIENT, step, getattr(self, 'last_error', None))
+
+    def find_rejection_message(self):
+        """ข้อความ error ที่เว็บไซต์แสดงหลังอัปโหลด (UPLOAD_REJECTED_SELECTORS) หรือ None ถ้าไม่มี"""
+        try:
+            for selector in config.UPLOAD_REJECTED_SELECTORS:
+                for element in self.driver.find_elements(By.CSS_SELECTOR, selector):
+                    if element.is_displayed():
+                        return element.text.strip() or selector
+        except WebDriverException:
+            pass
+        return None
+
     def process_single_file(self, filename, source_directory):
         try:
             self.log(f"🚀 เริ่มดำเนินการกับไฟล์: {filename}")
             
             # 1. Login อัตโนมัติ (เฉพาะไฟล์แรก)
             if not hasattr(self, '_login_completed'):
-                if not self.auto_login():
-                    return False
+                if not self.timed_step("login", self.auto_login):
+                    return self.step_failed("login")
                 self._login_completed = True
             else:
                 # สำหรับไฟล์ถัดๆ ไป ให้ไปที่หน้าทำงานโดยตรง (ไม่ refresh)
-                current_url = self.driver.current_url
-                if config.WEBSITE_URL not in current_url:
-                    self.log(f"🎯 กลับไปหน้าทำงาน: {config.WEBSITE_URL}")
-                    self.driver.get(config.WEBSITE_URL)
-                    # รอให้หน้าโหลดเสร็จ
-                    WebDriverWait(self.driver, config.PAGE_LOAD_TIMEOUT).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, config.RADIO_SELECTOR))
-                    )
-                else:
-                    self.log("✅ อยู่ในหน้าทำงานแล้ว")
+                self.timed_step("navigate", self.return_to_work_page, config.WEBSITE_URL, config.RADIO_SELECTOR, "หน้าทำงาน")
+            
+            # ตรวจจากดัชนีตารางผลลัพธ์ก่อน (ถ้าเปิดใช้) - ไฟล์ที่ทำแล้วไม่ต้องค้นหา
+            row_state = self.lookup_result_index("disbursement", filename)
+            if row_state == ROW_DONE:
+                self.log(f"🎯 ไฟล์ '{filename}' ถูกดำเนินการสำเร็จแล้ว (จากดัชนีตาราง) - ย้ายไป completed")
+                self.log_duplicate_action(filename)  # บันทึกเป็น duplicate action
+                return FileOutcome(OUTCOME_DUPLICATE)
+            if row_state == ROW_MISSING:
+                self.log_warning(f"⚠️  ไม่เจอรายการสำหรับไฟล์ '{filename}' (จากดัชนีตาราง) - ข้ามไปไฟล์ถัดไป")
+                return FileOutcome(OUTCOME_NOT_FOUND)
             
             # 2. เลือก Radio Button #radio2
-            if not self.wait_and_click(config.RADIO_SELECTOR, "Radio Button #radio2"):
-                return False
+            if not self.timed_step("radio_select", self.wait_and_click, config.RADIO_SELECTOR, "Radio Button #radio2", expect="checked"):
+                return self.step_failed("radio_select")
             
-            # 3. กรอกชื่อไฟล์ (ตัดนามสกุลออก) ในช่องค้นหา
-            search_text = self.extract_filename_without_extension(filename)
-            if not self.wait_and_send_keys(config.SEARCH_INPUT_SELECTOR, search_text, "ช่องค้นหา"):
-                return False
-            
-            # 4. คลิกปุ่มค้นหา
-            if not self.wait_and_click(config.SEARCH_BUTTON_SELECTOR, "ปุ่มค้นหา"):
-                return False
+            # 3-4. กรอกชื่อไฟล์ (ตัดนามสกุลออก) ในช่องค้นหา แล้วคลิกปุ่มค้นหา
+            with self.trace_step("search") as span:
+                search_text = self.extract_filename_without_extension(filename)
+                span.ok = (self.wait_and_send_keys(config.SEARCH_INPUT_SELECTOR, search_text, "ช่องค้นหา") and
+                           self.wait_and_click(config.SEARCH_BUTTON_SELECTOR, "ปุ่มค้นหา", expect="search_results"))
+            if not span.ok:
+                return self.step_failed("search")
             
             # 5. รอผลการค้นหา (Smart Wait - รอให้เจอผลลัพธ์หรือ error message)
-            try:
-                WebDriverWait(self.driver, 5).until(
-                    lambda driver: driver.find_elements(By.CSS_SELECTOR, config.DISBURSEMENT_CONFIRM_BUTTON_SELECTOR) or 
-                                  driver.find_elements(By.CSS_SELECTOR, ".no-data, .empty-result") or
-                                  driver.find_elements(By.CSS_SELECTOR, "p.text-green-chartreuse")
-                )
-            except TimeoutException:
-                pass  # จะตรวจในขั้นตอนถัดไป
+            with self.trace_step("result_wait"):
+                try:
+                    WebDriverWait(self.driver, 5).until(
+                        lambda driver: driver.find_elements(By.CSS_SELECTOR, config.DISBURSEMENT_CONFIRM_BUTTON_SELECTOR) or 
+                                      driver.find_elements(By.CSS_SELECTOR, ".no-data, .empty-result") or
+                                      driver.find_elements(By.CSS_SELECTOR, "p.text-green-chartreuse")
+                    )
+                except TimeoutException:
+                    pass  # จะตรวจในขั้นตอนถัดไป
             
             
             # 6. ตรวจสอบปุ่มที่มีอยู่โดยดูจากข้อความ (เพราะใช้ selector เดียวกัน)
             table_button_selector = "body > dsl-workspace-root > app-content-layout > div > div > main > article > dsl-workspace-disbursement > main > section.data-table.full.rounded-none > dsl-workspace-table-v2 > div.max-w-full.overflow-x-auto > table > tbody > tr > td:nth-child(8) > div > div:nth-child(1) > dsl-workspace-button > button"
             
             # ตรวจสอบปุ่มโดยดูข้อความ
-            has_import_button = self.check_button_by_text(table_button_selector, "นำเข้าเอกสาร", "ไฟล์ทำ consent แล้ว", timeout=3)
-            has_disbursement_button = self.check_button_by_text(table_button_selector, "ยืนยันการเบิกเงินกู้ยืม", "ไฟล์ใหม่", timeout=3)
+            with self.trace_step("button_detection") as span:
+                if row_state in (ROW_NEEDS_CONSENT, ROW_NEEDS_IMPORT):
+                    # รู้สถานะจากดัชนีแล้ว ไม่ต้องรอตรวจข้อความปุ่ม
+                    has_import_button = row_state == ROW_NEEDS_IMPORT
+                    has_disbursement_button = row_state == ROW_NEEDS_CONSENT
+                else:
+                    has_import_button = self.check_button_by_text(table_button_selector, "นำเข้าเอกสาร", "ไฟล์ทำ consent แล้ว", timeout=3)
+                    has_disbursement_button = self.check_button_by_text(table_button_selector, "ยืนยันการเบิกเงินกู้ยืม", "ไฟล์ใหม่", timeout=3)
+                span.ok = has_import_button or has_disbursement_button
             
             if not has_disbursement_button and not has_import_button:
                 # ตรวจสอบข้อความ "ทำแบบเบิกเงินกู้ยืมสำเร็จ" อีกครั้ง (กรณีไม่เจอปุ่ม)
@@ -703,63 +1110,64 @@ class DSLAutoFillBot:
                     success_elements = self.driver.find_elements(By.CSS_SELECTOR, success_message_selector)
                     for element in success_elements:
                         if "ทำแบบเบิกเงินกู้ยืมสำเร็จ" in element.text:
-                            self.log(f"✅ พบข้อความ: {element.text}")
+                            self.log_debug(f"✅ พบข้อความ: {element.text}")
                             self.log(f"🎯 ไฟล์ '{filename}' ถูกดำเนินการสำเร็จแล้ว - ย้ายไป completed (ไม่เจอปุ่ม)")
                             self.log_duplicate_action(filename)  # บันทึกเป็น duplicate action
-                            return True  # ถือว่าสำเร็จโดยทันที
+                            return FileOutcome(OUTCOME_DUPLICATE)  # ถือว่าสำเร็จโดยทันที
                 except Exception as e:
                     pass  # ไม่เจอก็ไม่เป็นไร
                 
                 self.log_warning(f"⚠️  ไม่เจอรายการสำหรับไฟล์ '{filename}' - ข้ามไปไฟล์ถัดไป")
-                return False
+                return FileOutcome(OUTCOME_NOT_FOUND)
             
             # ให้ปุ่มยืนยันการเบิกเงินกู้ยืมมีลำดับความสำคัญสูงกว่า (กรณีปกติ)
             if has_disbursement_button:
                 self.log(f"🔍 พบปุ่มยืนยันการเบิกเงินกู้ยืม - ไฟล์ใหม่ ต้องทำ consent")
                 
                 # 6a. คลิกปุ่มยืนยันการเบิกเงินกู้ยืม
-                if not self.wait_and_click(table_button_selector, "ปุ่มยืนยันการเบิกเงินกู้ยืม"):
-                    return False
+                if not self.timed_step("row_action", self.wait_and_click, table_button_selector, "ปุ่มยืนยันการเบิกเงินกู้ยืม", expect="consent_page"):
+                    return self.step_failed("row_action")
                 
                 # 7-9. จัดการ Checkbox แบบ Dynamic (รองรับ 2 หรือ 3 checkbox)
-                if not self.handle_dynamic_checkboxes("disbursement"):
-                    return False
+                if not self.timed_step("checkboxes", self.handle_dynamic_checkboxes, "disbursement"):
+                    return self.step_failed("checkboxes")
                 
                 # 10. คลิกปุ่มยืนยันใน consent page
-                if not self.wait_and_click(config.CONSENT_CONFIRM_BUTTON_SELECTOR, "ปุ่มยืนยันใน Consent Page"):
-                    return False
+                if not self.timed_step("consent_confirm", self.wait_and_click, config.CONSENT_CONFIRM_BUTTON_SELECTOR, "ปุ่มยืนยันใน Consent Page", expect="consent_success"):
+                    return self.step_failed("consent_confirm")
                 
                 # 11. คลิกปุ่มไปหน้าเลือกไฟล์
-                if not self.wait_and_click(config.GO_TO_FILE_SELECTION_BUTTON_SELECTOR, "ปุ่มไปหน้าเลือกไฟล์"):
-                    return False
+                if not self.timed_step("go_to_upload", self.wait_and_click, config.GO_TO_FILE_SELECTION_BUTTON_SELECTOR, "ปุ่มไปหน้าเลือกไฟล์", expect="import_page"):
+                    return self.step_failed("go_to_upload")
                     
             # กรณีพิเศษ: ไฟล์ที่ทำ consent แล้ว (ปุ่มนำเข้าเอกสาร)
             elif has_import_button:
                 self.log(f"🔍 พบปุ่มนำเข้าเอกสาร - ไฟล์ทำ consent แล้ว ข้าม consent page")
                 
                 # 6b. คลิกปุ่มนำเข้าเอกสาร (จะพาไปหน้าเลือกไฟล์โดยตรง)
-                if not self.wait_and_click(table_button_selector, "ปุ่มนำเข้าเอกสาร (ข้าม consent)"):
-                    return False
+                if not self.timed_step("row_action", self.wait_and_click, table_button_selector, "ปุ่มนำเข้าเอกสาร (ข้าม consent)", expect="import_page"):
+                    return self.step_failed("row_action")
             
             # 12. อัปโหลดไฟล์ (ทำงานเหมือนกันในทั้ง 2 กรณี)
             file_path = os.path.abspath(os.path.join(source_directory, filename))
-            if not self.wait_and_upload_file(config.FILE_INPUT_SELECTOR, file_path, "ช่องเลือกไฟล์"):
-                return False
+            if not self.timed_step("upload", self.wait_and_upload_file, config.FILE_INPUT_SELECTOR, file_path, "ช่องเลือกไฟล์", expect="file_attached"):
+                return self.step_failed("upload", file_path)
             
             # 13. คลิกปุ่มยืนยันการอัปโหลดไฟล์
-            if not self.wait_and_click(config.FILE_UPLOAD_CONFIRM_BUTTON_SELECTOR, "ปุ่มยืนยันการอัปโหลดไฟล์"):
-                return False
+            if not self.timed_step("upload_confirm", self.wait_and_click, config.FILE_UPLOAD_CONFIRM_BUTTON_SELECTOR, "ปุ่มยืนยันการอัปโหลดไฟล์", expect="import_success"):
+                return self.step_failed("upload_confirm")
             
             # 14. คลิกปุ่มกลับหน้าแรกเพื่อทำซ้ำ
-            if not self.wait_and_click(config.BACK_TO_START_BUTTON_SELECTOR, "ปุ่มกลับหน้าแรก"):
-                return False
+            if not self.timed_step("back_to_start", self.wait_and_click, config.BACK_TO_START_BUTTON_SELECTOR, "ปุ่มกลับหน้าแรก", expect="search_page"):
+                return self.step_failed("back_to_start")
             
+            self.mark_result_index("disbursement", filename, ROW_DONE)
             self.log(f"🎉 ดำเนินการกับไฟล์ '{filename}' เสร็จสิ้นสำเร็จ!")
-            return True
+            return FileOutcome(OUTCOME_SUCCESS)
             
         except Exception as e:
             self.log_error(f"💥 เกิดข้อผิดพลาดขณะดำเนินการกับไฟล์ '{filename}': {str(e)}")
-            return False
+            return FileOutcome.from_exception(e)
 
     def process_sign_contract_file(self, filename, source_directory):
         """ประมวลผลไฟล์สำหรับฟีเจอร์ลงนามสัญญากู้ยืมเงิน"""
@@ -768,91 +1176,102 @@ class DSLAutoFillBot:
             
             # 1. Login อัตโนมัติ (เฉพาะไฟล์แรก)
             if not hasattr(self, '_sign_contract_login_completed'):
-                if not self.auto_sign_contract_login():
-                    return False
+                if not self.timed_step("login", self.auto_sign_contract_login):
+                    return self.step_failed("login")
                 self._sign_contract_login_completed = True
             else:
                 # สำหรับไฟล์ถัดๆ ไป ให้ไปที่หน้าทำงานโดยตรง
-                current_url = self.driver.current_url
-                if config.SIGN_CONTRACT_URL not in current_url:
-                    self.log(f"🎯 กลับไปหน้าลงนามสัญญา: {config.SIGN_CONTRACT_URL}")
-                    self.driver.get(config.SIGN_CONTRACT_URL)
-                    # รอให้หน้าโหลดเสร็จ
-                    WebDriverWait(self.driver, config.PAGE_LOAD_TIMEOUT).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, config.SIGN_CONTRACT_RADIO_SELECTOR))
-                    )
-                else:
-                    self.log("✅ อยู่ในหน้าลงนามสัญญาแล้ว")
+                self.timed_step("navigate", self.return_to_work_page, config.SIGN_CONTRACT_URL, config.SIGN_CONTRACT_RADIO_SELECTOR, "หน้าลงนามสัญญา")
+            
+            # ตรวจจากดัชนีตารางผลลัพธ์ก่อน (ถ้าเปิดใช้) - ไฟล์ที่ลงนามแล้วใน batch นี้ไม่ต้องค้นหา
+            row_state = self.lookup_result_index("sign-contract", filename)
+            if row_state == ROW_DONE:
+                self.log(f"🎯 ไฟล์ '{filename}' ลงนามสัญญาแล้วใน batch นี้ (จากดัชนีตาราง) - ย้ายไป completed")
+                self.log_duplicate_action(filename)  # บันทึกเป็น duplicate action
+                return FileOutcome(OUTCOME_DUPLICATE)
+            if row_state == ROW_MISSING:
+                self.log_warning(f"⚠️  ไม่เจอรายการสำหรับไฟล์ '{filename}' (จากดัชนีตาราง) - ข้ามไปไฟล์ถัดไป")
+                return FileOutcome(OUTCOME_NOT_FOUND)
             
             # 2. เลือก Radio Button #radio2
-            if not self.wait_and_click(config.SIGN_CONTRACT_RADIO_SELECTOR, "Radio Button #radio2 (ลงนามสัญญา)"):
-                return False
+            if not self.timed_step("radio_select", self.wait_and_click, config.SIGN_CONTRACT_RADIO_SELECTOR, "Radio Button #radio2 (ลงนามสัญญา)", expect="checked"):
+                return self.step_failed("radio_select")
             
-            # 3. กรอกชื่อไฟล์ (ตัดนามสกุลออก) ในช่องค้นหา
-            search_text = self.extract_filename_without_extension(filename)
-            if not self.wait_and_send_keys(config.SIGN_CONTRACT_SEARCH_INPUT_SELECTOR, search_text, "ช่องค้นหา (ลงนามสัญญา)"):
-                return False
-            
-            # 4. คลิกปุ่มค้นหา
-            if not self.wait_and_click(config.SIGN_CONTRACT_SEARCH_BUTTON_SELECTOR, "ปุ่มค้นหา (ลงนามสัญญา)"):
-                return False
+            # 3-4. กรอกชื่อไฟล์ (ตัดนามสกุลออก) ในช่องค้นหา แล้วคลิกปุ่มค้นหา
+            with self.trace_step("search") as span:
+                search_text = self.extract_filename_without_extension(filename)
+                span.ok = (self.wait_and_send_keys(config.SIGN_CONTRACT_SEARCH_INPUT_SELECTOR, search_text, "ช่องค้นหา (ลงนามสัญญา)") and
+                           self.wait_and_click(config.SIGN_CONTRACT_SEARCH_BUTTON_SELECTOR, "ปุ่มค้นหา (ลงนามสัญญา)", expect="sign_contract_search_results"))
+            if not span.ok:
+                return self.step_failed("search")
             
             # 5. รอผลการค้นหา
-            try:
-                WebDriverWait(self.driver, 5).until(
-                    lambda driver: driver.find_elements(By.CSS_SELECTOR, config.SIGN_CONTRACT_BUTTON_SELECTOR) or 
-                                  driver.find_elements(By.CSS_SELECTOR, ".no-data, .empty-result")
-                )
-            except TimeoutException:
-                pass  # จะตรวจในขั้นตอนถัดไป
+            with self.trace_step("result_wait"):
+                try:
+                    WebDriverWait(self.driver, 5).until(
+                        lambda driver: driver.find_elements(By.CSS_SELECTOR, config.SIGN_CONTRACT_BUTTON_SELECTOR) or 
+                                      driver.find_elements(By.CSS_SELECTOR, ".no-data, .empty-result")
+                    )
+                except TimeoutException:
+                    pass  # จะตรวจในขั้นตอนถัดไป
             
             # 6. ตรวจสอบปุ่มลงนามสัญญา
-            has_sign_contract_button = self.check_button_by_text(config.SIGN_CONTRACT_BUTTON_SELECTOR, "ลงนามสัญญา", "ไฟล์พร้อมลงนามสัญญา", timeout=3)
+            if row_state == ROW_NEEDS_CONSENT:
+                has_sign_contract_button = True  # รู้สถานะจากดัชนีแล้ว ไม่ต้องรอตรวจข้อความปุ่ม
+            else:
+                has_sign_contract_button = self.timed_step("button_detection", self.check_button_by_text, config.SIGN_CONTRACT_BUTTON_SELECTOR, "ลงนามสัญญา", "ไฟล์พร้อมลงนามสัญญา", timeout=3)
             
             if not has_sign_contract_button:
                 self.log_warning(f"⚠️  ไม่เจอรายการสำหรับไฟล์ '{filename}' - ข้ามไปไฟล์ถัดไป")
-                return False
+                return FileOutcome(OUTCOME_NOT_FOUND)
             
             self.log(f"🔍 พบปุ่มลงนามสัญญา - ไฟล์พร้อมลงนามสัญญา")
             
             # 7. คลิกปุ่มลงนามสัญญา
-            if not self.wait_and_click(config.SIGN_CONTRACT_BUTTON_SELECTOR, "ปุ่มลงนามสัญญา"):
-                return False
+            if not self.timed_step("row_action", self.wait_and_click, config.SIGN_CONTRACT_BUTTON_SELECTOR, "ปุ่มลงนามสัญญา", expect="sign_contract_consent_page"):
+                return self.step_failed("row_action")
             
             # 8. จัดการ Checkbox แบบ Dynamic (รองรับ 2 หรือ 3 checkbox)
-            if not self.handle_dynamic_checkboxes("sign-contract"):
-                return False
+            if not self.timed_step("checkboxes", self.handle_dynamic_checkboxes, "sign-contract"):
+                return self.step_failed("checkboxes")
             
             # 9. คลิกปุ่มยืนยันใน consent page
-            if not self.wait_and_click(config.SIGN_CONTRACT_CONSENT_CONFIRM_BUTTON_SELECTOR, "ปุ่มยืนยันใน Consent Page (ลงนามสัญญา)"):
-                return False
+            if not self.timed_step("consent_confirm", self.wait_and_click, config.SIGN_CONTRACT_CONSENT_CONFIRM_BUTTON_SELECTOR, "ปุ่มยืนยันใน Consent Page (ลงนามสัญญา)", expect="sign_contract_consent_success"):
+                return self.step_failed("consent_confirm")
             
             # 10. คลิกปุ่มไปหน้าเลือกไฟล์
-            if not self.wait_and_click(config.SIGN_CONTRACT_GO_TO_FILE_SELECTION_BUTTON_SELECTOR, "ปุ่มไปหน้าเลือกไฟล์ (ลงนามสัญญา)"):
-                return False
+            if not self.timed_step("go_to_upload", self.wait_and_click, config.SIGN_CONTRACT_GO_TO_FILE_SELECTION_BUTTON_SELECTOR, "ปุ่มไปหน้าเลือกไฟล์ (ลงนามสัญญา)", expect="sign_contract_import_page"):
+                return self.step_failed("go_to_upload")
             
             # 11. อัปโหลดไฟล์
             file_path = os.path.abspath(os.path.join(source_directory, filename))
-            if not self.wait_and_upload_file(config.SIGN_CONTRACT_FILE_INPUT_SELECTOR, file_path, "ช่องเลือกไฟล์ (ลงนามสัญญา)"):
-                return False
+            if not self.timed_step("upload", self.wait_and_upload_file, config.SIGN_CONTRACT_FILE_INPUT_SELECTOR, file_path, "ช่องเลือกไฟล์ (ลงนามสัญญา)", expect="sign_contract_file_attached"):
+                return self.step_failed("upload", file_path)
             
             # 12. คลิกปุ่มยืนยันการอัปโหลดไฟล์
-            if not self.wait_and_click(config.SIGN_CONTRACT_FILE_UPLOAD_CONFIRM_BUTTON_SELECTOR, "ปุ่มยืนยันการอัปโหลดไฟล์ (ลงนามสัญญา)"):
-                return False
+            if not self.timed_step("upload_confirm", self.wait_and_click, config.SIGN_CONTRACT_FILE_UPLOAD_CONFIRM_BUTTON_SELECTOR, "ปุ่มยืนยันการอัปโหลดไฟล์ (ลงนามสัญญา)", expect="sign_contract_import_success"):
+                return self.step_failed("upload_confirm")
             
             # 13. คลิกปุ่มกลับหน้าแรกเพื่อทำซ้ำ
-            if not self.wait_and_click(config.SIGN_CONTRACT_BACK_TO_START_BUTTON_SELECTOR, "ปุ่มกลับหน้าแรก (ลงนามสัญญา)"):
-                return False
+            if not self.timed_step("back_to_start", self.wait_and_click, config.SIGN_CONTRACT_BACK_TO_START_BUTTON_SELECTOR, "ปุ่มกลับหน้าแรก (ลงนามสัญญา)", expect="sign_contract_search_page"):
+                return self.step_failed("back_to_start")
             
+            self.mark_result_index("sign-contract", filename, ROW_DONE)
             self.log(f"🎉 ลงนามสัญญากับไฟล์ '{filename}' เสร็จสิ้นสำเร็จ!")
-            return True
+            return FileOutcome(OUTCOME_SUCCESS)
             
         except Exception as e:
             self.log_error(f"💥 เกิดข้อผิดพลาดขณะลงนามสัญญากับไฟล์ '{filename}': {str(e)}")
-            return False
+            return FileOutcome.from_exception(e)
 
     def auto_sign_contract_login(self):
         """Login และไปหน้าลงนามสัญญาอัตโนมัติ"""
+        # ใช้เบราว์เซอร์ที่ login ค้างไว้ หรือ session ที่บันทึกไว้ก่อน
+        if self.resume_warm_browser(config.SIGN_CONTRACT_URL, config.SIGN_CONTRACT_RADIO_SELECTOR):
+            return True
+        if self.restore_cached_session(config.SIGN_CONTRACT_URL, config.SIGN_CONTRACT_RADIO_SELECTOR):
+            return True
+        
         try:
             self.log("🔐 เริ่มกระบวนการ Login สำหรับลงนามสัญญา...")
             
@@ -870,7 +1289,7 @@ class DSLAutoFillBot:
             time.sleep(2)
             
             # 2. ดึงข้อมูลผู้ใช้ปัจจุบัน
-            current_user = self.user_manager.get_current_user()
+            _, current_user = self.get_active_account()
             if not current_user:
                 self.log_error("❌ ไม่พบข้อมูลผู้ใช้ กรุณาจัดการผู้ใช้งานก่อน")
                 return False
@@ -914,6 +1333,8 @@ class DSLAutoFillBot:
             
             
             self.log("✅ Login สำเร็จ! พร้อมเริ่มลงนามสัญญา")
+            self.browser.mark_logged_in()
+            self.save_cached_session()
             return True
             
         except Exception as e:
@@ -950,6 +1371,305 @@ class DSLAutoFillBot:
                 print(f"❌ เกิดข้อผิดพลาด: {str(e)}")
                 return '0'
 
+    def new_batch_summary(self, total_files):
+        """สร้างตัวนับผลลัพธ์สำหรับ batch ใหม่ (ใช้ร่วมกันระหว่าง worker)"""
+        return {"total": total_files, "success": 0, "failed": 0, "skipped": 0, "retried": 0}
+
+    def record_file_result(self, filename, result, source_directory, summary):
+        """บันทึกผลลัพธ์ของไฟล์หนึ่งไฟล์ (นับผล, เขียน log, ย้ายไฟล์ หรือเข้าคิวลองใหม่)"""
+        outcome = FileOutcome.from_result(result)
+        if outcome:
+            with self.result_lock:
+                summary["success"] += 1
+            self.log(f"✅ สำเร็จ: {filename}")
+            self.log_success(filename)  # บันทึกลงไฟล์ success.log
+            
+            # ย้ายไฟล์ไปโฟลเดอร์ completed
+            destination = self.move_file_to_completed(filename, source_directory)
+            duplicate = outcome.kind == OUTCOME_DUPLICATE or getattr(self, 'current_duplicate', False)
+            state = JOB_DUPLICATE if duplicate else JOB_SUCCESS
+            self.journal.mark_finished(self.current_feature, filename, state, destination=destination or None)
+            self.count_file("duplicate" if duplicate else "success")
+            self.report_progress()
+            
+        elif outcome.kind == OUTCOME_NOT_FOUND:
+            with self.result_lock:
+                summary["skipped"] += 1
+            self.log(f"⏭️  ข้าม: {filename}")
+            self.log_failed(filename)  # บันทึกลงไฟล์ failed.log (ถือว่าไม่สำเร็จ)
+            
+            # ย้ายไฟล์ไปโฟลเดอร์ failed
+            destination = self.move_file_to_failed(filename, source_directory)
+            self.journal.mark_finished(self.current_feature, filename, JOB_SKIPPED, "not_found", destination=destination or None)
+            self.count_file("skipped")
+            self.report_progress()
+            
+        elif outcome.kind == OUTCOME_LOGIN_FAILED:
+            # login ไม่ผ่าน ไฟล์ถัดไปก็ไม่ผ่าน - หยุด batch ไม่เข้าคิวลองใหม่ ไฟล์อยู่ที่เดิม (journal เป็น pending ให้ --resume ทำต่อได้)
+            if not self.login_failed.is_set():
+                self.login_failed.set()
+                self.log_error("🔒 Login ไม่สำเร็จ - หยุด batch (ตรวจสอบชื่อผู้ใช้/รหัสผ่านแล้วรันใหม่ด้วย --resume)")
+            self.journal.mark_finished(self.current_feature, filename, JOB_PENDING, OUTCOME_LOGIN_FAILED, outcome.reason)
+            
+        else:
+            # ล้มเหลวชั่วคราว: เก็บไฟล์ไว้ที่เดิมแล้วลองใหม่ท้าย batch (journal ยังเป็น pending ให้ --resume ทำต่อได้)
+            retry = None
+            if outcome.kind == OUTCOME_TRANSIENT:
+                retry = self.retry_queue.schedule(self.current_feature, filename, source_directory, self.account_id)
+            if retry:
+                attempt, delay = retry
+                with self.result_lock:
+                    summary["retried"] += 1
+                self.log_warning(f"🔁 ล้มเหลวชั่วคราว ({outcome.step}): {filename} - ลองใหม่ครั้งที่ {attempt}/{config.RETRY_MAX_ATTEMPTS} ในอีก {delay} วินาที")
+                self.journal.mark_finished(self.current_feature, filename, JOB_PENDING, OUTCOME_TRANSIENT, outcome.reason)
+                if self.metrics:
+                    self.metrics.inc("dsl_file_retries_total", {"feature": self.current_feature})
+                return
+            
+            with self.result_lock:
+                summary["failed"] += 1
+            self.log_error(f"❌ ล้มเหลว ({outcome.kind}): {filename}")
+            self.log_failed(filename, outcome.reason)  # บันทึกลงไฟล์ failed.log
+            
+            # ย้ายไฟล์ไปโฟลเดอร์ failed
+            destination = self.move_file_to_failed(filename, source_directory)
+            self.journal.mark_finished(self.current_feature, filename, JOB_FAILED, outcome.kind, outcome.reason, destination or None)
+            self.count_file("failed")
+            self.report_progress()
+
+    def report_progress(self, count=1):
+        """นับไฟล์ที่จบแล้วและแสดงความคืบหน้า/เวลาที่เหลือเป็นระยะ"""
+        if self.progress is None:
+            return
+        message = self.progress.file_done(count)
+        if message:
+            self.log_summary(message)
+
+    def process_retries(self, feature_type, summary, wait=True):
+        """
+        ลองไฟล์ที่ล้มเหลวชั่วคราวใหม่ (เรียกหลังทำไฟล์ในคิวหลักหมดแล้ว)
+        wait=False: ทำเฉพาะไฟล์ที่ถึงเวลาแล้ว ไม่รอ (โหมดเฝ้าโฟลเดอร์)
+        """
+        while not self.batch_stopped():
+            item = self.retry_queue.pop(feature_type, self.account_id, wait, self.root.deadline)
+            if item is None:
+                break
+            filename = item["filename"]
+            self.log(f"\n{'='*60}")
+            self.log(f"🔁 ลองใหม่ครั้งที่ {item['attempt']}/{config.RETRY_MAX_ATTEMPTS}: '{filename}'")
+            self.log(f"{'='*60}")
+            result = self.process_file_with_trace(feature_type, filename, item["source_directory"])
+            self.record_file_result(filename, result, item["source_directory"], summary)
+        
+        if wait and self.retry_queue.pending_count():
+            self.log_warning(f"⏰ ยังมีไฟล์รอลองใหม่ {self.retry_queue.pending_count()} ไฟล์ - อยู่ที่โฟลเดอร์เดิม (ทำต่อได้ด้วย --resume)")
+
+    def get_process_function(self, feature_type):
+        """เลือกฟังก์ชันประมวลผลไฟล์ตามฟีเจอร์"""
+        if feature_type == "sign-contract":
+            return self.process_sign_contract_file
+        return self.process_single_file
+
+    def get_batch_files(self, feature_type, source_directory):
+        """รายชื่อไฟล์ของ batch (FileScanner) - โหมด --resume ใช้ไฟล์ที่ค้างใน journal (list) โดยไม่ต้องสแกนโฟลเดอร์"""
+        if self.resume:
+            self.resume = False  # ทำต่อเฉพาะครั้งแรกที่เลือกฟีเจอร์
+            # ไฟล์ในโฟลเดอร์ของบัญชี (<user_id>/...) เป็นของโหมด --accounts ไม่ใช่ของบัญชีปัจจุบัน
+            accounts = self.user_manager.data.get("users", {})
+            pending = [f for f in self.journal.unfinished_files(feature_type) if f.split("/", 1)[0] not in accounts]
+            # ไฟล์ที่ถูกย้ายไปแล้วก่อนโปรแกรมหยุด ไม่ต้องทำซ้ำ
+            files = [f for f in pending if os.path.exists(os.path.join(str(source_directory), f))]
+            if files:
+                self.log(f"♻️  ทำต่อจาก journal: ไฟล์ที่ยังไม่เสร็จ {len(files)} ไฟล์")
+                if len(files) < len(pending):
+                    self.log_warning(f"⚠️  ไม่พบไฟล์ในโฟลเดอร์ {len(pending) - len(files)} ไฟล์ (ถูกย้ายไปแล้ว) - ข้าม")
+                return files
+            self.log("♻️  ไม่มีไฟล์ค้างใน journal - อ่านรายชื่อไฟล์จากโฟลเดอร์")
+        
+        return self.scan_files(source_directory)
+    
+    def process_files_sequentially(self, files, source_directory, feature_type, summary):
+        """ประมวลผลไฟล์ทีละไฟล์ด้วยเบราว์เซอร์เดียว (โหมดเดิม)"""
+        # เปิดเบราว์เซอร์เมื่อเลือกฟีเจอร์แล้ว (หรือใช้ตัวที่เปิดค้างไว้จากฟีเจอร์ก่อนหน้า)
+        self.browser.acquire()
+        
+        # ดำเนินการกับแต่ละไฟล์ (files อาจยังสแกนโฟลเดอร์ไม่ครบ - จำนวนทั้งหมดเป็นค่าประมาณ)
+        for i, filename in enumerate(files, 1):
+            total_label = self.progress.total_label() if self.progress else "?"
+            if self.login_failed.is_set():
+                self.log_warning(f"🔒 Login ไม่สำเร็จ - หยุดก่อนไฟล์ที่ {i}/{total_label}")
+                break
+            if self.budget_exhausted():
+                self.log_warning(f"⏰ หมดเวลาที่กำหนด - หยุดก่อนไฟล์ที่ {i}/{total_label}")
+                break
+            
+            # หน่วงเวลาระหว่างไฟล์ (เฉพาะโหมด legacy)
+            if i > 1 and self.wait_engine.legacy_mode:
+                self.log_debug(f"⏱️  รอ 2 วินาที ก่อนดำเนินการไฟล์ถัดไป...")
+                self.wait_engine.pause(2)
+            
+            self.log(f"\n{'='*60}")
+            self.log(f"📝 กำลังดำเนินการไฟล์ที่ {i}/{total_label}: '{filename}'")
+            self.log(f"{'='*60}")
+            
+            result = self.process_file_with_trace(feature_type, filename, source_directory)
+            self.record_file_result(filename, result, source_directory, summary)
+        
+        self.process_retries(feature_type, summary)
+
+    def budget_exhausted(self):
+        """เกินเวลาที่กำหนดให้ batch แล้วหรือยัง (ไฟล์ที่กำลังทำอยู่จะทำต่อจนเสร็จ)"""
+        return self.root.deadline is not None and time.time() >= self.root.deadline
+
+    def batch_stopped(self):
+        """ไม่เริ่มไฟล์ใหม่แล้ว - หมดเวลาที่กำหนด หรือ login ไม่สำเร็จ"""
+        return self.login_failed.is_set() or self.budget_exhausted()
+
+    def preflight_files(self, files, source_directory, feature_type, summary, seen_stems=None):
+        """ตรวจไฟล์ก่อนเปิดเบราว์เซอร์ - ไฟล์ที่ไม่ผ่านย้ายไป failed ทันทีพร้อมเหตุผล"""
+        if not config.PREFLIGHT_ENABLED:
+            return files
+        
+        accepted, rejected = run_preflight(files, source_directory, seen_stems)
+        for filename, reason in rejected:
+            self.log_warning(f"🚫 ไม่ผ่านการตรวจสอบ: {filename} - {reason}")
+            with self.result_lock:
+                summary["failed"] += 1
+            self.log_failed(filename, reason)
+            destination = self.move_file_to_failed(filename, source_directory)
+            self.journal.mark_finished(feature_type, filename, JOB_FAILED, "preflight", reason, destination or None)
+            self.count_file("failed", feature_type)
+        
+        if rejected:
+            self.log(f"🔎 ตรวจไฟล์แล้ว: ผ่าน {len(accepted)} ไฟล์, ไม่ผ่าน {len(rejected)} ไฟล์")
+            self.report_progress(len(rejected))
+        return accepted
+    
+    def admit_files(self, files, source_directory, feature_type, summary, batch_id, seen_stems):
+        """นับไฟล์เข้า summary, บันทึกลง journal และตรวจไฟล์ (preflight) - คืนค่าเฉพาะไฟล์ที่ผ่าน"""
+        with self.result_lock:
+            summary["total"] += len(files)
+            discovered = summary["total"]
+        self.progress.discover(discovered)
+        self.journal.enqueue(feature_type, files, source_directory, batch_id)
+        return self.preflight_files(files, source_directory, feature_type, summary, seen_stems)
+    
+    def stream_batch(self, files, source_directory, feature_type, summary, batch_id, seen_stems):
+        """
+        อ่านไฟล์ทีละ SCAN_CHUNK_SIZE ไฟล์แล้วรับเข้า batch (admit_files)
+        ส่งต่อเฉพาะไฟล์ที่ผ่าน - ทำงานระหว่างที่ไฟล์ชุดก่อนหน้ากำลังถูกประมวลผล
+        """
+        iterator = iter(files)
+        while True:
+            chunk = list(itertools.islice(iterator, config.SCAN_CHUNK_SIZE))
+            if not chunk:
+                break
+            yield from self.admit_files(chunk, source_directory, feature_type, summary, batch_id, seen_stems)
+        self.progress.finish_scan()
+    
+    def process_files(self, files, source_directory, feature_type, summary):
+        """
+        ประมวลผลไฟล์ทั้งหมด - ใช้ worker pool เมื่อ WORKER_COUNT มากกว่า 1 หรือหลายแท็บเมื่อ TAB_PIPELINE_TABS มากกว่า 1
+        files เป็น list หรือ FileScanner (อ่านโฟลเดอร์ระหว่างทำงาน) - จำนวนไฟล์ที่เจอนับเข้า summary["total"]
+        """
+        if self.root is self:
+            # batch ใหม่ (โหมดหลายบัญชี bot หลักล้างให้ก่อนเริ่มทุกบัญชี)
+            self.tracer.reset()
+            if self.command_tracer:
+                self.command_tracer.reset()
+            self.selector_stats.reset()
+            self.retry_queue.clear()
+            self.result_indexes.clear()  # ตารางผลลัพธ์เปลี่ยนไปแล้วหลัง batch ก่อน
+            self.login_failed.clear()
+        
+        estimated = files.estimate_total() if isinstance(files, FileScanner) else len(files)
+        self.progress = BatchProgress(estimated)
+        if isinstance(files, FileScanner) and estimated:
+            self.log(f"📂 พบไฟล์ประมาณ {estimated:,} ไฟล์ - เริ่มทำงานระหว่างสแกนโฟลเดอร์")
+        batch_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        seen_stems = {}
+        # เรียงไฟล์ตามความสำคัญ - ไฟล์ด่วน (โฟลเดอร์ PRIORITY_FOLDER) รับเข้าผ่าน scheduler เท่านั้น
+        # เพื่อให้ไฟล์ที่วางเพิ่มระหว่างทำงานแทรกคิวได้
+        scheduler = FileScheduler(
+            source_directory, feature_type, self.journal,
+            admit=lambda names: self.admit_files(names, source_directory, feature_type, summary, batch_id, seen_stems),
+            log=self.log
+        )
+        files = self.stream_batch(scheduler.skip_urgent(files), source_directory, feature_type, summary, batch_id, seen_stems)
+        
+        # อ่านชุดแรกก่อนเพื่อเลือกจำนวน worker/แท็บ (ชุดถัดไปอ่านระหว่างทำงาน)
+        first = list(itertools.islice(files, config.SCAN_CHUNK_SIZE))
+        urgent = scheduler.poll_urgent()
+        if not first and not urgent:
+            if summary["total"]:
+                self.log_warning("⚠️  ไม่มีไฟล์ที่ผ่านการตรวจสอบ - ไม่ต้องเปิดเบราว์เซอร์")
+            return
+        files = scheduler.order(itertools.chain(first, files))
+        first_count = len(first) + urgent
+        
+        if config.ADAPTIVE_CONCURRENCY:
+            worker_count = min(config.MAX_WORKERS, first_count)  # controller เลือกจำนวนที่ทำงานจริง
+        else:
+            worker_count = min(config.WORKER_COUNT, config.MAX_WORKERS, first_count)
+        tab_count = min(config.TAB_PIPELINE_TABS, first_count)
+        if worker_count > 1:
+            pool = BrowserWorkerPool(self, feature_type, worker_count)
+            self.root.pools.add(pool)
+            pool.run(files, source_directory, summary)
+        elif tab_count > 1 and not config.USE_EXISTING_BROWSER:
+            TabPipeline(self, feature_type, tab_count).run(files, source_directory, summary)
+        else:
+            self.process_files_sequentially(files, source_directory, feature_type, summary)
+
+    def finish_batch(self, title, summary):
+        """แสดงสรุปผลและเขียนตัวคั่นท้าย session ลงไฟล์ log"""
+        total_files = summary["total"]
+        success_count = summary["success"]
+        
+        # สรุปผลการทำงาน
+        self.log_summary(f"\n{title:=^60}")
+        self.log_summary(f"📂 ไฟล์ทั้งหมด: {total_files}")
+        self.log_summary(f"✅ สำเร็จ: {success_count}")
+        self.log_summary(f"❌ ล้มเหลว: {summary['failed']}")
+        self.log_summary(f"⏭️  ข้าม (ไม่เจอรายการ): {summary['skipped']}")
+        if summary.get("retried"):
+            self.log_summary(f"🔁 ลองใหม่หลังล้มเหลวชั่วคราว: {summary['retried']} ครั้ง")
+        self.log_summary(f"📊 อัตราความสำเร็จ: {(success_count/total_files*100):.1f}%")
+        self.log_summary(f"📄 ไฟล์ผลลัพธ์: success.log, failed.log, duplicate.log")
+        
+        # เวลาแต่ละขั้นตอน - ดูว่าหน้าไหนของเว็บไซต์เป็นคอขวด
+        self.log_summary(f"{'⏱️  เวลาแต่ละขั้นตอน':-^60}")
+        for line in self.tracer.format_summary():
+            self.log_summary(line)
+        if self.tracer.trace_path:
+            self.log_summary(f"📄 Trace: {self.tracer.trace_path.name}")
+        
+        # เวลาค้นหา element แต่ละ selector และ selector สำรองที่ถูกใช้จริง
+        self.log_summary(f"{'🔎 การค้นหา element':-^60}")
+        for line in self.selector_stats.format_report():
+            self.log_summary(line)
+        
+        # WebDriver command ต่อไฟล์ แยกตามขั้นตอนและ method ที่เรียก (โหมด COMMAND_TRACE_ENABLED)
+        if self.command_tracer:
+            self.log_summary(f"{'🔁 WebDriver commands':-^60}")
+            for line in self.command_tracer.format_report():
+                self.log_summary(line)
+            self.log_summary(f"📄 รายงานต่อไฟล์: {self.command_tracer.report_path.name}")
+        self.log_summary(f"{'='*60}")
+        
+        # เพิ่มตัวคั่นท้าย session
+        session_end = f"==================== SESSION END: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} (Success: {success_count}/{total_files}) ====================\n\n"
+        with open(str(self.success_log_file), 'a', encoding='utf-8') as f:
+            f.write(session_end)
+        with open(str(self.failed_log_file), 'a', encoding='utf-8') as f:
+            f.write(session_end)
+        
+        # เพิ่มตัวคั่นท้าย session ใน duplicate.log ด้วย (ถ้ามี)
+        if hasattr(self, '_duplicate_session_started'):
+            duplicate_log_file = get_log_file_path("duplicate.log")
+            with open(str(duplicate_log_file), 'a', encoding='utf-8') as f:
+                f.write(session_end)
+
     def run_loan_disbursement_feature(self):
         """รันฟีเจอร์ลงนามแบบยืนยันการเบิกเงินกู้ยืม (ฟีเจอร์เดิม)"""
         try:
@@ -959,96 +1679,24 @@ class DSLAutoFillBot:
             if hasattr(self, '_login_completed'):
                 delattr(self, '_login_completed')
             
-            # เปิดเบราว์เซอร์เมื่อเลือกฟีเจอร์แล้ว
-            self.setup_driver()
-            
             # ดึงรายชื่อไฟล์จากโฟลเดอร์ disbursement
             disbursement_dir = get_files_directory() / "disbursement"
-            files = self.get_files_list(disbursement_dir)
-            if not files:
+            files = self.get_batch_files("disbursement", disbursement_dir)
+            summary = self.new_batch_summary(0)
+            self.process_files(files, disbursement_dir, "disbursement", summary)
+            if not summary["total"]:
                 self.log_warning("⚠️  ไม่พบไฟล์ในโฟลเดอร์ disbursement หรือไฟล์ไม่ถูกต้อง")
                 return
             
-            success_count = 0
-            failed_count = 0
-            skipped_count = 0
-            total_files = len(files)
-            
-            self.log(f"📂 พบไฟล์ทั้งหมด {total_files} ไฟล์")
-            
-            # ดำเนินการกับแต่ละไฟล์
-            for i, filename in enumerate(files, 1):
-                self.log(f"\n{'='*60}")
-                self.log(f"📝 กำลังดำเนินการไฟล์ที่ {i}/{total_files}: '{filename}'")
-                self.log(f"{'='*60}")
-                
-                
-                result = self.process_single_file(filename, disbursement_dir)
-                
-                if result:
-                    success_count += 1
-                    self.log(f"✅ สำเร็จ: {filename}")
-                    self.log_success(filename)  # บันทึกลงไฟล์ success.log
-                    
-                    # ย้ายไฟล์ไปโฟลเดอร์ completed
-                    self.move_file_to_completed(filename, disbursement_dir)
-                    
-                else:
-                    # ตรวจสอบว่าเป็นการข้ามเพราะไม่เจอรายการ หรือ error จริง
-                    if "ไม่เจอรายการ" in str(self.log):  # ถ้าไม่เจอรายการ
-                        skipped_count += 1
-                        self.log(f"⏭️  ข้าม: {filename}")
-                        self.log_failed(filename)  # บันทึกลงไฟล์ failed.log (ถือว่าไม่สำเร็จ)
-                        
-                        # ย้ายไฟล์ไปโฟลเดอร์ failed
-                        self.move_file_to_failed(filename, disbursement_dir)
-                        
-                    else:  # ถ้าเป็น error จริง
-                        failed_count += 1
-                        self.log_error(f"❌ ล้มเหลว: {filename}")
-                        self.log_failed(filename)  # บันทึกลงไฟล์ failed.log
-                        
-                        # ย้ายไฟล์ไปโฟลเดอร์ failed
-                        self.move_file_to_failed(filename, disbursement_dir)
-                
-                # หน่วงเวลาระหว่างไฟล์
-                if i < total_files:
-                    self.log(f"⏱️  รอ 2 วินาที ก่อนดำเนินการไฟล์ถัดไป...")
-                    time.sleep(2)
-            
-            # สรุปผลการทำงาน
-            self.log(f"\n{'🎯 สรุปผลการทำงาน':=^60}")
-            self.log(f"📂 ไฟล์ทั้งหมด: {total_files}")
-            self.log(f"✅ สำเร็จ: {success_count}")
-            self.log(f"❌ ล้มเหลว: {failed_count}")
-            self.log(f"⏭️  ข้าม (ไม่เจอรายการ): {skipped_count}")
-            self.log(f"📊 อัตราความสำเร็จ: {(success_count/total_files*100):.1f}%")
-            self.log(f"📄 ไฟล์ผลลัพธ์: success.log, failed.log, duplicate.log")
-            self.log(f"{'='*60}")
-            
-            # เพิ่มตัวคั่นท้าย session
-            session_end = f"==================== SESSION END: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} (Success: {success_count}/{total_files}) ====================\n\n"
-            with open(str(self.success_log_file), 'a', encoding='utf-8') as f:
-                f.write(session_end)
-            with open(str(self.failed_log_file), 'a', encoding='utf-8') as f:
-                f.write(session_end)
-            
-            # เพิ่มตัวคั่นท้าย session ใน duplicate.log ด้วย (ถ้ามี)
-            if hasattr(self, '_duplicate_session_started'):
-                duplicate_log_file = get_log_file_path("duplicate.log")
-                with open(str(duplicate_log_file), 'a', encoding='utf-8') as f:
-                    f.write(session_end)
+            self.finish_batch("🎯 สรุปผลการทำงาน", summary)
             
         except KeyboardInterrupt:
             self.log_warning("⚠️  โปรแกรมถูกยกเลิกโดยผู้ใช้")
         except Exception as e:
             self.log_error(f"💥 เกิดข้อผิดพลาดร้ายแรง: {str(e)}")
         finally:
-            # ปิดเบราว์เซอร์เมื่อเสร็จสิ้นฟีเจอร์
-            if hasattr(self, 'driver') and self.driver:
-                self.driver.quit()
-                self.log("🔚 ปิดเบราว์เซอร์แล้ว")
-                self.driver = None
+            # เก็บเบราว์เซอร์ที่ login แล้วไว้ให้ฟีเจอร์ถัดไป (ปิดเมื่อออกจากโปรแกรม)
+            self.browser.release()
             
             # รอให้ผู้ใช้กด Enter เพื่อกลับหน้าแรก
             print()
@@ -1063,90 +1711,24 @@ class DSLAutoFillBot:
             if hasattr(self, '_sign_contract_login_completed'):
                 delattr(self, '_sign_contract_login_completed')
             
-            # เปิดเบราว์เซอร์เมื่อเลือกฟีเจอร์แล้ว
-            self.setup_driver()
-            
             # ดึงรายชื่อไฟล์จากโฟลเดอร์ sign-contract
             sign_contract_dir = get_files_directory() / "sign-contract"
-            files = self.get_files_list(sign_contract_dir)
-            if not files:
+            files = self.get_batch_files("sign-contract", sign_contract_dir)
+            summary = self.new_batch_summary(0)
+            self.process_files(files, sign_contract_dir, "sign-contract", summary)
+            if not summary["total"]:
                 self.log_warning("⚠️  ไม่พบไฟล์ในโฟลเดอร์ sign-contract หรือไฟล์ไม่ถูกต้อง")
                 return
             
-            success_count = 0
-            failed_count = 0
-            skipped_count = 0
-            total_files = len(files)
-            
-            self.log(f"📂 พบไฟล์ทั้งหมด {total_files} ไฟล์")
-            
-            # ดำเนินการกับแต่ละไฟล์
-            for i, filename in enumerate(files, 1):
-                self.log(f"\n{'='*60}")
-                self.log(f"✍️  กำลังลงนามสัญญาไฟล์ที่ {i}/{total_files}: '{filename}'")
-                self.log(f"{'='*60}")
-                
-                
-                result = self.process_sign_contract_file(filename, sign_contract_dir)
-                
-                if result:
-                    success_count += 1
-                    self.log(f"✅ สำเร็จ: {filename}")
-                    self.log_success(filename)  # บันทึกลงไฟล์ success.log
-                    
-                    # ย้ายไฟล์ไปโฟลเดอร์ completed
-                    self.move_file_to_completed(filename, sign_contract_dir)
-                    
-                else:
-                    # ตรวจสอบว่าเป็นการข้ามเพราะไม่เจอรายการ หรือ error จริง
-                    if "ไม่เจอรายการ" in str(self.log):  # ถ้าไม่เจอรายการ
-                        skipped_count += 1
-                        self.log(f"⏭️  ข้าม: {filename}")
-                        self.log_failed(filename)  # บันทึกลงไฟล์ failed.log (ถือว่าไม่สำเร็จ)
-                        
-                        # ย้ายไฟล์ไปโฟลเดอร์ failed
-                        self.move_file_to_failed(filename, sign_contract_dir)
-                        
-                    else:  # ถ้าเป็น error จริง
-                        failed_count += 1
-                        self.log_error(f"❌ ล้มเหลว: {filename}")
-                        self.log_failed(filename)  # บันทึกลงไฟล์ failed.log
-                        
-                        # ย้ายไฟล์ไปโฟลเดอร์ failed
-                        self.move_file_to_failed(filename, sign_contract_dir)
-                
-                # หน่วงเวลาระหว่างไฟล์
-                if i < total_files:
-                    self.log(f"⏱️  รอ 2 วินาที ก่อนดำเนินการไฟล์ถัดไป...")
-                    time.sleep(2)
-            
-            # สรุปผลการทำงาน
-            self.log(f"\n{'🎯 สรุปผลการลงนามสัญญา':=^60}")
-            self.log(f"📂 ไฟล์ทั้งหมด: {total_files}")
-            self.log(f"✅ สำเร็จ: {success_count}")
-            self.log(f"❌ ล้มเหลว: {failed_count}")
-            self.log(f"⏭️  ข้าม (ไม่เจอรายการ): {skipped_count}")
-            self.log(f"📊 อัตราความสำเร็จ: {(success_count/total_files*100):.1f}%")
-            self.log(f"📄 ไฟล์ผลลัพธ์: success.log, failed.log")
-            self.log(f"{'='*60}")
-            
-            # เพิ่มตัวคั่นท้าย session
-            session_end = f"==================== SESSION END: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} (Success: {success_count}/{total_files}) ====================\n\n"
-            with open(str(self.success_log_file), 'a', encoding='utf-8') as f:
-                f.write(session_end)
-            with open(str(self.failed_log_file), 'a', encoding='utf-8') as f:
-                f.write(session_end)
+            self.finish_batch("🎯 สรุปผลการลงนามสัญญา", summary)
             
         except KeyboardInterrupt:
             self.log_warning("⚠️  โปรแกรมถูกยกเลิกโดยผู้ใช้")
         except Exception as e:
             self.log_error(f"💥 เกิดข้อผิดพลาดร้ายแรง: {str(e)}")
         finally:
-            # ปิดเบราว์เซอร์เมื่อเสร็จสิ้นฟีเจอร์
-            if hasattr(self, 'driver') and self.driver:
-                self.driver.quit()
-                self.log("🔚 ปิดเบราว์เซอร์แล้ว")
-                self.driver = None
+            # เก็บเบราว์เซอร์ที่ login แล้วไว้ให้ฟีเจอร์ถัดไป (ปิดเมื่อออกจากโปรแกรม)
+            self.browser.release()
             
             # รอให้ผู้ใช้กด Enter เพื่อกลับหน้าแรก
             print()
@@ -1201,11 +1783,223 @@ class DSLAutoFillBot:
         finally:
             self.cleanup()
     
+    def run_multi_account(self, feature_type, account_ids):
+        """รันหลายบัญชีพร้อมกัน - ไฟล์ของแต่ละบัญชีอยู่ใน files/<feature>/<user_id>/"""
+        runner = None
+        try:
+            users = self.user_manager.data["users"]
+            if account_ids == ["all"]:
+                account_ids = list(users)
+            unknown = [user_id for user_id in account_ids if user_id not in users]
+            if unknown:
+                self.log_error(f"❌ ไม่พบบัญชี: {', '.join(unknown)} (มีบัญชี: {', '.join(users) or '-'})")
+                return
+            
+            self.log(f"👥 เริ่มโหมดหลายบัญชี ({feature_type}): {', '.join(account_ids)}")
+            self.tracer.reset()
+            if self.command_tracer:
+                self.command_tracer.reset()
+            self.selector_stats.reset()
+            self.result_indexes.clear()
+            
+            runner = MultiAccountRunner(self, feature_type, account_ids)
+            runner.run()
+            
+        except KeyboardInterrupt:
+            self.log_warning("⚠️  โปรแกรมถูกยกเลิกโดยผู้ใช้")
+        except Exception as e:
+            self.log_error(f"💥 เกิดข้อผิดพลาดร้ายแรง: {str(e)}")
+        finally:
+            # สรุปผลเท่าที่ทำได้แม้หยุดกลางคัน
+            if runner is not None:
+                self.finish_multi_account(runner)
+            self.cleanup()
+    
+    def finish_multi_account(self, runner):
+        """แสดงผลแยกตามบัญชีและสรุปผลรวม"""
+        summary = runner.total_summary()
+        if not summary["total"]:
+            self.log_warning("⚠️  ไม่พบไฟล์ของบัญชีใดเลย")
+            return
+        
+        self.log(f"{'👥 ผลแยกตามบัญชี':-^60}")
+        for line in runner.format_account_summary():
+            self.log(line)
+        self.finish_batch("🎯 สรุปผลรวมทุกบัญชี", summary)
+    
+    def restore_failed_files(self, feature_type, target_directory):
+        """ย้ายไฟล์ใน failed/<feature>/ ที่ถึงเวลาลองใหม่กลับเข้าโฟลเดอร์งาน (โหมด --retry-failed)"""
+        failed_directory = self.failed_sign_contract_dir if feature_type == "sign-contract" else self.failed_disbursement_dir
+        return FailedRetry(self, feature_type, failed_directory).restore(target_directory)
+
+    def run_batch(self, feature_type, source_directory=None, max_files=None, max_minutes=None, summary_path=None, retry_failed=False,
+                  report_stream=None):
+        """
+        โหมด batch สำหรับตั้งเวลารัน (ไม่มีเมนูและไม่รอกด Enter)
+        retry_failed=True: ทำเฉพาะไฟล์ที่ดึงกลับมาจาก failed/<feature>/
+        พิมพ์สรุปผลเป็น JSON ทาง report_stream (ค่าเริ่มต้น stdout) และคืนค่า exit code: 0 = สำเร็จทั้งหมด, 1 = สำเร็จบางส่วน, 2 = ล้มเหลว
+        """
+        started_at = datetime.now()
+        source_directory = Path(source_directory) if source_directory else get_files_directory() / feature_type
+        summary = self.new_batch_summary(0)
+        status = "error"
+        
+        try:
+            user_id, current_user = self.get_active_account()
+            if not current_user:
+                self.log_error(f"❌ ไม่พบบัญชี {user_id or '(ยังไม่ได้เลือกผู้ใช้)'}")
+            else:
+                if self.account_id is None:
+                    self.user_manager.update_current_user_usage()
+                self.log(f"🌙 เริ่มโหมด batch ({feature_type}) บัญชี {user_id}: {source_directory}")
+                
+                if retry_failed:
+                    files = self.restore_failed_files(feature_type, source_directory)
+                else:
+                    files = self.get_batch_files(feature_type, source_directory)
+                if max_files:
+                    self.log(f"📦 จำกัดจำนวนไฟล์ไม่เกิน {max_files} ไฟล์")
+                    if isinstance(files, FileScanner):
+                        files.limit = max_files
+                    else:
+                        files = files[:max_files]
+                if max_minutes:
+                    self.deadline = time.time() + max_minutes * 60
+                
+                self.process_files(files, source_directory, feature_type, summary)
+                if summary["total"]:
+                    self.finish_batch("🎯 สรุปผลโหมด batch", summary)
+                else:
+                    self.log_warning(f"⚠️  ไม่พบไฟล์ใน {source_directory}")
+                status = "login_failed" if self.login_failed.is_set() else "completed"
+                
+        except KeyboardInterrupt:
+            status = "interrupted"
+            self.log_warning("⚠️  โปรแกรมถูกยกเลิกโดยผู้ใช้")
+        except Exception as e:
+            self.log_error(f"💥 เกิดข้อผิดพลาดร้ายแรง: {str(e)}")
+        finally:
+            self.cleanup()
+        
+        remaining = summary["total"] - summary["success"] - summary["failed"] - summary["skipped"]
+        if status == "completed" and remaining and self.budget_exhausted():
+            status = "budget_exhausted"
+        
+        if status == "completed" and not summary["failed"] and not summary["skipped"]:
+            exit_code = 0
+        elif summary["success"]:
+            exit_code = 1
+        else:
+            exit_code = 2
+        
+        report = {
+            "feature": feature_type,
+            "account": self.get_active_account()[0],
+            "source_directory": str(source_directory),
+            "status": status,
+            "exit_code": exit_code,
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "duration_s": round((datetime.now() - started_at).total_seconds(), 1),
+            "workers": config.WORKER_COUNT,
+            "retry_failed": retry_failed,
+            "total": summary["total"],
+            "success": summary["success"],
+            "failed": summary["failed"],
+            "skipped": summary["skipped"],
+            "retried": summary["retried"],
+            "remaining": remaining,
+            "steps": self.tracer.summary(),
+        }
+        if self.command_tracer:
+            report["commands_over_budget"] = self.command_tracer.over_budget()
+        if summary_path:
+            with open(summary_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        # log ออกทาง stderr - stdout มีแค่ JSON ให้โปรแกรมอื่นอ่าน
+        print(json.dumps(report, ensure_ascii=False), file=report_stream or sys.stdout)
+        return exit_code
+    
+    def run_watch_mode(self):
+        """โหมดเฝ้าโฟลเดอร์ - ทำงานจนกด Ctrl+C"""
+        try:
+            if not self.user_manager.get_current_user():
+                self.log("❌ ไม่พบข้อมูลผู้ใช้ กรุณาเพิ่มผู้ใช้ผ่านเมนูก่อนใช้โหมดเฝ้าโฟลเดอร์")
+                return
+            self.user_manager.update_current_user_usage()
+            self.tracer.reset()
+            if self.command_tracer:
+                self.command_tracer.reset()
+            self.selector_stats.reset()
+            WatchDaemon(self).run()
+        finally:
+            self.cleanup()
+    
     def cleanup(self):
-        if self.driver:
-            self.driver.quit()
-            self.log("🔚 ปิดเบราว์เซอร์แล้ว")
+        self.tracer.close()
+        if self.command_tracer:
+            self.command_tracer.close()
+        self.journal.close()
+        self.browser.close()
 
 if __name__ == "__main__":
-    bot = DSLAutoFillBot()
-    bot.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="DSL Auto Fill Bot")
+    parser.add_argument("--resume", action="store_true", help="ทำต่อจากไฟล์ที่ยังไม่เสร็จใน journal (หลังโปรแกรมหยุดกลางคัน)")
+    parser.add_argument("--watch", action="store_true", help="เฝ้าโฟลเดอร์ files/ และดำเนินการกับไฟล์ใหม่ทันที (ไม่แสดงเมนู)")
+    parser.add_argument("--accounts", help="รันหลายบัญชีพร้อมกัน เช่น user1,user2 หรือ all (ไฟล์อยู่ใน files/<feature>/<user_id>/)")
+    parser.add_argument("--feature", choices=["disbursement", "sign-contract"], help="ฟีเจอร์ที่ใช้กับ --accounts หรือ --batch")
+    parser.add_argument("--debug", action="store_true", help="บันทึกรายละเอียดทุกขั้นตอน (แทนค่า LOG_DEBUG)")
+    parser.add_argument("--compact", action="store_true", help="หน้าจอแสดงเฉพาะคำเตือนและความคืบหน้า (แทนค่า LOG_COMPACT)")
+    parser.add_argument("--trace-commands", action="store_true", help="นับ WebDriver command ต่อไฟล์ แยกตามขั้นตอนและ method (แทนค่า COMMAND_TRACE_ENABLED)")
+    parser.add_argument("--profile", action="store_true", help="บันทึก cProfile ของการรันลง traces/profile_<session>.prof")
+    parser.add_argument("--metrics-port", type=int, help="เปิด metrics (รูปแบบ Prometheus) ที่ http://127.0.0.1:<port>/metrics")
+    batch = parser.add_argument_group("โหมด batch (ไม่มีเมนู สำหรับตั้งเวลารัน)")
+    batch.add_argument("--batch", action="store_true", help="รันฟีเจอร์ที่ระบุจนเสร็จโดยไม่ถามผู้ใช้ แล้วพิมพ์สรุปผลเป็น JSON")
+    batch.add_argument("--account", help="บัญชีที่ใช้ (ค่าเริ่มต้น: ผู้ใช้ปัจจุบัน)")
+    batch.add_argument("--input", help="โฟลเดอร์ไฟล์ (ค่าเริ่มต้น: files/<feature>/)")
+    batch.add_argument("--workers", type=int, help="จำนวนเบราว์เซอร์ที่ทำงานพร้อมกัน (แทนค่า WORKER_COUNT)")
+    batch.add_argument("--headless", action="store_true", help="รันเบราว์เซอร์แบบไม่แสดงหน้าต่าง")
+    batch.add_argument("--max-files", type=int, help="จำนวนไฟล์สูงสุดที่ทำในรอบนี้")
+    batch.add_argument("--max-minutes", type=float, help="ไม่เริ่มไฟล์ใหม่หลังผ่านไปกี่นาที")
+    batch.add_argument("--summary", help="บันทึกสรุปผล JSON ลงไฟล์นี้ด้วย")
+    batch.add_argument("--retry-failed", action="store_true", help="ดึงไฟล์ใน failed/<feature>/ ที่ถึงเวลาลองใหม่กลับมาทำอีกครั้ง")
+    args = parser.parse_args()
+    if (args.accounts or args.batch) and not args.feature:
+        parser.error("--accounts และ --batch ต้องระบุ --feature ด้วย")
+    if args.retry_failed and not args.batch:
+        parser.error("--retry-failed ใช้กับ --batch เท่านั้น")
+    
+    if args.headless:
+        config.HEADLESS_MODE = True
+    if args.workers:
+        config.WORKER_COUNT = max(1, args.workers)
+    if args.debug:
+        config.LOG_DEBUG = True
+    if args.compact:
+        config.LOG_COMPACT = True
+    if args.metrics_port:
+        config.METRICS_ENABLED = True
+        config.METRICS_PORT = args.metrics_port
+    if args.trace_commands:
+        config.COMMAND_TRACE_ENABLED = True
+    
+    report_stream = sys.stdout
+    if args.batch:
+        # stdout มีแค่ JSON สรุปผล - ข้อความอื่น (log สำรองเมื่อ LOG_ENABLED = False, ข้อความจาก UserManager) ออกทาง stderr
+        sys.stdout = sys.stderr
+    
+    bot = DSLAutoFillBot(resume=args.resume, account_id=args.account if args.batch else None)
+    profiler = Profiler(bot.tracer.session_id) if args.profile else None
+    try:
+        if args.batch:
+            sys.exit(bot.run_batch(args.feature, args.input, args.max_files, args.max_minutes, args.summary, args.retry_failed,
+                                   report_stream))
+        elif args.accounts:
+            bot.run_multi_account(args.feature, [user_id.strip() for user_id in args.accounts.split(",") if user_id.strip()])
+        elif args.watch:
+            bot.run_watch_mode()
+        else:
+            bot.run()
+    finally:
+        if profiler:
+            bot.log(f"🧪 cProfile: {profiler.dump()} (ดูด้วย python -m pstats หรือ snakeviz)")
\ No newline at end of file
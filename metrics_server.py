@@ -0,0 +1,157 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import config
+
+try:
+    # หน่วยความจำของ Chrome (pip install psutil) - ถ้าไม่มีจะไม่แสดง dsl_browser_memory_bytes
+    import psutil
+except ImportError:
+    psutil = None
+
+METRIC_HELP = {
+    "dsl_files_total": ("counter", "จำนวนไฟล์ที่จบแล้วแยกตามผลลัพธ์"),
+    "dsl_file_retries_total": ("counter", "จำนวนครั้งที่ไฟล์ล้มเหลวชั่วคราวและเข้าคิวลองใหม่"),
+    "dsl_files_in_flight": ("gauge", "จำนวนไฟล์ที่กำลังดำเนินการ"),
+    "dsl_step_duration_seconds": ("histogram", "เวลาของแต่ละขั้นตอน (วินาที)"),
+    "dsl_browsers_open": ("gauge", "จำนวนเบราว์เซอร์ที่เปิดอยู่"),
+    "dsl_browser_memory_bytes": ("gauge", "หน่วยความจำรวมของ ChromeDriver และ Chrome (RSS)"),
+    "dsl_queue_depth": ("gauge", "จำนวนไฟล์ที่รอในคิว"),
+    "dsl_batch_remaining_files": ("gauge", "จำนวนไฟล์ที่ยังไม่จบใน batch ปัจจุบัน (โดยประมาณ)"),
+}
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape_label(value)}"' for key, value in labels) + "}"
+
+
+class Metrics:
+    """
+    เก็บค่า metrics ของ bot (thread-safe) และแปลงเป็นข้อความรูปแบบ Prometheus
+    ค่าที่ต้องอ่านสดตอนถูกเรียกดู (จำนวนเบราว์เซอร์, คิว) มาจาก collector ที่ลงทะเบียนไว้
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}    # (name, labels) -> ค่า
+        self.gauges = {}
+        self.histograms = {}  # (name, labels) -> [นับแต่ละ bucket..., sum, count]
+        self.collectors = []  # ฟังก์ชันที่คืน [(name, labels, value), ...] ของ gauge
+
+    def key(self, name, labels):
+        return name, tuple(sorted((labels or {}).items()))
+
+    def inc(self, name, labels=None, value=1):
+        key = self.key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def add_gauge(self, name, labels=None, value=1):
+        key = self.key(name, labels)
+        with self.lock:
+            self.gauges[key] = self.gauges.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        key = self.key(name, labels)
+        buckets = config.METRICS_BUCKETS
+        with self.lock:
+            histogram = self.histograms.setdefault(key, [0] * len(buckets) + [0.0, 0])
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram[i] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def add_collector(self, collector):
+        self.collectors.append(collector)
+
+    def render(self):
+        """ข้อความรูปแบบ Prometheus text exposition (version 0.0.4)"""
+        with self.lock:
+            samples = {}
+            for (name, labels), value in list(self.counters.items()) + list(self.gauges.items()):
+                samples.setdefault(name, []).append((labels, value))
+            histograms = {key: list(values) for key, values in self.histograms.items()}
+        for collector in self.collectors:
+            try:
+                for name, labels, value in collector():
+                    samples.setdefault(name, []).append((tuple(sorted((labels or {}).items())), value))
+            except Exception:
+                pass  # collector พัง (เช่น เบราว์เซอร์ปิดระหว่างอ่าน) ไม่ให้หน้า metrics พังทั้งหน้า
+        for (name, labels), values in histograms.items():
+            samples.setdefault(name, []).append((labels, values))
+
+        lines = []
+        for name in sorted(samples):
+            kind, help_text = METRIC_HELP.get(name, ("gauge", name))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(samples[name], key=lambda sample: sample[0]):
+                if kind == "histogram":
+                    lines.extend(self.render_histogram(name, labels, value))
+                else:
+                    lines.append(f"{name}{format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def render_histogram(self, name, labels, values):
+        lines = []
+        for bound, count in zip(config.METRICS_BUCKETS, values):
+            lines.append(f"{name}_bucket{format_labels(labels + (('le', bound),))} {count}")
+        lines.append(f"{name}_bucket{format_labels(labels + (('le', '+Inf'),))} {values[-1]}")
+        lines.append(f"{name}_sum{format_labels(labels)} {values[-2]:.6f}")
+        lines.append(f"{name}_count{format_labels(labels)} {values[-1]}")
+        return lines
+
+
+def browser_memory(drivers):
+    """RSS รวมของ ChromeDriver และ Chrome ทุก process ลูก (ต้องมี psutil)"""
+    total = 0
+    for driver in drivers:
+        process = getattr(getattr(driver, "service", None), "process", None)
+        if process is None:
+            continue  # เชื่อมต่อเบราว์เซอร์ที่เปิดอยู่แล้ว - ไม่ใช่ process ของเรา
+        try:
+            parent = psutil.Process(process.pid)
+            total += sum(child.memory_info().rss for child in [parent] + parent.children(recursive=True))
+        except psutil.Error:
+            continue
+    return total
+
+
+class MetricsServer:
+    """เปิด http://METRICS_HOST:METRICS_PORT/metrics ใน thread เบื้องหลัง"""
+
+    def __init__(self, metrics, host, port):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # ไม่ให้ทุก request ไปรก log หลัก
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="dsl-metrics", daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,420 @@
+"""
+Mock DSL Portal - เว็บไซต์จำลองสำหรับวัดความเร็วของ bot โดยไม่ต้องใช้เว็บไซต์จริง
+โครงสร้าง DOM ตรงกับ selectors ใน config.py
+
+ชื่อไฟล์ (stem) กำหนดสถานะของรายการ:
+    *-missing   ไม่พบรายการ
+    *-done      ทำแบบเบิกเงินกู้ยืมสำเร็จแล้ว (disbursement) / ไม่มีรายการ (sign-contract)
+    *-imported  ทำ consent แล้ว เหลือนำเข้าเอกสาร (disbursement)
+    *-3cb       หน้า consent มี 3 checkbox
+    อื่นๆ        ไฟล์ใหม่ หน้า consent มี 2 checkbox
+
+วิธีใช้:
+    python mock_portal.py --port 8000 --latency-ms 200
+"""
+import time
+import html
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, quote
+
+FEATURES = ["disbursement", "sign-contract"]
+PAGE_SIZE = 20
+
+# สถานะของรายการ
+STATE_CONSENT = "consent"   # ต้องทำ consent
+STATE_IMPORT = "import"     # ทำ consent แล้ว ต้องนำเข้าเอกสาร
+STATE_DONE = "done"         # ดำเนินการสำเร็จแล้ว
+
+ROW_BUTTON_TEXT = {
+    "disbursement": {STATE_CONSENT: "ยืนยันการเบิกเงินกู้ยืม", STATE_IMPORT: "นำเข้าเอกสาร"},
+    "sign-contract": {STATE_CONSENT: "ลงนามสัญญา"},
+}
+
+
+# ไฟล์ประกอบหน้าเว็บที่ bot ไม่ได้ใช้ (รูปภาพ ฟอนต์ ตัวเก็บสถิติ) - ใช้วัดผลของเบราว์เซอร์แบบ lean
+STATIC_ASSETS = {
+    "/static/theme.css": ("text/css", (
+        "@font-face{font-family:Sarabun;src:url('/static/fonts/sarabun.woff2') format('woff2')}"
+        "body{font-family:Sarabun,sans-serif;background:url('/static/img/background.jpg')}"
+    ).encode("utf-8")),
+    "/static/fonts/sarabun.woff2": ("font/woff2", b"wOF2" + bytes(120 * 1024)),
+    "/static/img/logo.png": ("image/png", b"\x89PNG\r\n\x1a\n" + bytes(80 * 1024)),
+    "/static/img/banner.jpg": ("image/jpeg", b"\xff\xd8\xff" + bytes(300 * 1024)),
+    "/static/img/background.jpg": ("image/jpeg", b"\xff\xd8\xff" + bytes(200 * 1024)),
+    "/static/analytics.js": ("application/javascript", b"(function(){var x=new Image();x.src='/static/analytics/collect.gif';})();"),
+    "/static/analytics/collect.gif": ("image/gif", b"GIF89a" + bytes(64)),
+}
+
+
+def layout(inner, title="DSL Mock Portal"):
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+        f"<title>{title}</title>"
+        "<link rel='stylesheet' href='/static/theme.css'>"
+        "<script async src='/static/analytics.js'></script></head><body>"
+        "<dsl-workspace-root><app-content-layout>"
+        "<header><img src='/static/img/logo.png' alt=''><img src='/static/img/banner.jpg' alt=''></header>"
+        "<div><div><main><article>"
+        f"{inner}"
+        "</article></main></div></div></app-content-layout></dsl-workspace-root>"
+        "</body></html>"
+    )
+
+
+def button(text, onclick, attrs=""):
+    return f"<dsl-workspace-button {attrs}><button type='button' onclick=\"{onclick}\">{text}</button></dsl-workspace-button>"
+
+
+def go(url):
+    return f"location.href='{url}'"
+
+
+class MockPortal:
+    """เซิร์ฟเวอร์จำลองเว็บไซต์ DSL พร้อมหน่วงเวลาตอบกลับได้"""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.records = {feature: {} for feature in FEATURES}
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.server = None
+        self.thread = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.server.server_address[1]}"
+
+    def start(self):
+        """เริ่มเซิร์ฟเวอร์ใน background thread และคืนค่า base URL"""
+        portal = self
+
+        class Handler(MockPortalHandler):
+            pass
+        Handler.portal = portal
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="mock-portal", daemon=True)
+        self.thread.start()
+        return self.base_url
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def delay(self):
+        with self.lock:
+            self.request_count += 1
+        wait = self.latency + random.uniform(0, self.jitter) if self.jitter else self.latency
+        if wait > 0:
+            time.sleep(wait)
+
+    # ---------------- ข้อมูลรายการ ----------------
+
+    def seed(self, feature, stems):
+        """สร้างรายการล่วงหน้าตามชื่อไฟล์"""
+        for stem in stems:
+            self.get_record(feature, stem)
+
+    def get_record(self, feature, stem):
+        """ดึงรายการ (สร้างใหม่ตามรูปแบบชื่อถ้ายังไม่มี) - คืนค่า None ถ้าไม่พบ"""
+        if not stem or stem.endswith("-missing"):
+            return None
+        with self.lock:
+            records = self.records[feature]
+            if stem not in records:
+                if stem.endswith("-done"):
+                    state = STATE_DONE
+                elif stem.endswith("-imported") and feature == "disbursement":
+                    state = STATE_IMPORT
+                else:
+                    state = STATE_CONSENT
+                records[stem] = {"stem": stem, "state": state, "checkboxes": 3 if stem.endswith("-3cb") else 2}
+            return records[stem]
+
+    def set_state(self, feature, stem, state):
+        record = self.get_record(feature, stem)
+        if record:
+            with self.lock:
+                record["state"] = state
+
+    def listed_records(self, feature):
+        """รายการที่แสดงในตาราง (ไม่ค้นหา) - เหมือนผลการค้นหา: รายการที่ลงนามสัญญาแล้วจะไม่แสดง"""
+        with self.lock:
+            return [
+                r for r in self.records[feature].values()
+                if not (feature == "sign-contract" and r["state"] == STATE_DONE)
+            ]
+
+    # ---------------- หน้าเว็บ ----------------
+
+    def login_page(self):
+        return layout(
+            "<form method='post' action='/los/login'>"
+            "<input id='username' name='username' type='text'>"
+            "<input id='password' name='password' type='password'>"
+            "<button id='button' type='submit'>เข้าสู่ระบบ</button>"
+            "</form>",
+            "Login"
+        )
+
+    def list_page(self, feature, query):
+        keyword = query.get("q", [""])[0]
+        radio = query.get("radio", [""])[0]
+        page = int(query.get("page", ["1"])[0] or 1)
+
+        if keyword:
+            record = self.get_record(feature, keyword)
+            records = [record] if record and not (feature == "sign-contract" and record["state"] == STATE_DONE) else []
+            pager = ""
+        else:
+            listed = self.listed_records(feature)
+            start = (page - 1) * PAGE_SIZE
+            records = listed[start:start + PAGE_SIZE]
+            has_next = start + PAGE_SIZE < len(listed)
+            next_button = (
+                f"<button type='button' class='next' onclick=\"{go(f'?page={page + 1}')}\">ถัดไป</button>"
+                if has_next else "<button type='button' class='next' disabled>ถัดไป</button>"
+            )
+            pager = f"<nav class='pagination'><span class='page'>{page}</span>{next_button}</nav>"
+
+        if records:
+            rows = "".join(self.table_row(feature, record) for record in records)
+        else:
+            rows = "<tr><td class='no-data' colspan='8'>ไม่พบข้อมูล</td></tr>"
+
+        checked = "checked" if radio == "B" else ""
+        search_script = (
+            "<script>function doSearch(){"
+            "var r=document.querySelector('input[name=radio2]:checked');"
+            "var q=document.getElementById('keyword').value;"
+            "location.href='?q='+encodeURIComponent(q)+'&radio='+(r?r.value:'');}</script>"
+        )
+        inner = (
+            f"<dsl-workspace-{feature}><main>"
+            "<section class='criteria search'><dsl-workspace-form-search-v2>"
+            "<div class='form-search'><form onsubmit='return false'><div><div>"
+            "<div><label><input type='radio' name='radio2' value='A'> เลขบัตรประชาชน</label>"
+            f"<label><input type='radio' name='radio2' value='B' {checked}> ชื่อไฟล์</label></div>"
+            "<div></div><div></div><div></div>"
+            f"<div><input type='text' id='keyword' value='{html.escape(keyword, quote=True)}'></div>"
+            "</div></div></form></div>"
+            "<div></div>"
+            "<div><footer><div>"
+            f"{button('ล้าง', go('?'))}"
+            f"{button('ค้นหา', 'doSearch()')}"
+            "</div></footer></div>"
+            "</dsl-workspace-form-search-v2></section>"
+            "<section class='data-table full rounded-none'><dsl-workspace-table-v2>"
+            f"<div class='max-w-full overflow-x-auto'><table><tbody>{rows}</tbody></table></div>"
+            f"{pager}"
+            "</dsl-workspace-table-v2></section>"
+            f"</main></dsl-workspace-{feature}>"
+            f"{search_script}"
+        )
+        return layout(inner)
+
+    def table_row(self, feature, record):
+        stem = record["stem"]
+        cells = f"<td class='doc-id'>{html.escape(stem)}</td>" + "".join("<td>-</td>" for _ in range(6))
+
+        if record["state"] == STATE_DONE:
+            action = "<p class='text-green-chartreuse'>ทำแบบเบิกเงินกู้ยืมสำเร็จ</p>"
+        else:
+            target = "consent" if record["state"] == STATE_CONSENT else "import"
+            text = ROW_BUTTON_TEXT[feature][record["state"]]
+            action = button(text, go(f"/main/{feature}-{target}?stem={quote(stem)}"))
+        return f"<tr>{cells}<td><div><div>{action}</div></div></td></tr>"
+
+    def consent_page(self, feature, stem):
+        record = self.get_record(feature, stem)
+        if not record:
+            return None
+
+        address = "<app-address-panel><div><label><input type='checkbox' class='address'> ยืนยันที่อยู่</label></div></app-address-panel>"
+        optional = "<app-address-panel><div><label><input type='checkbox' class='address-2'> ยืนยันที่อยู่ปัจจุบัน</label></div></app-address-panel>"
+        contract = "<dsl-workspace-confirm-contract-panel><label><input type='checkbox' class='contract'> ยืนยันสัญญา</label></dsl-workspace-confirm-contract-panel>"
+
+        # ลำดับ section ต้องตรงกับ nth-child ใน config.py
+        sections = ["<section><h2>ข้อมูลผู้กู้</h2></section>", f"<section>{address}</section>"]
+        if record["checkboxes"] == 3:
+            sections.append(f"<section class='ng-star-inserted'>{optional}</section>")
+        if feature == "disbursement":
+            sections.append("<section><h2>รายละเอียดการเบิก</h2></section>")
+        sections.append(f"<section>{contract}</section>")
+
+        wrapper_class = " class='px-20 mt-12 ng-star-inserted'" if feature == "disbursement" else ""
+        confirm_button = button("ยืนยัน", "confirmConsent()", "class='ng-star-inserted'")
+        confirm_script = (
+            "<script>function confirmConsent(){"
+            "var boxes=document.querySelectorAll('main input[type=checkbox]');"
+            "for(var i=0;i<boxes.length;i++){if(!boxes[i].checked){"
+            "document.getElementById('consent-error').textContent='กรุณายืนยันให้ครบ';return;}}"
+            f"location.href='/api/consent?feature={feature}&stem={quote(stem)}';}}</script>"
+        )
+        inner = (
+            f"<dsl-workspace-{feature}-consent-doc><main>"
+            f"<div{wrapper_class}>{''.join(sections)}</div>"
+            "<p id='consent-error'></p>"
+            "</main><footer>"
+            f"{confirm_button}"
+            f"</footer></dsl-workspace-{feature}-consent-doc>"
+            f"{confirm_script}"
+        )
+        return layout(inner)
+
+    def consent_success_page(self, feature, stem):
+        import_url = go(f"/main/{feature}-import?stem={quote(stem)}")
+        if feature == "sign-contract":
+            buttons = button("ดาวน์โหลดสัญญา", "void(0)") + button("ไปหน้าเลือกไฟล์", import_url)
+        else:
+            buttons = button("ไปหน้าเลือกไฟล์", import_url)
+        inner = (
+            f"<dsl-workspace-{feature}-consent-success><main><section>"
+            "<h2>บันทึกข้อมูลสำเร็จ</h2>"
+            f"<div class='flex gap-9 justify-center my-6'>{buttons}</div>"
+            f"</section></main></dsl-workspace-{feature}-consent-success>"
+        )
+        return layout(inner)
+
+    def import_page(self, feature, stem):
+        inner = (
+            f"<dsl-workspace-{feature}-import-file><main>"
+            f"<form id='upload' method='post' enctype='multipart/form-data' action='/api/import?feature={feature}&stem={quote(stem)}'>"
+            "<input type='file' id='frontImage0' name='file' "
+            "onchange=\"document.getElementById('confirm-upload').disabled=!this.files.length\">"
+            "</form></main><footer>"
+            "<dsl-workspace-button class='ng-star-inserted'>"
+            "<button type='button' id='confirm-upload' disabled onclick=\"document.getElementById('upload').submit()\">ยืนยัน</button>"
+            "</dsl-workspace-button>"
+            f"</footer></dsl-workspace-{feature}-import-file>"
+        )
+        return layout(inner)
+
+    def import_success_page(self, feature):
+        back = button("กลับหน้าแรก", go(f"/main/{feature}-list"))
+        buttons = back + button("ดูรายการ", "void(0)") if feature == "sign-contract" else back
+        inner = (
+            f"<dsl-workspace-{feature}-import-file-success><main><section>"
+            "<h2>นำเข้าเอกสารสำเร็จ</h2>"
+            f"<div class='flex gap-9 justify-center my-6'>{buttons}</div>"
+            f"</section></main></dsl-workspace-{feature}-import-file-success>"
+        )
+        return layout(inner)
+
+
+class MockPortalHandler(BaseHTTPRequestHandler):
+    portal = None
+
+    def log_message(self, format, *args):
+        pass  # ไม่แสดง access log
+
+    def is_logged_in(self):
+        return "mock_session=ok" in (self.headers.get("Cookie") or "")
+
+    def send_html(self, body, status=200):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_asset(self, content_type, data):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-cache")  # ตรวจกับเซิร์ฟเวอร์ทุกครั้งเหมือนเว็บไซต์จริงที่ไม่ได้ตั้ง cache
+        self.end_headers()
+        self.wfile.write(data)
+
+    def redirect(self, location, cookie=None):
+        self.send_response(303)
+        self.send_header("Location", location)
+        if cookie:
+            self.send_header("Set-Cookie", cookie)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        self.portal.delay()
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        path = url.path
+        stem = query.get("stem", [""])[0]
+
+        if path == "/los/login":
+            return self.send_html(self.portal.login_page())
+        if path == "/favicon.ico":
+            return self.send_html("", 404)
+        if path in STATIC_ASSETS:
+            return self.send_asset(*STATIC_ASSETS[path])
+        if not self.is_logged_in():
+            return self.redirect("/los/login")
+
+        if path == "/api/consent":
+            feature = query.get("feature", ["disbursement"])[0]
+            self.portal.set_state(feature, stem, STATE_IMPORT)
+            return self.redirect(f"/main/{feature}-consent-success?stem={quote(stem)}")
+
+        for feature in FEATURES:
+            prefix = f"/main/{feature}"
+            if path == f"{prefix}-list":
+                return self.send_html(self.portal.list_page(feature, query))
+            if path == f"{prefix}-consent":
+                page = self.portal.consent_page(feature, stem)
+                return self.send_html(page) if page else self.send_html("not found", 404)
+            if path == f"{prefix}-consent-success":
+                return self.send_html(self.portal.consent_success_page(feature, stem))
+            if path == f"{prefix}-import":
+                return self.send_html(self.portal.import_page(feature, stem))
+            if path == f"{prefix}-import-success":
+                return self.send_html(self.portal.import_success_page(feature))
+
+        self.send_html("not found", 404)
+
+    def do_POST(self):
+        self.portal.delay()
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)  # ไม่เก็บเนื้อหาไฟล์ที่อัปโหลด
+
+        if url.path == "/los/login":
+            return self.redirect("/main/disbursement-list", cookie="mock_session=ok; Path=/")
+        if not self.is_logged_in():
+            return self.redirect("/los/login")
+
+        if url.path == "/api/import":
+            feature = query.get("feature", ["disbursement"])[0]
+            stem = query.get("stem", [""])[0]
+            self.portal.set_state(feature, stem, STATE_DONE)
+            return self.redirect(f"/main/{feature}-import-success")
+
+        self.send_html("not found", 404)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock DSL Portal สำหรับทดสอบความเร็ว")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=float, default=0, help="หน่วงเวลาตอบกลับทุก request (มิลลิวินาที)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="หน่วงเวลาสุ่มเพิ่ม (มิลลิวินาที)")
+    args = parser.parse_args()
+
+    portal = MockPortal(args.host, args.port, args.latency_ms / 1000, args.jitter_ms / 1000)
+    base_url = portal.start()
+    print(f"🧪 Mock DSL Portal: {base_url}/los/login (กด Ctrl+C เพื่อหยุด)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        portal.stop()
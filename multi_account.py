@@ -0,0 +1,85 @@
+import threading
+import config
+from path_utils import get_files_directory
+
+
+class MultiAccountRunner:
+    """
+    รันหลายบัญชีพร้อมกันในครั้งเดียว
+    แต่ละบัญชีมีเบราว์เซอร์และ login ของตัวเอง และอ่านไฟล์จากโฟลเดอร์ย่อย files/<feature>/<user_id>/
+    บัญชีที่ไม่มีไฟล์จะไม่เปิดเบราว์เซอร์ และเบราว์เซอร์จะปิดทันทีเมื่อบัญชีนั้นทำงานเสร็จ
+    """
+
+    def __init__(self, bot, feature_type, account_ids):
+        self.bot = bot
+        self.feature_type = feature_type
+        self.account_ids = account_ids
+        self.summaries = {}
+        self.slots = threading.Semaphore(max(1, config.MAX_CONCURRENT_ACCOUNTS))
+
+    def get_account_directory(self, user_id):
+        return get_files_directory() / self.feature_type / user_id
+
+    def run(self):
+        """รันทุกบัญชีจนเสร็จ (สรุปผลรวมด้วย total_summary)"""
+        threads = []
+        for worker_id, user_id in enumerate(self.account_ids, 1):
+            source_directory = self.get_account_directory(user_id)
+            # อ่านไฟล์ระหว่างทำงานแบบเดียวกับบัญชีเดียว - ตรวจแค่ว่ามีไฟล์อย่างน้อยหนึ่งไฟล์
+            files = self.bot.scan_files(source_directory)
+            if next(iter(files), None) is None:
+                self.bot.log(f"💤 บัญชี {user_id}: ไม่มีไฟล์ใน {source_directory} - ไม่เปิดเบราว์เซอร์")
+                continue
+
+            summary = self.bot.new_batch_summary(0)  # process_files นับไฟล์เข้า total
+            self.summaries[user_id] = summary
+            worker = self.bot.spawn_worker(worker_id, account_id=user_id)
+            thread = threading.Thread(
+                target=self.account_loop,
+                args=(worker, files, source_directory, summary),
+                name=f"dsl-account-{user_id}",
+                daemon=True
+            )
+            threads.append(thread)
+            thread.start()
+
+        for thread in threads:
+            # join แบบมี timeout เพื่อให้ Ctrl+C ยังทำงานได้
+            while thread.is_alive():
+                thread.join(timeout=1)
+
+    def total_summary(self):
+        """สรุปผลรวมของทุกบัญชี (บัญชีที่ยังทำไม่เสร็จนับเท่าที่ทำไปแล้ว)"""
+        total = self.bot.new_batch_summary(0)
+        for summary in self.summaries.values():
+            for key in total:
+                total[key] += summary[key]
+        return total
+
+    def account_loop(self, worker, files, source_directory, summary):
+        """ประมวลผลไฟล์ทั้งหมดของบัญชีหนึ่ง (รอคิวถ้าเปิดเบราว์เซอร์ครบ MAX_CONCURRENT_ACCOUNTS แล้ว)"""
+        with self.slots:
+            try:
+                worker.log(f"👤 เริ่มบัญชี {worker.account_id}: ประมาณ {files.estimate_total():,} ไฟล์")
+                worker.process_files(files, source_directory, self.feature_type, summary)
+                if worker.login_failed.is_set():
+                    worker.log_warning(f"🔒 บัญชี {worker.account_id}: login ไม่สำเร็จ - ไฟล์ที่เหลืออยู่ใน {source_directory}")
+            except Exception as e:
+                worker.log_error(f"💥 บัญชี {worker.account_id} หยุดทำงาน: {str(e)}")
+            finally:
+                if worker.driver:
+                    try:
+                        worker.driver.quit()
+                    except Exception:
+                        pass
+                    worker.driver = None
+                worker.log(f"🏁 บัญชี {worker.account_id} เสร็จ - ปิดเบราว์เซอร์แล้ว")
+
+    def format_account_summary(self):
+        """สรุปผลแยกตามบัญชีเป็นบรรทัดข้อความ"""
+        lines = [f"{'บัญชี':<16}{'ทั้งหมด':>9}{'สำเร็จ':>9}{'ล้มเหลว':>9}{'ข้าม':>9}"]
+        for user_id, summary in self.summaries.items():
+            lines.append(
+                f"{user_id:<16}{summary['total']:>9}{summary['success']:>9}{summary['failed']:>9}{summary['skipped']:>9}"
+            )
+        return lines
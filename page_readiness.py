@@ -0,0 +1,125 @@
+import time
+from selenium.common.exceptions import WebDriverException
+import config
+
+# ตัวนับ request ที่ค้างอยู่ในหน้าเว็บ (XHR + fetch) พร้อมเวลาเริ่มของแต่ละ request - ติดตั้งครั้งเดียวต่อการโหลดหน้า
+TRACKER_SCRIPT = """
+(function() {
+    if (window.__dslTracker) { return; }
+    var tracker = window.__dslTracker = {active: {}, nextId: 0, lastChange: Date.now()};
+    function started() {
+        var id = ++tracker.nextId;
+        tracker.active[id] = tracker.lastChange = Date.now();
+        return id;
+    }
+    function finished(id) {
+        if (!(id in tracker.active)) { return; }
+        delete tracker.active[id];
+        tracker.lastChange = Date.now();
+    }
+
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        var id = started();
+        this.addEventListener('loadend', function() { finished(id); }, {once: true});
+        try { return send.apply(this, arguments); } catch (e) { finished(id); throw e; }
+    };
+
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function() {
+            var id = started();
+            return originalFetch.apply(this, arguments).finally(function() { finished(id); });
+        };
+    }
+})();
+"""
+
+# ตรวจสถานะหน้าเว็บในครั้งเดียว: request ค้าง, Angular zone, loading overlay
+# arguments[0] = selectors ของ loading overlay, arguments[1] = request ที่ค้างนานกว่านี้ (ms) ถือเป็น long-poll
+READINESS_SCRIPT = TRACKER_SCRIPT + """
+var tracker = window.__dslTracker;
+var now = Date.now();
+var pending = 0, longPolls = 0;
+for (var id in tracker.active) {
+    if (now - tracker.active[id] >= arguments[1]) { longPolls++; } else { pending++; }
+}
+var angularStable = true;
+if (window.getAllAngularTestabilities) {
+    angularStable = window.getAllAngularTestabilities().every(function(t) { return t.isStable(); });
+}
+var overlayVisible = arguments[0].some(function(selector) {
+    return Array.prototype.some.call(document.querySelectorAll(selector), function(el) {
+        return el.getClientRects().length > 0 && window.getComputedStyle(el).visibility !== 'hidden';
+    });
+});
+return {
+    loaded: document.readyState === 'complete',
+    pending: pending,
+    long_polls: longPolls,
+    quiet_ms: now - tracker.lastChange,
+    angular_stable: angularStable,
+    overlay: overlayVisible
+};
+"""
+
+
+class PageReadiness:
+    """
+    ตอบคำถาม "หน้าเว็บว่างแล้วหรือยัง" ด้วยการเรียก JavaScript ครั้งเดียว
+    (ไม่มี request ค้าง, Angular ทำงานเสร็จ และไม่มี loading overlay)
+    หน้าที่มี polling/interval ไม่มีวันว่างสนิท จึงไม่นับ request ที่ค้างนานกว่า IDLE_LONG_REQUEST_MS (long-poll)
+    และเลิกรอ Angular เมื่อรอเกิน IDLE_ANGULAR_MAX_WAIT วินาทีแล้วหน้าเว็บเงียบ (ไม่มี request และ overlay)
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.busy_reason = None  # เหตุผลที่หน้าเว็บยังไม่ว่างจากการตรวจครั้งล่าสุด (ใช้เขียน log เมื่อหมดเวลา)
+        self.install()
+
+    def install(self):
+        """ให้เบราว์เซอร์ติดตั้งตัวนับ request ทุกครั้งที่โหลดหน้าใหม่ (ก่อนสคริปต์ของเว็บไซต์ทำงาน)"""
+        try:
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": TRACKER_SCRIPT})
+        except Exception:
+            pass  # ไม่รองรับ CDP - READINESS_SCRIPT จะติดตั้งเองเมื่อเรียกครั้งแรกในแต่ละหน้า
+
+    def snapshot(self):
+        """สถานะหน้าเว็บปัจจุบัน (None ถ้าเรียกไม่ได้ เช่น หน้ากำลังเปลี่ยน)"""
+        try:
+            return self.driver.execute_script(READINESS_SCRIPT, config.LOADING_OVERLAY_SELECTORS, config.IDLE_LONG_REQUEST_MS)
+        except WebDriverException:
+            return None
+
+    def is_idle(self, waited=0.0):
+        """waited = เวลาที่รอมาแล้ว (วินาที) - เกิน IDLE_ANGULAR_MAX_WAIT แล้วไม่ต้องรอ Angular"""
+        state = self.snapshot()
+        if not state:
+            self.busy_reason = "หน้าเว็บกำลังเปลี่ยน"
+            return False
+        reasons = []
+        if not state["loaded"]:
+            reasons.append("หน้ายังโหลดไม่เสร็จ")
+        if state["pending"]:
+            reasons.append(f"request ค้าง {state['pending']}")
+        elif state["quiet_ms"] < config.IDLE_QUIET_MS:
+            reasons.append("request เพิ่งจบ")
+        if state["overlay"]:
+            reasons.append("loading overlay")
+        if not state["angular_stable"] and (reasons or waited < config.IDLE_ANGULAR_MAX_WAIT):
+            reasons.append("Angular ยังไม่ stable")
+        self.busy_reason = ", ".join(reasons)
+        if state["long_polls"]:
+            self.busy_reason += f" (ไม่นับ long-poll {state['long_polls']})"
+        return not reasons
+
+    def wait_until_idle(self, timeout=None):
+        """รอจนหน้าเว็บว่าง - คืนค่า False ถ้าหมดเวลา (เหตุผลอยู่ใน busy_reason)"""
+        started = time.time()
+        deadline = started + (timeout if timeout else config.ELEMENT_WAIT_TIMEOUT)
+        while True:
+            if self.is_idle(time.time() - started):
+                return True
+            if time.time() >= deadline:
+                return False
+            time.sleep(config.STATE_POLL_INTERVAL)
@@ -42,6 +42,10 @@ def get_failed_directory():
     """ดึง path ของโฟลเดอร์ failed"""
     return get_app_directory() / "failed"
 
+def get_traces_directory():
+    """ดึง path ของโฟลเดอร์ traces (เวลาแต่ละขั้นตอน)"""
+    return get_app_directory() / "traces"
+
 def ensure_directories_exist():
     """สร้างโฟลเดอร์ที่จำเป็นทั้งหมด"""
     directories = [
@@ -54,7 +58,8 @@ def ensure_directories_exist():
         get_completed_directory() / "sign-contract",
         get_failed_directory(),
         get_failed_directory() / "disbursement",
-        get_failed_directory() / "sign-contract"
+        get_failed_directory() / "sign-contract",
+        get_traces_directory()
     ]
     
     for directory in directories:
@@ -0,0 +1,74 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import config
+
+# ไบต์แรกของไฟล์แต่ละประเภท (.txt ไม่มี signature)
+MAGIC_BYTES = {
+    '.pdf': [b"%PDF-"],
+    '.jpg': [b"\xff\xd8\xff"],
+    '.png': [b"\x89PNG\r\n\x1a\n"],
+    '.doc': [b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"],
+    '.docx': [b"PK\x03\x04"],
+}
+
+PDF_TRAILER_WINDOW = 2048  # ค้นหา %%EOF ในช่วงท้ายไฟล์ (บางโปรแกรมเขียนข้อมูลต่อท้าย %%EOF)
+
+
+def check_file(file_path):
+    """ตรวจไฟล์หนึ่งไฟล์ - คืนค่าเหตุผลที่ไม่ผ่าน หรือ None ถ้าผ่าน"""
+    ext = file_path.suffix.lower()
+    if ext not in config.ALLOWED_EXTENSIONS:
+        return f"นามสกุลไฟล์ '{file_path.suffix}' ไม่รองรับ"
+
+    if not re.fullmatch(config.PREFLIGHT_STEM_PATTERN, file_path.stem):
+        return f"ชื่อไฟล์ '{file_path.stem}' ไม่ตรงกับรูปแบบรหัสเอกสาร"
+
+    try:
+        size = file_path.stat().st_size
+        if size == 0:
+            return "ไฟล์ว่าง (0 byte)"
+
+        with open(file_path, 'rb') as f:
+            head = f.read(16)
+            signatures = MAGIC_BYTES.get(ext)
+            if signatures and not any(head.startswith(signature) for signature in signatures):
+                return f"เนื้อหาไฟล์ไม่ใช่ {ext} (signature ไม่ตรง)"
+
+            if ext == '.pdf':
+                f.seek(max(0, size - PDF_TRAILER_WINDOW))
+                if b"%%EOF" not in f.read():
+                    return "ไฟล์ PDF ไม่สมบูรณ์ (ไม่พบ %%EOF - อาจคัดลอกไม่ครบ)"
+    except OSError as e:
+        return f"อ่านไฟล์ไม่ได้: {e}"
+
+    return None
+
+
+def run_preflight(files, source_directory, seen_stems=None):
+    """
+    ตรวจไฟล์ทั้งหมดแบบขนานก่อนเปิดเบราว์เซอร์
+    คืนค่า (ไฟล์ที่ผ่าน, [(ไฟล์ที่ไม่ผ่าน, เหตุผล)]) โดยรักษาลำดับเดิม
+    seen_stems: ชื่อรายการของชุดก่อนหน้า (ตรวจชื่อซ้ำข้ามชุดเมื่ออ่านโฟลเดอร์ทีละชุด)
+    """
+    source_directory = Path(source_directory)
+    workers = max(1, min(config.PREFLIGHT_WORKERS, len(files)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        reasons = list(executor.map(lambda filename: check_file(source_directory / filename), files))
+
+    accepted, rejected = [], []
+    seen_stems = {} if seen_stems is None else seen_stems
+    for filename, reason in zip(files, reasons):
+        if reason is None:
+            # ชื่อไฟล์ (ไม่รวมนามสกุล) ซ้ำกัน จะค้นหาเจอรายการเดียวกัน (รวมไฟล์คนละโฟลเดอร์ย่อย)
+            stem = Path(filename).stem
+            if stem in seen_stems:
+                reason = f"ชื่อรายการซ้ำกับไฟล์ '{seen_stems[stem]}'"
+            else:
+                seen_stems[stem] = filename
+
+        if reason is None:
+            accepted.append(filename)
+        else:
+            rejected.append((filename, reason))
+    return accepted, rejected
@@ -0,0 +1,112 @@
+import threading
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+import config
+
+# สถานะของรายการในตารางผลลัพธ์
+ROW_NEEDS_CONSENT = "needs_consent"   # ไฟล์ใหม่ ต้องทำ consent
+ROW_NEEDS_IMPORT = "needs_import"     # ทำ consent แล้ว เหลือนำเข้าเอกสาร
+ROW_DONE = "done"                     # ดำเนินการสำเร็จแล้ว
+ROW_MISSING = "missing"               # ไม่มีในดัชนีที่อ่านครบทุกหน้า = ไม่มีรายการในเว็บไซต์
+
+# ข้อความบนปุ่ม/ข้อความในคอลัมน์ดำเนินการ -> สถานะของรายการ
+ROW_ACTION_TEXT = {
+    "disbursement": [
+        ("ยืนยันการเบิกเงินกู้ยืม", ROW_NEEDS_CONSENT),
+        ("นำเข้าเอกสาร", ROW_NEEDS_IMPORT),
+        ("ทำแบบเบิกเงินกู้ยืมสำเร็จ", ROW_DONE),
+    ],
+    "sign-contract": [
+        ("ลงนามสัญญา", ROW_NEEDS_CONSENT),
+    ],
+}
+
+# อ่านทุกแถวของหน้าปัจจุบันด้วย round trip เดียว: [[รหัสรายการ, ข้อความคอลัมน์ดำเนินการ], ...]
+READ_ROWS_SCRIPT = """
+var rows = document.querySelectorAll(arguments[0]);
+var result = [];
+for (var i = 0; i < rows.length; i++) {
+    var idCell = rows[i].querySelector(arguments[1]);
+    var actionCell = rows[i].querySelector(arguments[2]);
+    if (!idCell || !actionCell) { continue; }
+    result.push([idCell.textContent.trim(), actionCell.textContent.trim()]);
+}
+return result;
+"""
+
+
+class ResultIndex:
+    """
+    ดัชนีรายการในตารางผลลัพธ์ (รหัสรายการ -> สถานะ) สร้างครั้งเดียวต่อ batch
+    ไล่อ่านตารางทุกหน้าแทนการค้นหาทีละไฟล์ เพื่อแยกไฟล์ที่ทำแล้วได้โดยไม่ต้องเปิดหน้าใดๆ
+    ดัชนีที่อ่านครบทุกหน้า (complete) แยกไฟล์ที่ไม่มีรายการได้ด้วย (ROW_MISSING) ไม่ต้องค้นหาเช่นกัน
+    ถ้าอ่านไม่ครบ (ตารางว่าง/selector ไม่ตรง, เกิน RESULT_INDEX_MAX_PAGES, อ่านไม่สำเร็จ) ไฟล์ที่ไม่มีในดัชนีค้นหาทีละไฟล์ตามเดิม
+    """
+
+    def __init__(self, feature_type):
+        self.feature_type = feature_type
+        self.rows = {}
+        self.complete = False  # อ่านครบทุกหน้าและพบรายการ - รายการที่ไม่มีในดัชนีถือว่าไม่มีในเว็บไซต์
+        self.lock = threading.Lock()
+
+    def build(self, driver, list_url):
+        """ไล่อ่านตารางทุกหน้า - คืนค่าจำนวนรายการที่พบ"""
+        driver.get(list_url)
+        self.wait_for_rows(driver)
+
+        pages = 0
+        while pages < config.RESULT_INDEX_MAX_PAGES:
+            pages += 1
+            for row_id, action_text in driver.execute_script(
+                READ_ROWS_SCRIPT, config.RESULT_ROW_SELECTOR, config.RESULT_ID_CELL_SELECTOR, config.RESULT_ACTION_CELL_SELECTOR
+            ):
+                state = self.classify(action_text)
+                if row_id and state:
+                    self.rows[row_id] = state
+
+            next_buttons = driver.find_elements(By.CSS_SELECTOR, config.RESULT_NEXT_PAGE_SELECTOR)
+            if not next_buttons:
+                self.complete = bool(self.rows)  # ตารางว่าง = selector อาจไม่ตรง ไม่ถือว่าอ่านครบ
+                break
+
+            first_rows = driver.find_elements(By.CSS_SELECTOR, config.RESULT_ROW_SELECTOR)
+            driver.execute_script("arguments[0].click();", next_buttons[0])
+            if first_rows:
+                WebDriverWait(driver, config.PAGE_LOAD_TIMEOUT).until(EC.staleness_of(first_rows[0]))
+            self.wait_for_rows(driver)
+
+        return len(self.rows)
+
+    def wait_for_rows(self, driver):
+        try:
+            WebDriverWait(driver, config.PAGE_LOAD_TIMEOUT).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, config.RESULT_ROW_SELECTOR))
+            )
+        except TimeoutException:
+            pass  # ตารางว่าง
+
+    def classify(self, action_text):
+        for text, state in ROW_ACTION_TEXT[self.feature_type]:
+            if text in action_text:
+                return state
+        return None
+
+    def lookup(self, row_id):
+        """สถานะของรายการจากดัชนี - ROW_MISSING ถ้าดัชนีครบแต่ไม่มีรายการ หรือ None ถ้าไม่พบ (ต้องค้นหาแบบเดิม)"""
+        with self.lock:
+            state = self.rows.get(row_id)
+            if state is None and self.complete:
+                return ROW_MISSING
+            return state
+
+    def mark(self, row_id, state):
+        """อัปเดตสถานะหลังดำเนินการ (รายการในเว็บไซต์เปลี่ยนไปแล้ว)"""
+        with self.lock:
+            self.rows[row_id] = state
+
+    def counts(self):
+        with self.lock:
+            states = list(self.rows.values())
+        return {state: states.count(state) for state in (ROW_NEEDS_CONSENT, ROW_NEEDS_IMPORT, ROW_DONE)}
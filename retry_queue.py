@@ -0,0 +1,64 @@
+import time
+import threading
+import config
+
+
+class RetryQueue:
+    """
+    ไฟล์ที่ล้มเหลวชั่วคราว รอลองใหม่หลังทำไฟล์ในคิวหลักหมดแล้ว
+    หน่วงเวลาก่อนลองใหม่เพิ่มเป็นสองเท่าทุกครั้ง (RETRY_BACKOFF_SECONDS, x2, x4, ...) สูงสุด RETRY_MAX_ATTEMPTS ครั้ง
+    ใช้ร่วมกันทุก worker - แต่ละ worker ดึงเฉพาะไฟล์ของฟีเจอร์และบัญชีของตัวเอง
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.items = []     # [{"due", "feature", "filename", "source_directory", "account_id", "attempt"}]
+        self.attempts = {}  # (feature, account_id, filename) -> จำนวนครั้งที่ลองใหม่แล้ว
+
+    def schedule(self, feature, filename, source_directory, account_id=None):
+        """เข้าคิวลองใหม่ - คืนค่า (ครั้งที่, วินาทีที่รอ) หรือ None ถ้าลองครบแล้ว"""
+        key = (feature, account_id, filename)
+        with self.lock:
+            attempt = self.attempts.get(key, 0) + 1
+            if attempt > config.RETRY_MAX_ATTEMPTS:
+                return None
+            self.attempts[key] = attempt
+            delay = config.RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1))
+            self.items.append({
+                "due": time.time() + delay,
+                "feature": feature,
+                "filename": filename,
+                "source_directory": source_directory,
+                "account_id": account_id,
+                "attempt": attempt,
+            })
+        return attempt, delay
+
+    def pop(self, feature, account_id=None, wait=True, deadline=None):
+        """
+        ไฟล์ถัดไปที่ถึงเวลาลองใหม่ (wait=True: รอจนถึงเวลา)
+        คืนค่า None ถ้าไม่มีไฟล์รอ หรือไฟล์ถัดไปจะถึงเวลาหลัง deadline
+        """
+        while True:
+            with self.lock:
+                matching = [item for item in self.items if item["feature"] == feature and item["account_id"] == account_id]
+                if not matching:
+                    return None
+                item = min(matching, key=lambda i: i["due"])
+                now = time.time()
+                if item["due"] <= now:
+                    self.items.remove(item)
+                    return item
+            if not wait or (deadline is not None and item["due"] > deadline):
+                return None
+            # ตรวจซ้ำทุกวินาที (worker อื่นอาจเพิ่มไฟล์ที่ถึงเวลาก่อน)
+            time.sleep(min(item["due"] - now, 1.0))
+
+    def pending_count(self):
+        with self.lock:
+            return len(self.items)
+
+    def clear(self):
+        with self.lock:
+            self.items = []
+            self.attempts = {}
@@ -0,0 +1,122 @@
+import time
+import threading
+from selenium.common.exceptions import WebDriverException
+import config
+
+# คืนค่า [ลำดับ selector ที่เจอ, elements] ของ selector แรกที่เจอ element
+FIND_FIRST_MATCH_SCRIPT = """
+var candidates = arguments[0];
+for (var i = 0; i < candidates.length; i++) {
+    var elements;
+    try { elements = document.querySelectorAll(candidates[i]); } catch (e) { continue; }
+    if (elements.length) { return [i, Array.prototype.slice.call(elements)]; }
+}
+return [-1, []];
+"""
+
+
+def get_selector_names():
+    """ชื่อค่าคงที่ใน config ของแต่ละ selector (ใช้แสดงในรายงาน)"""
+    return {
+        value: name for name, value in vars(config).items()
+        if name.endswith("_SELECTOR") and isinstance(value, str)
+    }
+
+
+class SelectorStats:
+    """สถิติการค้นหา element ของแต่ละ selector (ใช้ร่วมกันทุก worker)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}  # selector -> {"lookups", "cache_hits", "seconds", "matched": {candidate: count}}
+
+    def record(self, selector, candidate, seconds, cache_hit=False):
+        with self.lock:
+            entry = self.entries.setdefault(selector, {"lookups": 0, "cache_hits": 0, "seconds": 0.0, "matched": {}})
+            entry["lookups"] += 1
+            entry["seconds"] += seconds
+            if cache_hit:
+                entry["cache_hits"] += 1
+            if candidate is not None:
+                entry["matched"][candidate] = entry["matched"].get(candidate, 0) + 1
+
+    def reset(self):
+        with self.lock:
+            self.entries = {}
+
+    def format_report(self):
+        """สรุปเวลาค้นหาเฉลี่ยและ selector ที่ใช้ได้จริง เรียงจากช้าที่สุด"""
+        names = get_selector_names()
+        with self.lock:
+            entries = sorted(self.entries.items(), key=lambda item: item[1]["seconds"] / item[1]["lookups"], reverse=True)
+            lines = [f"{'selector':<44}{'n':>6}{'cache':>7}{'avg ms':>9}  ใช้ได้"]
+            for selector, entry in entries:
+                name = names.get(selector, selector)[:43]
+                average_ms = entry["seconds"] / entry["lookups"] * 1000
+                fallbacks = config.SELECTOR_FALLBACKS.get(selector, [])
+                matched = ", ".join(
+                    f"#{fallbacks.index(c) + 1 if c in fallbacks else 'เดิม'}x{count}"
+                    for c, count in entry["matched"].items()
+                ) or "-"
+                lines.append(f"{name:<44}{entry['lookups']:>6}{entry['cache_hits']:>7}{average_ms:>9.1f}  {matched}")
+        return lines
+
+
+class SelectorRegistry:
+    """
+    หา element ด้วย selector สั้น (config.SELECTOR_FALLBACKS) ก่อน และใช้ selector แบบเต็มเป็นตัวสุดท้าย
+    ลำดับที่ลองจัดไว้ครั้งเดียวต่อ selector และเลื่อน selector ที่เจอ element จริงขึ้นมาเป็นตัวแรก
+    จำ element ที่เจอแล้วไว้จนกว่าหน้าเว็บจะเปลี่ยนสถานะ (invalidate เมื่อคลิก/อัปโหลด/เปลี่ยนหน้า)
+    """
+
+    def __init__(self, driver, stats=None):
+        self.driver = driver
+        self.stats = stats or SelectorStats()
+        self.cache = {}
+        self.ranked = {}  # selector -> ลำดับ selector ที่ลอง
+
+    def candidates(self, selector):
+        """selector ที่ลองตามลำดับ: selector สั้นที่จัดอันดับไว้ แล้วจึง selector แบบเต็ม"""
+        ranked = self.ranked.get(selector)
+        if ranked is None:
+            fallbacks = config.SELECTOR_FALLBACKS.get(selector, [])
+            ranked = [fallback for fallback in fallbacks if fallback != selector] + [selector]
+            self.ranked[selector] = ranked
+        return ranked
+
+    def promote(self, selector, matched):
+        """ให้ selector ที่เจอ element ถูกลองก่อนในครั้งถัดไป"""
+        ranked = self.candidates(selector)
+        if ranked[0] != matched:
+            self.ranked[selector] = [matched] + [candidate for candidate in ranked if candidate != matched]
+
+    def find_all(self, selector, cache=True):
+        """หา element ทั้งหมด (คืนค่า list ว่างถ้าไม่เจอ)"""
+        if cache and selector in self.cache:
+            self.stats.record(selector, None, 0.0, cache_hit=True)
+            return self.cache[selector]
+
+        candidates = self.candidates(selector)
+        start = time.perf_counter()
+        try:
+            # ลองทุก selector ในการเรียกครั้งเดียว (ไม่เสีย round trip ต่อ selector ที่ไม่เจอ)
+            index, elements = self.driver.execute_script(FIND_FIRST_MATCH_SCRIPT, candidates)
+        except WebDriverException:
+            index, elements = -1, []
+        matched = candidates[index] if elements else None
+        self.stats.record(selector, matched, time.perf_counter() - start)
+        if matched is not None:
+            self.promote(selector, matched)
+
+        if elements and cache:
+            self.cache[selector] = elements
+        return elements
+
+    def find(self, selector, cache=True):
+        """หา element แรก (คืนค่า None ถ้าไม่เจอ) - ใช้กับ WebDriverWait.until ได้โดยตรง"""
+        elements = self.find_all(selector, cache)
+        return elements[0] if elements else None
+
+    def invalidate(self):
+        """ลืม element ที่จำไว้ (หน้าเว็บเปลี่ยนสถานะแล้ว)"""
+        self.cache.clear()
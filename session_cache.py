@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import threading
+from urllib.parse import urlparse
+from path_utils import get_accounts_directory
+import config
+
+# worker (pool/แท็บ) เป็น thread ในโปรเซสเดียวกัน - บันทึก session ทีละ thread
+_save_lock = threading.Lock()
+
+
+class SessionCache:
+    """
+    เก็บ session ที่ login แล้ว (cookies + localStorage/sessionStorage) แยกตามบัญชี
+    เพื่อให้การรันครั้งถัดไปไม่ต้องกรอกฟอร์ม login ใหม่
+    """
+
+    def __init__(self):
+        self.sessions_dir = get_accounts_directory() / "sessions"
+        self.sessions_dir.mkdir(parents=True, exist_ok=True)
+        self._restore_script_id = None
+
+    def get_session_file(self, user_id):
+        return self.sessions_dir / f"{user_id}.json"
+
+    def save(self, driver, user_id):
+        """บันทึก session ปัจจุบันของเบราว์เซอร์ลงไฟล์"""
+        storage = driver.execute_script(
+            "return {local: Object.assign({}, window.localStorage), session: Object.assign({}, window.sessionStorage)};"
+        )
+        data = {
+            "saved_at": time.time(),
+            "origin": self.get_origin(driver.current_url),
+            "cookies": driver.get_cookies(),
+            "local_storage": storage.get("local", {}),
+            "session_storage": storage.get("session", {})
+        }
+
+        # เขียนไฟล์ชั่วคราวก่อนแล้วค่อยแทนที่ เพื่อไม่ให้ไฟล์เสียเมื่อหลาย worker บันทึกพร้อมกัน
+        # (ชื่อไฟล์ชั่วคราวแยกตามโปรเซสและ thread - หลายโปรแกรมที่รันพร้อมกันไม่เขียนทับกัน)
+        session_file = self.get_session_file(user_id)
+        temp_file = session_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with _save_lock:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_file, session_file)
+
+    def load(self, user_id):
+        """โหลด session ที่บันทึกไว้ (คืนค่า None ถ้าไม่มีหรือหมดอายุ)"""
+        session_file = self.get_session_file(user_id)
+        if not session_file.exists():
+            return None
+        try:
+            with open(session_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - data.get("saved_at", 0) > config.SESSION_CACHE_MAX_AGE:
+            return None
+        return data
+
+    def restore(self, driver, user_id):
+        """
+        ใส่ session ที่บันทึกไว้ลงในเบราว์เซอร์ (ยังไม่ตรวจว่าใช้ได้จริง)
+        คืนค่า True ถ้ามี session ให้ลองใช้
+        """
+        data = self.load(user_id)
+        if not data or not data.get("cookies"):
+            return False
+
+        storage_script = self.build_storage_script(data)
+        try:
+            # ใช้ DevTools Protocol เพื่อใส่ cookies/storage โดยไม่ต้องเปิดหน้าเว็บเพิ่ม
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setCookies", {
+                "cookies": [self.to_cdp_cookie(cookie, data["origin"]) for cookie in data["cookies"]]
+            })
+            result = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": storage_script})
+            self._restore_script_id = result.get("identifier")
+        except Exception:
+            # เบราว์เซอร์ที่ไม่รองรับ CDP - ต้องเปิดหน้าในโดเมนเดียวกันก่อนใส่ cookies
+            driver.get(data["origin"])
+            for cookie in data["cookies"]:
+                cookie = {k: v for k, v in cookie.items() if k != "sameSite"}
+                driver.add_cookie(cookie)
+            driver.execute_script(storage_script)
+        return True
+
+    def finish_restore(self, driver):
+        """ลบสคริปต์ใส่ storage ออกหลังตรวจสอบ session แล้ว"""
+        if self._restore_script_id:
+            try:
+                driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": self._restore_script_id})
+            except Exception:
+                pass
+            self._restore_script_id = None
+
+    def clear(self, user_id):
+        """ลบ session ที่บันทึกไว้ของบัญชี"""
+        session_file = self.get_session_file(user_id)
+        if session_file.exists():
+            session_file.unlink()
+
+    def build_storage_script(self, data):
+        """สร้างสคริปต์ใส่ localStorage/sessionStorage เฉพาะโดเมนของเว็บไซต์"""
+        return (
+            "(function(origin, local, session) {"
+            "  if (window.location.origin !== origin) { return; }"
+            "  Object.keys(local).forEach(function(k) { window.localStorage.setItem(k, local[k]); });"
+            "  Object.keys(session).forEach(function(k) { window.sessionStorage.setItem(k, session[k]); });"
+            f"}})({json.dumps(data['origin'])}, {json.dumps(data['local_storage'])}, {json.dumps(data['session_storage'])});"
+        )
+
+    def to_cdp_cookie(self, cookie, origin):
+        """แปลง cookie จากรูปแบบ Selenium เป็นรูปแบบ DevTools Protocol"""
+        cdp_cookie = {
+            "name": cookie["name"],
+            "value": cookie["value"],
+            "path": cookie.get("path", "/"),
+            "secure": cookie.get("secure", False),
+            "httpOnly": cookie.get("httpOnly", False)
+        }
+        if cookie.get("domain"):
+            cdp_cookie["domain"] = cookie["domain"]
+        else:
+            cdp_cookie["url"] = origin
+        if "expiry" in cookie:
+            cdp_cookie["expires"] = cookie["expiry"]
+        if cookie.get("sameSite"):
+            cdp_cookie["sameSite"] = cookie["sameSite"]
+        return cdp_cookie
+
+    def get_origin(self, url):
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
@@ -0,0 +1,112 @@
+import os
+import json
+import math
+import time
+import threading
+from datetime import datetime
+from contextlib import contextmanager
+from path_utils import get_traces_directory
+import config
+
+
+def percentile(values, percent):
+    """คำนวณ percentile แบบ nearest-rank"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class StepSpan:
+    """ผลของขั้นตอนหนึ่ง - ตั้ง ok = False เมื่อขั้นตอนไม่สำเร็จ"""
+
+    def __init__(self, step):
+        self.step = step
+        self.ok = True
+        self.duration = 0.0
+
+
+class StepTracer:
+    """
+    จับเวลาแต่ละขั้นตอน (span) และเขียนลงไฟล์ JSONL ต่อ session
+    ใช้ร่วมกันระหว่าง worker ทุกตัว (thread-safe)
+    """
+
+    def __init__(self):
+        self.session_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+        self.lock = threading.Lock()
+        self.durations = {}
+        self.trace_file = None
+        self.trace_path = None
+        self.metrics = None  # Metrics ของ bot หลัก (เปิด METRICS_ENABLED) - ส่งเวลาแต่ละขั้นตอนเป็น histogram
+        if config.TRACE_ENABLED:
+            self.trace_path = get_traces_directory() / f"trace_{self.session_id}.jsonl"
+
+    @contextmanager
+    def span(self, step, **fields):
+        """จับเวลาขั้นตอน: with tracer.span("search", file=...) as span: ..."""
+        span = StepSpan(step)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException:
+            span.ok = False
+            raise
+        finally:
+            span.duration = time.perf_counter() - start
+            self.record(step, span.duration, span.ok, **fields)
+
+    def record(self, step, duration, ok=True, **fields):
+        """บันทึกเวลาของขั้นตอนหนึ่ง"""
+        entry = {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "session": self.session_id,
+            "step": step,
+            "duration_ms": round(duration * 1000, 1),
+            "ok": bool(ok),
+        }
+        entry.update(fields)
+        if self.metrics:
+            self.metrics.observe("dsl_step_duration_seconds", {"step": step}, duration)
+
+        with self.lock:
+            self.durations.setdefault(step, []).append(duration)
+            if self.trace_path:
+                if self.trace_file is None:
+                    self.trace_file = open(self.trace_path, 'a', encoding='utf-8', buffering=1)
+                self.trace_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def reset(self):
+        """ล้างสถิติในหน่วยความจำ (เริ่ม batch ใหม่) - ไฟล์ trace ยังเขียนต่อ"""
+        with self.lock:
+            self.durations = {}
+
+    def summary(self):
+        """สรุป p50/p95/max ของแต่ละขั้นตอน (วินาที) ตามลำดับที่พบครั้งแรก"""
+        with self.lock:
+            snapshot = {step: list(values) for step, values in self.durations.items()}
+        return {
+            step: {
+                "count": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "max": max(values),
+            }
+            for step, values in snapshot.items()
+        }
+
+    def format_summary(self):
+        """สรุปเป็นบรรทัดข้อความสำหรับแสดงผล"""
+        lines = [f"{'ขั้นตอน':<18}{'n':>6}{'p50':>9}{'p95':>9}{'max':>9}"]
+        for step, stats in self.summary().items():
+            lines.append(
+                f"{step:<18}{stats['count']:>6}{stats['p50']:>8.2f}s{stats['p95']:>8.2f}s{stats['max']:>8.2f}s"
+            )
+        return lines
+
+    def close(self):
+        with self.lock:
+            if self.trace_file:
+                self.trace_file.close()
+                self.trace_file = None
@@ -0,0 +1,120 @@
+import threading
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.support.ui import WebDriverWait
+import config
+from wait_engine import WaitEngine
+from worker_pool import BrowserWorkerPool
+from lean_browser import enable_request_blocking
+
+
+class SharedDriver:
+    """
+    ให้หลาย thread ใช้ WebDriver session เดียวกันได้ โดยแต่ละ thread มีแท็บของตัวเอง
+    ทุก command ผ่าน lock เดียวกัน และสลับไปแท็บของ thread ที่เรียกก่อนส่ง command (เฉพาะเมื่อแท็บไม่ตรง)
+    ระหว่างที่ thread หนึ่งรอเว็บไซต์ตอบ (sleep ใน Wait Engine) thread อื่นใช้เบราว์เซอร์ต่อได้ทันที
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.lock = threading.RLock()
+        self.local = threading.local()
+        self.active_handle = driver.current_window_handle
+        self.original_execute = driver.execute
+        self.switches = 0
+        driver.execute = self.execute
+
+    def bind(self, handle):
+        """ผูก thread ปัจจุบันกับแท็บ"""
+        self.local.handle = handle
+
+    def execute(self, driver_command, params=None):
+        handle = getattr(self.local, "handle", None)
+        with self.lock:
+            if handle and handle != self.active_handle and driver_command != Command.SWITCH_TO_WINDOW:
+                self.original_execute(Command.SWITCH_TO_WINDOW, {"handle": handle})
+                self.active_handle = handle
+                self.switches += 1
+            response = self.original_execute(driver_command, params)
+            if driver_command == Command.SWITCH_TO_WINDOW:
+                self.active_handle = (params or {}).get("handle", self.active_handle)
+            return response
+
+    def open_tab(self):
+        """เปิดแท็บใหม่ใน session เดียวกัน (cookies/login เดียวกัน) และคืนค่า window handle"""
+        with self.lock:
+            self.driver.switch_to.new_window("tab")
+            return self.driver.current_window_handle
+
+    def close_tab(self, handle):
+        with self.lock:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+
+    def release(self, main_handle):
+        """คืน driver ให้ใช้งานแบบ thread เดียวตามเดิม"""
+        self.driver.execute = self.original_execute
+        self.driver.switch_to.window(main_handle)
+
+
+class TabPipeline(BrowserWorkerPool):
+    """
+    ประมวลผลหลายไฟล์พร้อมกันด้วยหลายแท็บในเบราว์เซอร์เดียว (login ครั้งเดียว ไม่เปิด Chrome เพิ่ม)
+    ขณะที่แท็บหนึ่งรอผลอัปโหลด/บันทึก consent แท็บอื่นค้นหาไฟล์ถัดไปได้เลย
+    ใช้ลูปดึงไฟล์จากคิวเดียวกับ BrowserWorkerPool (worker หนึ่งตัว = หนึ่งแท็บ)
+    """
+
+    def __init__(self, bot, feature_type, tab_count):
+        super().__init__(bot, feature_type, tab_count)
+        self.start_delay = 0  # แท็บใช้ login เดียวกัน ไม่ต้องเว้นระยะ
+        self.controller = None  # จำนวนแท็บคงที่ตาม TAB_PIPELINE_TABS
+        self.shared = None
+        self.main_handle = None
+        self.tab_handles = {}
+
+    def announce(self):
+        self.bot.log(f"🗂️  เริ่ม Tab Pipeline: {self.worker_count} แท็บในเบราว์เซอร์เดียว")
+
+    def run(self, files, source_directory, summary):
+        bot = self.bot
+        bot.browser.acquire()
+        login = bot.auto_sign_contract_login if self.feature_type == "sign-contract" else bot.auto_login
+        if not bot.timed_step("login", login):
+            # ไม่ลอง login ซ้ำทีละไฟล์ - หยุด batch เหมือนโหมดอื่น
+            bot.login_failed.set()
+            bot.log_error("🔒 Login ไม่สำเร็จ - หยุด batch (ตรวจสอบชื่อผู้ใช้/รหัสผ่านแล้วรันใหม่ด้วย --resume)")
+            return
+
+        self.main_handle = bot.driver.current_window_handle
+        self.shared = SharedDriver(bot.driver)
+        try:
+            # แท็บแรกใช้แท็บเดิม แท็บที่เหลือเปิดใหม่
+            handles = [self.main_handle] + [self.shared.open_tab() for _ in range(self.worker_count - 1)]
+            self.tab_handles = dict(enumerate(handles, 1))
+            super().run(files, source_directory, summary)
+            bot.log(f"🗂️  สลับแท็บทั้งหมด {self.shared.switches} ครั้ง")
+        finally:
+            for handle in self.tab_handles.values():
+                if handle != self.main_handle:
+                    try:
+                        self.shared.close_tab(handle)
+                    except Exception:
+                        pass
+            self.shared.release(self.main_handle)
+            bot.wait_engine.selectors.invalidate()
+
+    def start_worker(self, worker):
+        """ผูก worker กับแท็บของตัวเอง (ใช้ driver และ login ร่วมกับ bot หลัก)"""
+        self.shared.bind(self.tab_handles[worker.worker_id])
+        worker.driver = self.bot.driver
+        worker.wait = WebDriverWait(worker.driver, config.ELEMENT_WAIT_TIMEOUT)
+        # ตัวนับ request และการบล็อก URL ต้องติดตั้งแยกทีละแท็บ
+        worker.wait_engine = WaitEngine(worker.driver, worker.selector_stats)
+        enable_request_blocking(worker.driver)
+        if self.feature_type == "sign-contract":
+            worker._sign_contract_login_completed = True
+        else:
+            worker._login_completed = True
+
+    def stop_worker(self, worker):
+        # ไม่ปิดเบราว์เซอร์ - เป็นของ bot หลัก
+        worker.driver = None
@@ -4,6 +4,7 @@ import getpass
 from datetime import datetime
 from pathlib import Path
 from path_utils import get_accounts_directory
+from session_cache import SessionCache
 
 def clear_screen():
     """ล้างหน้าจอแบบ Cross-Platform"""
@@ -88,6 +89,13 @@ class UserManager:
             return self.data["users"][current_user_id]
         return None
     
+    def get_current_user_id(self):
+        """ดึง ID ของผู้ใช้ปัจจุบัน"""
+        current_user_id = self.data.get("current_user")
+        if current_user_id and current_user_id in self.data["users"]:
+            return current_user_id
+        return None
+    
     def get_current_user_info(self):
         """ดึงข้อมูลผู้ใช้ปัจจุบันสำหรับแสดงผล"""
         user = self.get_current_user()
@@ -209,8 +217,9 @@ class UserManager:
                 print("ยกเลิกการลบ")
                 return False
             
-            # ลบผู้ใช้
+            # ลบผู้ใช้ และ session ที่บันทึกไว้ของผู้ใช้นั้น
             del self.data["users"][user_id_to_delete]
+            SessionCache().clear(user_id_to_delete)
             
             # ถ้าเป็นผู้ใช้ปัจจุบัน ให้เปลี่ยนเป็นคนแรก
             if user_id_to_delete == current_user_id:
@@ -328,6 +337,7 @@ class UserManager:
                         print("❌ Username นี้มีอยู่แล้ว")
                         return False
                 user_data['username'] = new_username
+                SessionCache().clear(user_id_to_edit)  # session เดิมเป็นของ username เก่า
             
             # แก้ไข password
             change_password = input("เปลี่ยน Password? (y/N): ").strip().lower()
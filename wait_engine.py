@@ -0,0 +1,106 @@
+import time
+from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+import config
+from page_readiness import PageReadiness
+from selector_registry import SelectorRegistry
+
+
+class StateExpectation:
+    """สถานะหน้าเว็บที่ขั้นตอนหนึ่งคาดว่าจะเกิดขึ้นหลังการกระทำ (เช่น คลิกปุ่ม)"""
+
+    def __init__(self, name, selectors, snapshot=None, idle=False):
+        self.name = name
+        self.selectors = selectors
+        self.snapshot = snapshot  # element ก่อนการกระทำ ที่ต้องหายไปจาก DOM (stale)
+        self.idle = idle          # ต้องรอให้หน้าเว็บว่าง (ไม่มี request ค้าง) ด้วย
+        self.started_at = time.time()
+
+
+class WaitEngine:
+    """
+    รอการเปลี่ยนสถานะหน้าเว็บแทนการ sleep แบบตายตัว
+    - โหมด "event": คืนค่าทันทีที่หน้าเว็บอยู่ในสถานะที่คาดไว้ (config.PAGE_STATES)
+    - โหมด "legacy": sleep config.WAIT_TIME แบบเดิม
+    """
+
+    def __init__(self, driver, selector_stats=None):
+        self.driver = driver
+        self.readiness = PageReadiness(driver)
+        self.selectors = SelectorRegistry(driver, selector_stats)
+
+    @property
+    def legacy_mode(self):
+        return config.WAIT_MODE != "event"
+
+    def prepare(self, state_name, selector=None):
+        """เตรียมรอสถานะ - เรียกก่อนทำการกระทำ เพื่อเก็บ element เดิมไว้ตรวจ staleness"""
+        self.selectors.invalidate()
+        if self.legacy_mode or not state_name:
+            return None
+
+        state = config.PAGE_STATES.get(state_name)
+        if state is None:
+            raise KeyError(f"ไม่รู้จักสถานะหน้าเว็บ '{state_name}'")
+
+        # "{selector}" ใน state จะถูกแทนด้วย selector ของ element ที่ถูกคลิก
+        selectors = [s.replace("{selector}", selector or "") for s in state["selectors"]]
+
+        snapshot = None
+        stale_selector = state.get("stale")
+        if stale_selector:
+            elements = self.find_elements(stale_selector.replace("{selector}", selector or ""))
+            snapshot = elements[0] if elements else None
+
+        return StateExpectation(state_name, selectors, snapshot, state.get("idle", False))
+
+    def settle(self, expectation, timeout=None):
+        """รอหลังการกระทำ - คืนค่า False ถ้าไม่ถึงสถานะที่คาดไว้ภายในเวลาที่กำหนด"""
+        self.selectors.invalidate()  # element ที่จำไว้เป็นของหน้าก่อนการกระทำ
+        if self.legacy_mode:
+            time.sleep(config.WAIT_TIME)
+            return True
+        if expectation is None:
+            return True
+        return self.wait_for(expectation, timeout)
+
+    def wait_for(self, expectation, timeout=None):
+        """วนตรวจสถานะจนกว่าจะถึง หรือหมดเวลา"""
+        timeout = timeout if timeout else config.ELEMENT_WAIT_TIMEOUT
+        deadline = expectation.started_at + timeout
+        self.readiness.busy_reason = None
+
+        while True:
+            if self.is_reached(expectation):
+                return True
+            if time.time() >= deadline:
+                return False
+            time.sleep(config.STATE_POLL_INTERVAL)
+
+    def is_reached(self, expectation):
+        """ตรวจว่าหน้าเว็บอยู่ในสถานะที่คาดไว้แล้วหรือยัง"""
+        # หน้าเดิมต้องถูกแทนที่ก่อน (หรือเกินระยะผ่อนผัน กรณีเว็บไม่ re-render element เดิม)
+        if expectation.snapshot is not None and not self.is_stale(expectation.snapshot):
+            if time.time() - expectation.started_at < config.STATE_STALE_GRACE:
+                return False
+
+        if not any(self.find_elements(selector) for selector in expectation.selectors):
+            return False
+        return not expectation.idle or self.readiness.is_idle(time.time() - expectation.started_at)
+
+    def is_stale(self, element):
+        try:
+            element.is_enabled()
+            return False
+        except StaleElementReferenceException:
+            return True
+        except WebDriverException:
+            return True
+
+    def find_elements(self, selector):
+        # ไม่ใช้ cache - ใช้ตรวจว่าหน้าเว็บเปลี่ยนแล้วหรือยัง
+        return self.selectors.find_all(selector, cache=False)
+
+    def pause(self, seconds):
+        """หน่วงเวลาเฉพาะโหมด legacy (โหมด event อาศัยการรอสถานะแทน)"""
+        if self.legacy_mode:
+            time.sleep(seconds)
@@ -0,0 +1,269 @@
+import os
+import time
+import queue
+import threading
+from datetime import datetime
+import config
+from file_outcome import FileOutcome, OUTCOME_LOGIN_FAILED
+from path_utils import get_files_directory
+
+try:
+    # Linux: ใช้ inotify ตื่นทันทีเมื่อมีไฟล์เข้า (pip install inotify_simple)
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
+WATCH_FEATURES = ["disbursement", "sign-contract"]
+
+
+class FolderWatcher:
+    """
+    เฝ้าโฟลเดอร์และคืนไฟล์ที่เขียนเสร็จแล้ว (ขนาด/เวลาแก้ไขไม่เปลี่ยนเป็นเวลา WATCH_STABLE_SECONDS)
+    ใช้ inotify ถ้ามี ไม่เช่นนั้นสแกนโฟลเดอร์ทุก WATCH_POLL_INTERVAL วินาที
+    """
+
+    def __init__(self, directories):
+        self.directories = {str(directory): feature for feature, directory in directories.items()}
+        self.candidates = {}   # path -> (size, mtime, เวลาที่เปลี่ยนล่าสุด)
+        self.dispatched = set()
+        self.inotify = None
+        self.watch_dirs = {}
+
+        if INotify is not None:
+            self.inotify = INotify()
+            mask = (inotify_flags.CREATE | inotify_flags.MODIFY | inotify_flags.CLOSE_WRITE |
+                    inotify_flags.MOVED_TO | inotify_flags.MOVED_FROM | inotify_flags.DELETE)
+            for directory in self.directories:
+                self.watch_dirs[self.inotify.add_watch(directory, mask)] = directory
+
+        # ไฟล์ที่มีอยู่แล้วตอนเริ่ม ถือเป็นงานค้าง
+        for directory in self.directories:
+            self.scan(directory)
+
+    @property
+    def mode(self):
+        return "inotify" if self.inotify else "polling"
+
+    def scan(self, directory):
+        """หาไฟล์ใหม่ในโฟลเดอร์ และลืมไฟล์ที่ถูกย้ายออกไปแล้ว"""
+        present = set()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file() and os.path.splitext(entry.name)[1].lower() in config.ALLOWED_EXTENSIONS:
+                    present.add(entry.path)
+                    if entry.path not in self.dispatched and entry.path not in self.candidates:
+                        self.candidates[entry.path] = (-1, -1, time.time())
+
+        prefix = directory + os.sep
+        self.dispatched -= {path for path in self.dispatched if path.startswith(prefix) and path not in present}
+
+    def wait_for_changes(self):
+        """รอการเปลี่ยนแปลงในโฟลเดอร์ (นานสุด WATCH_POLL_INTERVAL วินาที)"""
+        if not self.inotify:
+            time.sleep(config.WATCH_POLL_INTERVAL)
+            for directory in self.directories:
+                self.scan(directory)
+            return
+
+        for event in self.inotify.read(timeout=int(config.WATCH_POLL_INTERVAL * 1000)):
+            directory = self.watch_dirs.get(event.wd)
+            if not directory or not event.name:
+                continue
+            path = os.path.join(directory, event.name)
+            if event.mask & (inotify_flags.MOVED_FROM | inotify_flags.DELETE):
+                self.dispatched.discard(path)
+                self.candidates.pop(path, None)
+            elif os.path.splitext(event.name)[1].lower() in config.ALLOWED_EXTENSIONS and path not in self.dispatched:
+                self.candidates.setdefault(path, (-1, -1, time.time()))
+
+    def ready_files(self):
+        """ไฟล์ที่เขียนเสร็จแล้ว -> [(feature, directory, filename)]"""
+        now = time.time()
+        ready = []
+        for path, (size, mtime, changed_at) in list(self.candidates.items()):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                del self.candidates[path]
+                continue
+
+            if (stat.st_size, stat.st_mtime) != (size, mtime):
+                # ยังถูกเขียนอยู่ (หรือเพิ่งเห็นครั้งแรก) - เริ่มนับเวลาใหม่
+                self.candidates[path] = (stat.st_size, stat.st_mtime, now)
+                continue
+            if stat.st_size == 0 or now - changed_at < config.WATCH_STABLE_SECONDS:
+                continue
+            try:
+                # Windows ไม่ให้เปิดไฟล์ที่กำลังคัดลอกอยู่
+                with open(path, 'rb'):
+                    pass
+            except OSError:
+                continue
+
+            del self.candidates[path]
+            self.dispatched.add(path)
+            directory, filename = os.path.split(path)
+            ready.append((self.directories[directory], directory, filename))
+        return ready
+
+    def close(self):
+        if self.inotify:
+            self.inotify.close()
+
+
+class WatchDaemon:
+    """
+    โหมดเฝ้าโฟลเดอร์: เปิดเบราว์เซอร์ที่ login แล้วค้างไว้ฟีเจอร์ละหนึ่งตัว
+    และส่งไฟล์ใหม่เข้ากระบวนการเดิม (process_single_file/process_sign_contract_file) ทันทีที่ไฟล์เขียนเสร็จ
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.stop_event = threading.Event()
+        self.queues = {feature: queue.Queue() for feature in WATCH_FEATURES}
+        self.summaries = {feature: bot.new_batch_summary(0) for feature in WATCH_FEATURES}
+
+    def run(self):
+        directories = {feature: get_files_directory() / feature for feature in WATCH_FEATURES}
+        for directory in directories.values():
+            directory.mkdir(parents=True, exist_ok=True)
+
+        watcher = FolderWatcher(directories)
+        self.bot.log(f"👀 เริ่มโหมดเฝ้าโฟลเดอร์ ({watcher.mode}): {', '.join(str(d) for d in directories.values())}")
+        self.bot.log("   กด Ctrl+C เพื่อหยุด")
+
+        threads = []
+        for worker_id, feature in enumerate(WATCH_FEATURES, 1):
+            worker = self.bot.spawn_worker(worker_id)
+            thread = threading.Thread(target=self.feature_loop, args=(worker, feature), name=f"dsl-watch-{feature}", daemon=True)
+            threads.append(thread)
+            thread.start()
+
+        try:
+            while True:
+                for feature, directory, filename in watcher.ready_files():
+                    self.bot.log(f"📥 ไฟล์ใหม่ ({feature}): {filename}")
+                    self.queues[feature].put((directory, filename))
+                watcher.wait_for_changes()
+        except KeyboardInterrupt:
+            self.bot.log_warning("⚠️  หยุดโหมดเฝ้าโฟลเดอร์")
+        finally:
+            self.stop_event.set()
+            watcher.close()
+            for thread in threads:
+                thread.join(timeout=30)
+            for feature in WATCH_FEATURES:
+                summary = self.summaries[feature]
+                if summary["total"]:
+                    self.bot.finish_batch(f"🎯 สรุปผลโหมดเฝ้าโฟลเดอร์: {feature}", summary)
+
+    def feature_loop(self, worker, feature):
+        """
+        เบราว์เซอร์ของฟีเจอร์หนึ่ง - login ไว้ล่วงหน้าแล้วรอไฟล์จากคิว
+        ข้อผิดพลาด (เปิดเบราว์เซอร์/login ไม่ได้, เบราว์เซอร์พัง) ไม่ทำให้ worker หยุด - ปิดเบราว์เซอร์ รอ แล้วเริ่มใหม่
+        ไม่รับไฟล์จากคิวระหว่างที่ยัง login ไม่ได้
+        """
+        pending = None  # ไฟล์ที่รับเข้าแล้วแต่ยังไม่ได้เริ่มทำ (รอเบราว์เซอร์พร้อม)
+        failures = 0
+        while not self.stop_event.is_set():
+            try:
+                if worker.driver is None and not self.warm_up(worker, feature):
+                    failures = self.back_off(worker, feature, failures, "login ไม่สำเร็จ")
+                    continue
+                if pending is None:
+                    try:
+                        directory, filename = self.queues[feature].get(timeout=1)
+                    except queue.Empty:
+                        # ระหว่างรอไฟล์ใหม่ ลองไฟล์ที่ล้มเหลวชั่วคราวที่ถึงเวลาแล้ว
+                        worker.process_retries(feature, self.summaries[feature], wait=False)
+                        failures = 0
+                        continue
+                    if not self.admit_arrival(worker, feature, directory, filename):
+                        continue
+                    pending = (directory, filename)
+
+                if not self.warm_up(worker, feature):
+                    failures = self.back_off(worker, feature, failures, "login ไม่สำเร็จ")
+                    continue
+                directory, filename = pending
+                pending = None
+                if not self.process_arrival(worker, feature, directory, filename):
+                    pending = (directory, filename)  # session หลุดระหว่างทำ - login ใหม่แล้วทำไฟล์นี้ต่อ
+                    failures = self.back_off(worker, feature, failures, "login ไม่สำเร็จ")
+                    continue
+                failures = 0
+            except Exception as e:
+                failures = self.back_off(worker, feature, failures, f"ผิดพลาด: {str(e)}")
+        self.close_driver(worker)
+
+    def back_off(self, worker, feature, failures, reason):
+        """ปิดเบราว์เซอร์แล้วรอก่อนเริ่มใหม่ (นานขึ้นสองเท่าทุกครั้งที่ล้มเหลวติดกัน) - คืนค่าจำนวนครั้งที่ล้มเหลว"""
+        failures += 1
+        delay = min(config.WATCH_RESTART_BACKOFF_SECONDS * 2 ** (failures - 1), config.WATCH_RESTART_MAX_SECONDS)
+        worker.log_error(f"💥 Worker ({feature}) {reason} - เริ่มเบราว์เซอร์ใหม่ในอีก {delay} วินาที")
+        self.close_driver(worker)
+        self.stop_event.wait(delay)
+        return failures
+
+    def close_driver(self, worker):
+        if worker.driver:
+            try:
+                worker.driver.quit()
+            except Exception:
+                pass
+            worker.driver = None
+
+    def warm_up(self, worker, feature):
+        """เปิดเบราว์เซอร์และ login ล่วงหน้า (ไฟล์แรกไม่ต้องรอ) - คืนค่า False ถ้า login ไม่สำเร็จ"""
+        if worker.driver is not None:
+            try:
+                worker.driver.current_url  # ตรวจว่าเบราว์เซอร์ยังใช้งานได้
+                return True
+            except Exception:
+                worker.log_warning(f"⚠️  เบราว์เซอร์ ({feature}) ไม่ตอบสนอง - เปิดใหม่")
+                self.close_driver(worker)
+
+        worker.setup_driver()
+        if feature == "sign-contract":
+            if hasattr(worker, '_sign_contract_login_completed'):
+                delattr(worker, '_sign_contract_login_completed')
+            logged_in = worker.auto_sign_contract_login()
+            if logged_in:
+                worker._sign_contract_login_completed = True
+        else:
+            if hasattr(worker, '_login_completed'):
+                delattr(worker, '_login_completed')
+            logged_in = worker.auto_login()
+            if logged_in:
+                worker._login_completed = True
+        if not logged_in:
+            worker.log_warning(f"🔒 เบราว์เซอร์ ({feature}) login ไม่สำเร็จ - ยังไม่รับไฟล์")
+            return False
+        worker.log(f"🔥 เบราว์เซอร์ ({feature}) พร้อมรับไฟล์")
+        return True
+
+    def admit_arrival(self, worker, feature, directory, filename):
+        """นับไฟล์ที่เพิ่งเข้ามา บันทึกลง journal และตรวจไฟล์ - คืนค่า True ถ้าพร้อมดำเนินการ"""
+        summary = self.summaries[feature]
+        with worker.result_lock:
+            summary["total"] += 1
+        worker.journal.enqueue(feature, [filename], directory, datetime.now().strftime("%Y%m%d_%H%M%S"))
+        return bool(worker.preflight_files([filename], directory, feature, summary))
+
+    def process_arrival(self, worker, feature, directory, filename):
+        """
+        ส่งไฟล์เข้ากระบวนการเดียวกับโหมด batch (เบราว์เซอร์พังระหว่างทำ = ล้มเหลวชั่วคราว เข้าคิวลองใหม่)
+        คืนค่า False ถ้า login ไม่สำเร็จ (ไฟล์ยังอยู่ที่เดิม)
+        """
+        summary = self.summaries[feature]
+        try:
+            result = worker.process_file_with_trace(feature, filename, directory)
+        except Exception as e:
+            worker.record_file_result(filename, FileOutcome.from_exception(e, "watch"), directory, summary)
+            raise
+        outcome = FileOutcome.from_result(result)
+        worker.record_file_result(filename, outcome, directory, summary)
+        if outcome.kind == OUTCOME_LOGIN_FAILED:
+            worker.login_failed.clear()  # โหมดเฝ้าโฟลเดอร์ไม่หยุด - รอแล้ว login ใหม่
+            return False
+        return True
@@ -0,0 +1,184 @@
+import queue
+import threading
+import time
+import config
+from concurrency_controller import ConcurrencyController
+
+
+class BrowserWorkerPool:
+    """
+    ประมวลผลไฟล์แบบขนานด้วยเบราว์เซอร์หลายตัว
+    แต่ละ worker มี Chrome session และ login ของตัวเอง แล้วดึงไฟล์จากคิวเดียวกัน
+    """
+
+    def __init__(self, bot, feature_type, worker_count):
+        self.bot = bot
+        self.feature_type = feature_type
+        self.worker_count = worker_count
+        # คิวจำกัดขนาด - ไฟล์ถูกอ่านจากโฟลเดอร์ระหว่างที่ worker ทำงาน
+        # เก็บไว้เท่าจำนวน worker เพื่อให้ไฟล์ด่วนที่เพิ่งวางไม่ต้องรอหลังไฟล์ที่เข้าคิวไปแล้ว
+        self.file_queue = queue.Queue(maxsize=worker_count)
+        self.feed_done = threading.Event()
+        self.stop_feed = threading.Event()
+        self.workers = []
+        self.start_delay = config.WORKER_START_DELAY
+        self.controller = None
+        if config.ADAPTIVE_CONCURRENCY:
+            # เปิด worker ไว้ครบตามเพดาน แต่ให้ทำงานพร้อมกันตามที่ controller อนุญาต
+            self.controller = ConcurrencyController(worker_count, config.WORKER_COUNT, bot.log)
+
+    def run(self, files, source_directory, summary):
+        """แจกไฟล์ให้ worker ทั้งหมดและรอจนคิวว่าง"""
+        feeder = threading.Thread(target=self.feed, args=(files,), name="dsl-file-feeder", daemon=True)
+        feeder.start()
+
+        self.announce()
+
+        threads = []
+        for worker_id in range(1, self.worker_count + 1):
+            worker = self.bot.spawn_worker(worker_id)
+            self.workers.append(worker)
+            thread = threading.Thread(
+                target=self.worker_loop,
+                args=(worker, source_directory, summary),
+                name=f"dsl-worker-{worker_id}",
+                daemon=True
+            )
+            threads.append(thread)
+            thread.start()
+            # เว้นระยะการเปิดเบราว์เซอร์และ login เพื่อไม่ให้เว็บไซต์รับภาระพร้อมกัน
+            if worker_id < self.worker_count and self.start_delay:
+                time.sleep(self.start_delay)
+
+        for thread in threads:
+            # join แบบมี timeout เพื่อให้ Ctrl+C ยังทำงานได้
+            while thread.is_alive():
+                thread.join(timeout=1)
+        unread = not self.feed_done.is_set()  # worker หยุดก่อนอ่านโฟลเดอร์ครบ
+        self.stop_feed.set()
+        feeder.join(timeout=5)
+
+        if self.controller:
+            self.bot.log(self.controller.format_report())
+
+        remaining = f"{self.file_queue.qsize()} ไฟล์" + (" และไฟล์ที่ยังไม่ได้อ่านจากโฟลเดอร์" if unread else "")
+        if (self.file_queue.qsize() or unread) and self.bot.login_failed.is_set():
+            self.bot.log_warning(f"🔒 Login ไม่สำเร็จ - เหลือไฟล์ที่ยังไม่ได้ดำเนินการ {remaining}")
+        elif (self.file_queue.qsize() or unread) and self.bot.budget_exhausted():
+            self.bot.log_warning(f"⏰ หมดเวลาที่กำหนด - เหลือไฟล์ที่ยังไม่ได้ดำเนินการ {remaining}")
+        elif self.file_queue.qsize() or unread:
+            self.bot.log_warning(f"⚠️  ไม่มี worker ที่พร้อมทำงาน - เหลือไฟล์ที่ยังไม่ได้ดำเนินการ {remaining}")
+
+    def feed(self, files):
+        """ส่งไฟล์เข้าคิวทีละไฟล์ (รอเมื่อคิวเต็ม) จนหมดหรือ worker หยุดทำงานทั้งหมด"""
+        try:
+            for filename in files:
+                while True:
+                    if self.stop_feed.is_set():
+                        return
+                    try:
+                        self.file_queue.put(filename, timeout=1)
+                        break
+                    except queue.Full:
+                        continue
+        except Exception as e:
+            self.bot.log_error(f"❌ อ่านรายชื่อไฟล์ไม่สำเร็จ: {str(e)}")
+        finally:
+            self.feed_done.set()
+
+    def has_pending(self):
+        """ยังมีไฟล์ในคิว หรือยังอ่านโฟลเดอร์ไม่ครบ"""
+        return not (self.feed_done.is_set() and self.file_queue.empty())
+
+    def next_file(self):
+        """ไฟล์ถัดไปจากคิว (รอถ้ายังอ่านโฟลเดอร์ไม่ครบ) - None เมื่อไม่มีไฟล์เหลือแล้ว"""
+        while True:
+            try:
+                return self.file_queue.get(timeout=0.5)
+            except queue.Empty:
+                if not self.has_pending():
+                    return None
+
+    def announce(self):
+        self.bot.log(f"👷 เริ่ม Worker Pool จำนวน {self.worker_count} เบราว์เซอร์")
+
+    def start_worker(self, worker):
+        """เตรียม worker ก่อนรับไฟล์ (ทำงานใน thread ของ worker) - worker pool เปิดเบราว์เซอร์ของตัวเอง"""
+        worker.setup_driver()
+
+    def stop_worker(self, worker):
+        """เก็บกวาดหลัง worker ทำงานเสร็จ"""
+        if worker.driver:
+            try:
+                worker.driver.quit()
+                worker.log("🔚 ปิดเบราว์เซอร์ของ Worker แล้ว")
+            except Exception:
+                pass
+            worker.driver = None
+
+    def acquire_slot(self, worker):
+        """รอสิทธิ์ทำไฟล์ถัดไป (โหมดปรับจำนวน worker อัตโนมัติ) - None = ไม่ต้องทำต่อแล้ว"""
+        if not self.controller:
+            return 0
+        return self.controller.acquire(lambda: not self.has_pending() or worker.batch_stopped())
+
+    def release_slot(self, slot, result=None, duration=0.0):
+        if self.controller:
+            self.controller.release(slot, result, duration)
+
+    def worker_loop(self, worker, source_directory, summary):
+        """ลูปการทำงานของ worker แต่ละตัว"""
+        try:
+            processed = 0
+            started = False
+
+            while True:
+                if worker.batch_stopped():
+                    break
+                slot = self.acquire_slot(worker)
+                if slot is None:
+                    break
+                result = None
+                duration = 0.0
+                try:
+                    if not started:
+                        # เปิดเบราว์เซอร์เมื่อได้ทำงานครั้งแรก (worker ที่ controller ยังไม่อนุญาตไม่ต้องเปิด)
+                        try:
+                            self.start_worker(worker)
+                        except Exception as e:
+                            worker.log_error(f"❌ Worker เริ่มต้นเบราว์เซอร์ไม่สำเร็จ: {str(e)}")
+                            return
+                        started = True
+
+                    filename = self.next_file()
+                    if filename is None:
+                        break
+
+                    if processed:
+                        # หน่วงเวลาระหว่างไฟล์ (เฉพาะโหมด legacy)
+                        worker.wait_engine.pause(2)
+
+                    worker.log(f"\n{'='*60}")
+                    worker.log(f"📝 กำลังดำเนินการไฟล์: '{filename}' (เหลือในคิว {self.file_queue.qsize()} ไฟล์)")
+                    worker.log(f"{'='*60}")
+
+                    try:
+                        started_at = time.perf_counter()
+                        result = worker.process_file_with_trace(self.feature_type, filename, source_directory)
+                        duration = time.perf_counter() - started_at
+                        worker.record_file_result(filename, result, source_directory, summary)
+                    finally:
+                        self.file_queue.task_done()
+                    processed += 1
+                finally:
+                    self.release_slot(slot, result, duration)
+
+            if not started:
+                return
+
+            # ไฟล์ที่ล้มเหลวชั่วคราว ลองใหม่หลังคิวหลักว่างแล้ว (worker ไหนว่างก่อนรับไป)
+            worker.process_retries(self.feature_type, summary)
+            worker.log(f"🏁 Worker ทำงานเสร็จ ({processed} ไฟล์)")
+
+        finally:
+            self.stop_worker(worker)